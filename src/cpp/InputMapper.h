@@ -61,6 +61,26 @@ public:
         }
     }
 
+    /**
+     * Binary equivalent of set_from_packet() for the CFG1 config packet.
+     * split_flags: bit0 pos_center, bit1 pos_reverse, bit2 neg_center, bit3 neg_reverse.
+     */
+    void set_from_config(const int16_t map_vals[16], int split_target, int pos_src, int neg_src, int split_flags) {
+        for (int i = 0; i < 16; i++) {
+            configs[i].primary_src = map_vals[i];
+            configs[i].is_split = false;
+        }
+        if (split_target >= 0 && split_target < 16) {
+            configs[split_target].is_split = true;
+            configs[split_target].pos_src     = pos_src;
+            configs[split_target].neg_src     = neg_src;
+            configs[split_target].pos_center  = (split_flags & 1) != 0;
+            configs[split_target].pos_reverse = (split_flags & 2) != 0;
+            configs[split_target].neg_center  = (split_flags & 4) != 0;
+            configs[split_target].neg_reverse = (split_flags & 8) != 0;
+        }
+    }
+
     /**
      * Re-maps and transforms signal ranges.
      */
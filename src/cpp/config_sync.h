@@ -0,0 +1,108 @@
+#ifndef CONFIG_SYNC_H
+#define CONFIG_SYNC_H
+
+#include <cstdint>
+#include <cstring>
+#include "response_lut.h"
+
+// Versioned binary config packet sent by the UI (config_sync.py). One packet
+// carries the whole mapping + tuning state, so a lost datagram can never leave
+// the engine half-configured. Every packet is answered with an ack/nack that
+// echoes its sequence number and config hash. All fields are little-endian.
+//
+//   header  "CFG1", u16 version, u16 flags, u32 seq, u32 hash (crc32 of the rest)
+//   body    ConfigBody
+//   [LUT1]  a full response_lut.h packet when CFG_FLAG_LUT is set
+//
+// "CFG?", u32 seq asks for the hash of the config currently applied (0 = none /
+// edited since); the reply echoes seq so a late answer to an earlier query is ignored.
+#define CFG_VERSION 1
+#define CFG_HEADER_SIZE 16
+#define CFG_FLAG_LUT 0x0001
+#define CFG_REPLY_SIZE 13       // "CACK"/"CNAK", u32 seq, u32 hash, u8 status
+
+#pragma pack(push, 1)
+struct ConfigBody {
+    int16_t channel_map[16];
+    int8_t split_target;        // -1 = no split channel
+    uint8_t split_pos;
+    uint8_t split_neg;
+    uint8_t split_flags;        // bit0 pos_center, bit1 pos_reverse, bit2 neg_center, bit3 neg_reverse
+    float l_dz, r_dz;           // already divided by 10, as used by apply_deadzone()
+    float sens, expo, smooth, cine_spd, cine_acc;
+    uint8_t curve;
+    uint8_t cine_on;
+    uint16_t reserved;
+};
+#pragma pack(pop)
+static_assert(sizeof(ConfigBody) == 68, "ConfigBody must match CFG_BODY in config_sync.py");
+
+enum ConfigStatus : uint8_t {
+    CFG_OK = 0,
+    CFG_BAD_SIZE = 1,
+    CFG_BAD_VERSION = 2,
+    CFG_BAD_HASH = 3,
+    CFG_BAD_LUT = 4,
+    CFG_BAD_VALUE = 5,
+};
+
+struct ConfigPacket {
+    uint16_t flags = 0;
+    uint32_t seq = 0;
+    uint32_t hash = 0;
+    ConfigBody body;
+    const char* lut = nullptr;  // points into the receive buffer
+    int lut_len = 0;
+};
+
+inline bool is_config_query(const char* buf, int len) {
+    return len == 8 && std::memcmp(buf, "CFG?", 4) == 0;
+}
+
+inline uint32_t config_query_seq(const char* buf) {
+    uint32_t seq;
+    std::memcpy(&seq, buf + 4, sizeof(seq));
+    return seq;
+}
+
+inline bool is_config_packet(const char* buf, int len) {
+    return len >= 4 && std::memcmp(buf, "CFG1", 4) == 0;
+}
+
+/**
+ * Validates a CFG1 packet completely before anything is applied.
+ * `out.seq` and `out.hash` are filled in whenever the header is readable,
+ * so a nack can still echo them.
+ */
+inline ConfigStatus parse_config_packet(const char* buf, int len, ConfigPacket& out) {
+    if (len < CFG_HEADER_SIZE) return CFG_BAD_SIZE;
+    uint16_t version;
+    std::memcpy(&version, buf + 4, 2);
+    std::memcpy(&out.flags, buf + 6, 2);
+    std::memcpy(&out.seq, buf + 8, 4);
+    std::memcpy(&out.hash, buf + 12, 4);
+    if (version != CFG_VERSION) return CFG_BAD_VERSION;
+
+    int lut_len = (out.flags & CFG_FLAG_LUT) ? LUT_HEADER_SIZE + (int)sizeof(float) * LUT_POINTS : 0;
+    if (len != CFG_HEADER_SIZE + (int)sizeof(ConfigBody) + lut_len) return CFG_BAD_SIZE;
+    if (crc32_ieee((const uint8_t*)buf + CFG_HEADER_SIZE, len - CFG_HEADER_SIZE) != out.hash) return CFG_BAD_HASH;
+
+    std::memcpy(&out.body, buf + CFG_HEADER_SIZE, sizeof(ConfigBody));
+    if (lut_len) {
+        out.lut = buf + CFG_HEADER_SIZE + sizeof(ConfigBody);
+        out.lut_len = lut_len;
+        if (!ResponseLUT::valid_packet(out.lut, lut_len)) return CFG_BAD_LUT;
+    }
+    if (out.body.curve > 3 || out.body.split_target < -1 || out.body.split_target > 15) return CFG_BAD_VALUE;
+    return CFG_OK;
+}
+
+inline int build_config_reply(char* out, uint32_t seq, uint32_t hash, ConfigStatus status) {
+    std::memcpy(out, status == CFG_OK ? "CACK" : "CNAK", 4);
+    std::memcpy(out + 4, &seq, 4);
+    std::memcpy(out + 8, &hash, 4);
+    out[12] = (char)status;
+    return CFG_REPLY_SIZE;
+}
+
+#endif
@@ -16,6 +16,7 @@
 #include <mutex> 
 
 #include "crsf_parser.h"
+#include "crsf_telemetry_shm.h"
 
 #define CRSF_CHANNELS_COUNT 16
 #define CRSF_CH_BITS 11
@@ -28,6 +29,7 @@ private:
     int fd = -1;
     std::thread receive_thread;
     std::atomic<bool> running {false};
+    CrsfTelemetryShm link_telemetry;
 
     static constexpr uint8_t crc_table[256] = {
         0x00, 0xD5, 0x7F, 0xAA, 0xFE, 0x2B, 0x81, 0x54, 0x29, 0xFC, 0x56, 0x83, 0xD7, 0x02, 0xA8, 0x7D,
@@ -60,25 +62,35 @@ private:
         TelemetryData telemetry;
         std::vector<uint8_t> buffer;
         buffer.reserve(64);
-        uint8_t byte;
+        uint8_t chunk[128];
+        ssize_t n;
 
         while (running) {
-            while (read(fd, &byte, 1) > 0) {
-                if (buffer.empty()) {
-                    if (byte == 0xC8 || byte == 0xEE) {
-                        buffer.push_back(byte);
+            while ((n = read(fd, chunk, sizeof(chunk))) > 0) {
+                for (ssize_t i = 0; i < n; i++) {
+                    uint8_t byte = chunk[i];
+                    if (buffer.empty()) {
+                        if (byte == 0xC8 || byte == 0xEE) {
+                            buffer.push_back(byte);
+                        }
+                        continue;
                     }
-                } else {
                     buffer.push_back(byte);
-                    if (buffer.size() >= 2 && buffer.size() == (buffer[1] + 2)) {
-                        if (parse_crsf_frame(buffer, telemetry)) {
-                            std::lock_guard<std::mutex> lock(console_mutex);
-                            print_telemetry(telemetry);
-                        }
+                    // A CRSF frame is at most 64 bytes; anything else was not a length byte, resync
+                    if (buffer.size() == 2 && (buffer[1] < 2 || buffer[1] > 62)) {
+                        link_telemetry.record(buffer, false);
+                        buffer.clear();
+                        continue;
+                    }
+                    if (buffer.size() >= 2 && buffer.size() == (size_t)(buffer[1] + 2)) {
+                        link_telemetry.record(buffer, parse_crsf_frame(buffer, telemetry));
                         buffer.clear();
                     }
                 }
+                // Rate-limited hand-off to the UI (crsf_telemetry.py) instead of printing every frame
+                link_telemetry.publish_if_due();
             }
+            link_telemetry.publish_if_due();   // flush the tail once the link goes quiet
             std::this_thread::sleep_for(std::chrono::milliseconds(1));
         }
     }
@@ -124,6 +136,11 @@ public:
         }
 
         ioctl(fd, TCFLSH, TCIFLUSH); 
+
+        if (!link_telemetry.open_segment()) {
+            std::lock_guard<std::mutex> lock(console_mutex);
+            std::cerr << "CRSF telemetry: failed to map " << CRSF_TELEMETRY_SHM_PATH << std::endl;
+        }
         
         running = true;
         receive_thread = std::thread(&CRSFSender::receive_loop, this);
@@ -133,6 +150,7 @@ public:
     void close_port() {
         running = false;
         if (receive_thread.joinable()) receive_thread.join();
+        link_telemetry.close_segment();
         if (fd >= 0) {
             close(fd);
             fd = -1;
@@ -0,0 +1,162 @@
+#ifndef CRSF_TELEMETRY_SHM_H
+#define CRSF_TELEMETRY_SHM_H
+
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#include <vector>
+
+#include "crsf_parser.h"
+
+// Latest CRSF telemetry frame per type, read by the Python UI (crsf_telemetry.py).
+// Payloads are stored as received (big-endian wire format) and decoded on the
+// Python side with crsf_codec.decode_payload(). Layout is fixed and little-endian;
+// keep both sides in sync when editing.
+#define CRSF_TELEMETRY_SHM_PATH "/dev/shm/crsf_telemetry"
+#define CRSF_TELEMETRY_MAGIC 0x54535243u // "CRST"
+#define CRSF_TELEMETRY_VERSION 1u
+#define CRSF_TELEMETRY_SLOTS 10
+#define CRSF_TELEMETRY_PAYLOAD 64
+#define CRSF_TELEMETRY_INTERVAL_MS 50
+
+struct CrsfTelemetrySlot {
+    uint32_t count;                         // 0   frames of this type so far, 0 = never seen
+    uint8_t type;                           // 4
+    uint8_t len;                            // 5   payload bytes
+    uint16_t reserved;                      // 6
+    uint64_t timestamp_us;                  // 8   CLOCK_MONOTONIC of the newest frame
+    uint8_t payload[CRSF_TELEMETRY_PAYLOAD]; // 16
+};                                          // 80 bytes
+
+struct CrsfTelemetryBlock {
+    uint32_t magic;                         // 0
+    uint32_t version;                       // 4
+    std::atomic<uint32_t> seq;              // 8   odd while a write is in progress
+    uint32_t frames_ok;                     // 12
+    uint32_t frames_rejected;               // 16  bad length/crc or a type parse_crsf_frame() refuses
+    uint32_t reserved;                      // 20
+    uint64_t timestamp_us;                  // 24  CLOCK_MONOTONIC of the last publish
+    CrsfTelemetrySlot slots[CRSF_TELEMETRY_SLOTS]; // 32
+};                                          // 832 bytes
+
+static_assert(sizeof(CrsfTelemetrySlot) == 80, "CrsfTelemetrySlot layout changed");
+static_assert(sizeof(CrsfTelemetryBlock) == 832, "CrsfTelemetryBlock layout changed");
+
+// One slot per frame type parse_crsf_frame() accepts
+inline int crsf_telemetry_slot(uint8_t type) {
+    switch (type) {
+        case CRSF_FRAMETYPE_LINK_STATISTICS: return 0;
+        case CRSF_FRAMETYPE_BATTERY_SENSOR: return 1;
+        case CRSF_FRAMETYPE_ATTITUDE: return 2;
+        case CRSF_FRAMETYPE_GPS: return 3;
+        case CRSF_FRAMETYPE_VARIO: return 4;
+        case CRSF_FRAMETYPE_FLIGHT_MODE: return 5;
+        case CRSF_FRAMETYPE_AIRSPEED: return 6;
+        case CRSF_FRAMETYPE_ESC_TELEMETRY: return 7;
+        case CRSF_FRAMETYPE_FUEL: return 8;
+        case CRSF_FRAMETYPE_DEVICE_INFO: return 9;
+        default: return -1;
+    }
+}
+
+/**
+ * Owned by the CRSF receive thread. record() only touches private slots;
+ * publish_if_due() copies them into the segment under the seqlock at most
+ * every CRSF_TELEMETRY_INTERVAL_MS, so a fast link never costs more than
+ * ~20 small publishes a second.
+ */
+class CrsfTelemetryShm {
+private:
+    int fd = -1;
+    CrsfTelemetryBlock* block = nullptr;
+    CrsfTelemetrySlot pending[CRSF_TELEMETRY_SLOTS] = {};
+    uint32_t frames_ok = 0;
+    uint32_t frames_rejected = 0;
+    bool dirty = false;
+    std::chrono::steady_clock::time_point last_publish {};
+
+    static uint64_t to_us(std::chrono::steady_clock::time_point t) {
+        return std::chrono::duration_cast<std::chrono::microseconds>(t.time_since_epoch()).count();
+    }
+
+public:
+    bool open_segment() {
+        fd = open(CRSF_TELEMETRY_SHM_PATH, O_RDWR | O_CREAT, 0644);
+        if (fd < 0) return false;
+        if (ftruncate(fd, sizeof(CrsfTelemetryBlock)) != 0) {
+            close(fd); fd = -1;
+            return false;
+        }
+        void* p = mmap(nullptr, sizeof(CrsfTelemetryBlock), PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+        if (p == MAP_FAILED) {
+            close(fd); fd = -1;
+            return false;
+        }
+        block = static_cast<CrsfTelemetryBlock*>(p);
+        std::memset(static_cast<void*>(block), 0, sizeof(CrsfTelemetryBlock));
+        block->version = CRSF_TELEMETRY_VERSION;
+        block->magic = CRSF_TELEMETRY_MAGIC;
+        return true;
+    }
+
+    void close_segment() {
+        if (block) {
+            munmap(block, sizeof(CrsfTelemetryBlock));
+            block = nullptr;
+        }
+        if (fd >= 0) {
+            close(fd);
+            fd = -1;
+        }
+    }
+
+    bool is_open() const { return block != nullptr; }
+
+    /**
+     * Files one complete frame. `parsed` is parse_crsf_frame()'s verdict;
+     * only accepted frames replace the slot for their type.
+     */
+    void record(const std::vector<uint8_t>& frame, bool parsed) {
+        int idx = parsed ? crsf_telemetry_slot(frame[2]) : -1;
+        if (idx < 0) {
+            frames_rejected++;
+            dirty = true;
+            return;
+        }
+        CrsfTelemetrySlot& slot = pending[idx];
+        size_t len = std::min<size_t>(frame[1] - 2, CRSF_TELEMETRY_PAYLOAD);
+        slot.count++;
+        slot.type = frame[2];
+        slot.len = static_cast<uint8_t>(len);
+        slot.timestamp_us = to_us(std::chrono::steady_clock::now());
+        std::memcpy(slot.payload, &frame[3], len);
+        frames_ok++;
+        dirty = true;
+    }
+
+    void publish_if_due() {
+        if (!block || !dirty) return;
+        auto now = std::chrono::steady_clock::now();
+        if (now - last_publish < std::chrono::milliseconds(CRSF_TELEMETRY_INTERVAL_MS)) return;
+        last_publish = now;
+        dirty = false;
+
+        uint32_t s = block->seq.load(std::memory_order_relaxed);
+        block->seq.store(s + 1, std::memory_order_relaxed);
+        std::atomic_thread_fence(std::memory_order_release);
+
+        block->frames_ok = frames_ok;
+        block->frames_rejected = frames_rejected;
+        block->timestamp_us = to_us(now);
+        std::memcpy(block->slots, pending, sizeof(pending));
+
+        block->seq.store(s + 2, std::memory_order_release);
+    }
+};
+
+#endif
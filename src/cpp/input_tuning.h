@@ -44,29 +44,39 @@ static inline float apply_curve(float val, int type, float gui_expo) {
 }
 
 /**
- * The Tuning Engine.
- * NOW UPDATED FOR 1000Hz LOOPS
+ * Steps 1-2 of the tuning chain: normalize and apply the deadzone.
  */
-inline void apply_tuning(int& raw_val, float deadzone, float sens, float lowpass_alpha, 
-                          int curve_type, float expo, bool cine_on, float cine_speed, float cine_accel,
-                          int16_t& prev_val, float& cine_v, float& cine_pos, float dt) {
-    
+static inline float apply_deadzone(int raw_val, float deadzone) {
     // 1. Convert to normalized float
     float val = (float)raw_val / 32767.0f;
 
     // 2. Apply Deadzone (Standardized)
     float abs_val = std::abs(val);
-    if (abs_val < deadzone) {
-        val = 0.0f;
-    } else {
-        val = (val > 0 ? 1.0f : -1.0f) * (abs_val - deadzone) / (1.0f - deadzone);
-    }
+    if (abs_val < deadzone) return 0.0f;
+    return (val > 0 ? 1.0f : -1.0f) * (abs_val - deadzone) / (1.0f - deadzone);
+}
+
+/**
+ * Stateless shaping: steps 1-4 (normalize, deadzone, curve, rate).
+ * Steps 3-4 are what the UI precomputes into a ResponseLUT.
+ */
+static inline float shape_input(int raw_val, float deadzone, float sens, int curve_type, float expo) {
+    float val = apply_deadzone(raw_val, deadzone);
 
     // 3. Apply Curve
     val = apply_curve(val, curve_type, expo);
 
     // 4. Apply Sensitivity
-    val *= sens;
+    return val * sens;
+}
+
+/**
+ * Stateful tail: steps 5-8 (cinematic physics, clamp, low-pass, output).
+ * `val` is the shaped value from shape_input() or ResponseLUT::response().
+ */
+inline void finish_tuning(int& raw_val, float val, float lowpass_alpha,
+                          bool cine_on, float cine_speed, float cine_accel,
+                          int16_t& prev_val, float& cine_v, float& cine_pos, float dt) {
 
     // 5. Cinematic Mode (Physics Engine)
     if (cine_on) {
@@ -123,4 +133,15 @@ inline void apply_tuning(int& raw_val, float deadzone, float sens, float lowpass
     prev_val = (int16_t)raw_val;
 }
 
+/**
+ * The Tuning Engine.
+ * NOW UPDATED FOR 1000Hz LOOPS
+ */
+inline void apply_tuning(int& raw_val, float deadzone, float sens, float lowpass_alpha, 
+                          int curve_type, float expo, bool cine_on, float cine_speed, float cine_accel,
+                          int16_t& prev_val, float& cine_v, float& cine_pos, float dt) {
+    float val = shape_input(raw_val, deadzone, sens, curve_type, expo);
+    finish_tuning(raw_val, val, lowpass_alpha, cine_on, cine_speed, cine_accel, prev_val, cine_v, cine_pos, dt);
+}
+
 #endif
\ No newline at end of file
@@ -23,6 +23,9 @@
 #include "InputMixer.h"
 #include "crsf_sender.h"
 #include "crsf_parser.h"
+#include "telemetry_shm.h"
+#include "response_lut.h"
+#include "config_sync.h"
 
 const std::string MAPPER_PATH = "/home/pi4/rc-flight-controller/src/config/inputmapper.json";
 const std::string TUNING_PATH = "/home/pi4/rc-flight-controller/src/config/inputtuning.json";
@@ -31,6 +34,8 @@ const std::string TUNING_PATH = "/home/pi4/rc-flight-controller/src/config/input
 CRSFSender crsf_sender;
 InputMapper mapper;
 InputMixer mixer;
+TelemetryShm telemetry_shm;
+ResponseLUT response_lut;
 SDL_GameController* controller = nullptr;
 bool controller_connected = false;
 
@@ -51,6 +56,7 @@ std::atomic<float> g_smooth{0.2f};
 std::atomic<bool>  g_cine_on{false};
 std::atomic<float> g_cine_spd{8.0f};
 std::atomic<float> g_cine_acc{3.5f};
+std::atomic<uint32_t> g_config_hash{0};   // hash of the last CFG1 packet applied, 0 after any live edit
 
 // Physics Persistence
 int16_t prev_vals[6] = {0};
@@ -62,6 +68,37 @@ void signal_handler(int signal) {
     g_running = false;
 }
 
+/**
+ * Applies a validated CFG1 packet. The LUT is dropped first so no tick can
+ * combine the new params with the previous table. The hash is only recorded
+ * once the table the packet asks for (or none) is what the loop will use.
+ */
+ConfigStatus apply_config(const ConfigPacket& pkt) {
+    const ConfigBody& b = pkt.body;
+    response_lut.disable();
+    {
+        std::lock_guard<std::mutex> lock(mapper_mutex);
+        mapper.set_from_config(b.channel_map, b.split_target, b.split_pos, b.split_neg, b.split_flags);
+    }
+    g_l_dz = b.l_dz;
+    g_r_dz = b.r_dz;
+    g_sens = b.sens;
+    g_expo = b.expo;
+    g_curve = b.curve;
+    g_smooth = b.smooth;
+    g_cine_on = (b.cine_on != 0);
+    g_cine_spd = b.cine_spd;
+    g_cine_acc = b.cine_acc;
+    if (!pkt.lut) {
+        response_lut.disable();
+    } else if (!response_lut.load_packet(pkt.lut, pkt.lut_len)) {
+        g_config_hash = 0;
+        return CFG_BAD_LUT;
+    }
+    g_config_hash = pkt.hash;
+    return CFG_OK;
+}
+
 std::vector<std::string> split_string(const std::string& s, char delimiter) {
     std::vector<std::string> tokens;
     std::string token;
@@ -84,10 +121,30 @@ void socket_listener() {
     tv.tv_usec = 500000; // 0.5s timeout
     setsockopt(sockfd, SOL_SOCKET, SO_RCVTIMEO, (const char*)&tv, sizeof tv);
 
-    char buffer[2048];
+    static char buffer[16384];
+    char reply[CFG_REPLY_SIZE];
     while (g_running) {
-        int n = recvfrom(sockfd, buffer, 2048, 0, NULL, NULL);
+        struct sockaddr_in cliaddr;
+        socklen_t cli_len = sizeof(cliaddr);
+        int n = recvfrom(sockfd, buffer, sizeof(buffer) - 1, 0, (struct sockaddr*)&cliaddr, &cli_len);
         if (n > 0) {
+            // Binary packets from the UI (see config_sync.h)
+            if (is_config_packet(buffer, n)) {
+                ConfigPacket pkt;
+                ConfigStatus status = parse_config_packet(buffer, n, pkt);
+                if (status == CFG_OK) status = apply_config(pkt);
+                int r = build_config_reply(reply, pkt.seq, pkt.hash, status);
+                sendto(sockfd, reply, r, 0, (const struct sockaddr*)&cliaddr, cli_len);
+                continue;
+            }
+            if (is_config_query(buffer, n)) {
+                int r = build_config_reply(reply, config_query_seq(buffer), g_config_hash.load(), CFG_OK);
+                sendto(sockfd, reply, r, 0, (const struct sockaddr*)&cliaddr, cli_len);
+                continue;
+            }
+
+            // Text keys are live edits from the panels; the applied config no longer matches any hash
+            g_config_hash = 0;
             buffer[n] = '\0';
             std::string msg(buffer);
             try {
@@ -100,9 +157,10 @@ void socket_listener() {
                 } 
                 else if (msg.find("L_DZ:") == 0)      g_l_dz = std::stof(msg.substr(5));
                 else if (msg.find("R_DZ:") == 0)      g_r_dz = std::stof(msg.substr(5));
-                else if (msg.find("RATE:") == 0)      g_sens = std::stof(msg.substr(5));
-                else if (msg.find("EXPO:") == 0)      g_expo = std::stof(msg.substr(5));
-                else if (msg.find("CURVE:") == 0)     g_curve = std::stoi(msg.substr(6));
+                // Curve params invalidate the LUT until the next CFG1 push brings a fresh one
+                else if (msg.find("RATE:") == 0)      { g_sens = std::stof(msg.substr(5)); response_lut.disable(); }
+                else if (msg.find("EXPO:") == 0)      { g_expo = std::stof(msg.substr(5)); response_lut.disable(); }
+                else if (msg.find("CURVE:") == 0)     { g_curve = std::stoi(msg.substr(6)); response_lut.disable(); }
                 else if (msg.find("SMOOTH:") == 0)    g_smooth = std::stof(msg.substr(7));
                 else if (msg.find("CINE_ON:") == 0)   g_cine_on = (std::stoi(msg.substr(8)) == 1);
                 else if (msg.find("CINE_SPD:") == 0)  g_cine_spd = std::stof(msg.substr(9));
@@ -143,9 +201,14 @@ int main(int argc, char* argv[]) {
     std::signal(SIGTERM, signal_handler);
 
     int baud_rate = 420000; 
-    if (argc > 1) {
+    bool status_file_debug = false; // Legacy /tmp/flight_status.txt output
+    for (int i = 1; i < argc; i++) {
+        if (std::strcmp(argv[i], "--status-file") == 0) {
+            status_file_debug = true;
+            continue;
+        }
         try {
-            baud_rate = std::stoi(argv[1]);
+            baud_rate = std::stoi(argv[i]);
         } catch (...) {
             baud_rate = 420000;
         }
@@ -158,6 +221,10 @@ int main(int argc, char* argv[]) {
         return 1;
     }
 
+    if (!telemetry_shm.open_segment()) {
+        std::cerr << "Telemetry Error: Failed to map " << TELEMETRY_SHM_PATH << std::endl;
+    }
+
     load_system_config();
     std::thread listener_thread(socket_listener);
 
@@ -197,8 +264,17 @@ int main(int argc, char* argv[]) {
             }
             true_raw = raw_signals; 
 
+            // One table for the whole tick; a CFG1 table or disable() arriving mid-tick takes effect next tick
+            const ResponseTable* lut = response_lut.acquire();
             for (int i = 0; i < 6; i++) {
                 float dz = (i < 2) ? g_l_dz.load() : (i < 4 ? g_r_dz.load() : 0.05f);
+                if (lut) {
+                    float shaped = ResponseLUT::response(lut, apply_deadzone(raw_signals[i], dz));
+                    finish_tuning(raw_signals[i], shaped, g_smooth.load(), g_cine_on.load(),
+                                  g_cine_spd.load(), g_cine_acc.load(),
+                                  prev_vals[i], cine_vel[i], cine_pos[i], 0.001f);
+                    continue;
+                }
                 apply_tuning(raw_signals[i], dz, g_sens.load(), g_smooth.load(), 
                                g_curve.load(), g_expo.load(), g_cine_on.load(), 
                                g_cine_spd.load(), g_cine_acc.load(),
@@ -219,19 +295,27 @@ int main(int argc, char* argv[]) {
         auto now = std::chrono::steady_clock::now();
         if (std::chrono::duration<double>(now - last_gui_write).count() >= 0.02) {
             last_gui_write = now;
-            FILE* f = fopen("/tmp/flight_status.txt", "w");
-            if (f) {
-                fprintf(f, "latency_ms:%.2f rate_hz:1000.0 connected:%d", 
-                        std::chrono::duration<float, std::milli>(now - frame_start).count(), controller_connected);
-                for (int i = 0; i < 16; i++) {
-                    float norm = (mixer.final_channels[i] + 32768) / 65535.0f;
-                    int crsf_val = std::clamp((int)(norm * 1639.0f + 172.0f), 172, 1811);
-                    fprintf(f, " ch%d:%d", i + 1, crsf_val);
+            float loop_ms = std::chrono::duration<float, std::milli>(now - frame_start).count();
+            int crsf_out[16];
+            for (int i = 0; i < 16; i++) {
+                float norm = (mixer.final_channels[i] + 32768) / 65535.0f;
+                crsf_out[i] = std::clamp((int)(norm * 1639.0f + 172.0f), 172, 1811);
+            }
+            uint64_t now_us = std::chrono::duration_cast<std::chrono::microseconds>(now.time_since_epoch()).count();
+            telemetry_shm.publish(now_us, loop_ms, 1000.0f, controller_connected,
+                                  crsf_out, raw_signals.data(), true_raw.data());
+
+            // Optional text mirror (--status-file) for debugging with cat/watch
+            if (status_file_debug) {
+                FILE* f = fopen("/tmp/flight_status.txt", "w");
+                if (f) {
+                    fprintf(f, "latency_ms:%.2f rate_hz:1000.0 connected:%d", loop_ms, controller_connected);
+                    for (int i = 0; i < 16; i++) fprintf(f, " ch%d:%d", i + 1, crsf_out[i]);
+                    for (int i = 0; i < 23; i++) fprintf(f, " tunedid%d:%d", i, raw_signals[i]);
+                    for (int i = 0; i < 23; i++) fprintf(f, " rawid%d:%d", i, true_raw[i]);
+                    fprintf(f, "\n");
+                    fclose(f);
                 }
-                for (int i = 0; i < 23; i++) fprintf(f, " tunedid%d:%d", i, raw_signals[i]);
-                for (int i = 0; i < 23; i++) fprintf(f, " rawid%d:%d", i, true_raw[i]);
-                fprintf(f, "\n");
-                fclose(f);
             }
         }
 
@@ -245,6 +329,7 @@ int main(int argc, char* argv[]) {
 
     std::cout << "Shutting down gracefully..." << std::endl;
     crsf_sender.close_port();
+    telemetry_shm.close_segment();
     if (listener_thread.joinable()) listener_thread.join();
     if (controller) SDL_GameControllerClose(controller);
     SDL_Quit();
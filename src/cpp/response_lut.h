@@ -0,0 +1,124 @@
+#ifndef RESPONSE_LUT_H
+#define RESPONSE_LUT_H
+
+#include <atomic>
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+
+// Precomputed curve -> rate table built by the UI (response_lut.py).
+// Replaces the per-tick pow/exp/cos of apply_curve() with one interpolation;
+// the deadzone stays in apply_deadzone() so one table serves every axis.
+// Nodes are spaced evenly in sqrt(|val|), which keeps the interpolation error
+// under one output step even for curves that are infinitely steep at zero.
+#define LUT_POINTS 2049         // node i sits at |val| = (i / 2048)^2
+#define LUT_HEADER_SIZE 12      // "LUT1", u16 points, u16 reserved, u32 crc32
+
+/**
+ * Standard CRC-32 (same as zlib.crc32). Bitwise is fine: it runs once per sync.
+ * config_sync.h hashes whole CFG1 packets with it too.
+ */
+inline uint32_t crc32_ieee(const uint8_t* data, size_t len) {
+    uint32_t c = 0xFFFFFFFFu;
+    for (size_t i = 0; i < len; i++) {
+        c ^= data[i];
+        for (int k = 0; k < 8; k++) c = (c >> 1) ^ (0xEDB88320u & (0u - (c & 1u)));
+    }
+    return ~c;
+}
+
+struct ResponseTable {
+    float t[LUT_POINTS];
+    uint32_t crc = 0;
+};
+
+/**
+ * Three banks, one writer (the socket listener thread) and one reader (the
+ * 1 kHz loop). The loop calls acquire() once per tick and uses that table for
+ * the whole tick; acquire() records the bank in `in_use`. The writer only ever
+ * fills a bank that is neither published nor acknowledged by the loop, so a
+ * table is never overwritten while a tick may still read it.
+ */
+class ResponseLUT {
+private:
+    ResponseTable banks[3];
+    std::atomic<int> active{-1};   // -1 = no table, use apply_curve()
+    std::atomic<int> in_use{-1};   // bank the loop acknowledged reading this tick
+
+public:
+    /**
+     * Header, size and table crc32 of a LUT1 block. The table only travels
+     * inside a CFG1 packet (config_sync.h), which checks this before applying.
+     */
+    static bool valid_packet(const char* buf, int len) {
+        if (len != LUT_HEADER_SIZE + (int)sizeof(float) * LUT_POINTS || std::memcmp(buf, "LUT1", 4) != 0) return false;
+        uint16_t points;
+        uint32_t crc;
+        std::memcpy(&points, buf + 4, 2);
+        std::memcpy(&crc, buf + 8, 4);
+        return points == LUT_POINTS && crc32_ieee((const uint8_t*)buf + LUT_HEADER_SIZE, len - LUT_HEADER_SIZE) == crc;
+    }
+
+    /**
+     * Copies a valid LUT1 block into a free bank and publishes it.
+     * Only called from the socket listener thread.
+     */
+    bool load_packet(const char* buf, int len) {
+        if (!valid_packet(buf, len)) return false;
+        uint32_t crc;
+        std::memcpy(&crc, buf + 8, 4);
+
+        int published = active.load();
+        int reading = in_use.load();
+        int next = 0;
+        while (next == published || next == reading) next++;
+        std::memcpy(banks[next].t, buf + LUT_HEADER_SIZE, sizeof(banks[next].t));
+        banks[next].crc = crc;
+        active.store(next);
+        return true;
+    }
+
+    void disable() { active.store(-1); }
+
+    bool enabled() const { return active.load() >= 0; }
+
+    uint32_t crc() const {
+        int a = active.load();
+        return a >= 0 ? banks[a].crc : 0;
+    }
+
+    /**
+     * Loop side: the table to use for this whole tick, or nullptr when the
+     * curve has to be evaluated directly. The re-check after announcing the
+     * bank closes the window where the writer could pick it between our load
+     * and store.
+     */
+    const ResponseTable* acquire() {
+        int a = active.load();
+        while (true) {
+            in_use.store(a);
+            int again = active.load();
+            if (again == a) break;
+            a = again;
+        }
+        return a >= 0 ? &banks[a] : nullptr;
+    }
+
+    /**
+     * apply_curve(val) * sens for a value that already went through apply_deadzone().
+     * Must match response_lut.lut_response() in the UI.
+     */
+    static float response(const ResponseTable* table, float val) {
+        float abs_v = std::abs(val);
+        if (abs_v < 0.001f) return 0.0f;
+
+        const float* t = table->t;
+        float pos = std::sqrt(abs_v) * (float)(LUT_POINTS - 1);
+        int i = (int)pos;
+        float output = (i >= LUT_POINTS - 1) ? t[LUT_POINTS - 1]
+                                             : t[i] + (t[i + 1] - t[i]) * (pos - (float)i);
+        return (val > 0) ? output : -output;
+    }
+};
+
+#endif
@@ -0,0 +1,93 @@
+#ifndef TELEMETRY_SHM_H
+#define TELEMETRY_SHM_H
+
+#include <atomic>
+#include <cstdint>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+
+// Shared-memory telemetry segment read by the Python UI (telemetry_shm.py).
+// Layout is fixed and little-endian; keep both sides in sync when editing.
+#define TELEMETRY_SHM_PATH "/dev/shm/flight_telemetry"
+#define TELEMETRY_MAGIC 0x4C455446u // "FTEL"
+#define TELEMETRY_VERSION 1u
+
+struct TelemetryBlock {
+    uint32_t magic;                 // 0
+    uint32_t version;               // 4
+    std::atomic<uint32_t> seq;      // 8   odd while a write is in progress
+    int32_t connected;              // 12
+    uint64_t timestamp_us;          // 16  CLOCK_MONOTONIC of the last publish
+    float latency_ms;               // 24
+    float rate_hz;                  // 28
+    int32_t ch[16];                 // 32  CRSF values (172-1811)
+    int32_t tuned[23];              // 96
+    int32_t raw[23];                // 188
+};                                  // 280 bytes
+
+static_assert(sizeof(std::atomic<uint32_t>) == 4, "seq must be 4 bytes");
+static_assert(sizeof(TelemetryBlock) == 280, "TelemetryBlock layout changed");
+
+class TelemetryShm {
+private:
+    int fd = -1;
+    TelemetryBlock* block = nullptr;
+
+public:
+    bool open_segment() {
+        fd = open(TELEMETRY_SHM_PATH, O_RDWR | O_CREAT, 0644);
+        if (fd < 0) return false;
+        if (ftruncate(fd, sizeof(TelemetryBlock)) != 0) {
+            close(fd); fd = -1;
+            return false;
+        }
+        void* p = mmap(nullptr, sizeof(TelemetryBlock), PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+        if (p == MAP_FAILED) {
+            close(fd); fd = -1;
+            return false;
+        }
+        block = static_cast<TelemetryBlock*>(p);
+        std::memset(static_cast<void*>(block), 0, sizeof(TelemetryBlock));
+        block->version = TELEMETRY_VERSION;
+        block->magic = TELEMETRY_MAGIC;
+        return true;
+    }
+
+    void close_segment() {
+        if (block) {
+            munmap(block, sizeof(TelemetryBlock));
+            block = nullptr;
+        }
+        if (fd >= 0) {
+            close(fd);
+            fd = -1;
+        }
+    }
+
+    bool is_open() const { return block != nullptr; }
+
+    /**
+     * Seqlock publish: readers retry if seq is odd or changed while they copied.
+     */
+    void publish(uint64_t timestamp_us, float latency_ms, float rate_hz, bool connected,
+                 const int* ch, const int* tuned, const int* raw) {
+        if (!block) return;
+        uint32_t s = block->seq.load(std::memory_order_relaxed);
+        block->seq.store(s + 1, std::memory_order_relaxed);
+        std::atomic_thread_fence(std::memory_order_release);
+
+        block->connected = connected ? 1 : 0;
+        block->timestamp_us = timestamp_us;
+        block->latency_ms = latency_ms;
+        block->rate_hz = rate_hz;
+        for (int i = 0; i < 16; i++) block->ch[i] = ch[i];
+        for (int i = 0; i < 23; i++) block->tuned[i] = tuned[i];
+        for (int i = 0; i < 23; i++) block->raw[i] = raw[i];
+
+        block->seq.store(s + 2, std::memory_order_release);
+    }
+};
+
+#endif
@@ -1,49 +1,54 @@
-# battery_panel.py - Generated Paginated UI Panel
+# battery_panel.py - CRSF battery telemetry + placeholder pages
 import pygame
 import time
 from config import *
+from ui_helpers import draw_paged_panel, draw_value_rows
+from crsf_telemetry import CRSF_TELEMETRY
+from font_cache import get_font, render_text
 
 # Local State
 current_page = 0
 last_interaction_time = 0
 
+VALUE_COLOR = (220, 220, 220)
+
 def draw_battery_panel(screen, rect, touch_down, touch_x, touch_y):
     global current_page, last_interaction_time
     
-    # Title Rendering
-    title_font = pygame.font.SysFont("monospace", 28, bold=True)
-    title = title_font.render(f"Battery: Page {current_page + 1}", True, (255, 255, 255))
-    screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 30))
-
-    # Placeholder Content
-    font = pygame.font.SysFont("monospace", 20, bold=True)
-    msg = font.render(f"Battery settings coming soon...", True, (100, 100, 100))
-    screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.centery))
+    # Static title/placeholder/arrows come from a cached layer; the battery page is drawn live
+    message = None if current_page == 0 else "Battery settings coming soon..."
+    p_pres, n_pres = draw_paged_panel(screen, rect, "battery", f"Battery: Page {current_page + 1}", current_page,
+                                      touch_down, touch_x, touch_y, message=message)
 
-    # --- NAVIGATION ARROWS ---
-    arrow_w, arrow_h = 60, 45
-    prev_rect = pygame.Rect(rect.centerx - 70, rect.bottom - 70, arrow_w, arrow_h)
-    next_rect = pygame.Rect(rect.centerx + 10, rect.bottom - 70, arrow_w, arrow_h)
-
-    # Draw Back Arrow
-    p_pres = touch_down and prev_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if p_pres else (40, 40, 50), prev_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(prev_rect.centerx+10, prev_rect.centery-10), (prev_rect.centerx-10, prev_rect.centery), (prev_rect.centerx+10, prev_rect.centery+10)])
-    
-    # Draw Next Arrow
-    n_pres = touch_down and next_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if n_pres else (40, 40, 50), next_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(next_rect.centerx-10, next_rect.centery-10), (next_rect.centerx+10, next_rect.centery), (next_rect.centerx-10, next_rect.centery+10)])
-
-    # --- PAGE INDICATOR DOTS ---
-    for i in range(3):
-        dot_x = rect.centerx - 20 + (i * 20)
-        dot_y = rect.bottom - 85
-        color = (255, 255, 255) if i == current_page else (100, 100, 100)
-        pygame.draw.circle(screen, color, (dot_x, dot_y), 4)
+    if current_page == 0:
+        draw_battery_page(screen, rect)
 
     # Switching Logic (Debounced)
     if (p_pres or n_pres) and (time.time() - last_interaction_time) > 0.25:
         if p_pres: current_page = (current_page - 1) % 3
         if n_pres: current_page = (current_page + 1) % 3
         last_interaction_time = time.time()
+
+def draw_battery_page(screen, rect):
+    """Flight pack from the receiver's BATTERY_SENSOR frames; "--" once they stop (CRSF_TELEMETRY.get)."""
+    x, y = rect.x + 40, rect.y + 95
+    screen.blit(render_text(get_font(14, bold=True), "Flight battery (CRSF telemetry)", (150, 150, 150)), (x, y))
+    batt = CRSF_TELEMETRY.battery()
+    if batt is None:
+        rows = [(label, "--", COLOR_WARN) for label in ("Voltage", "Current", "Used", "Remaining")]
+    else:
+        r_color = COLOR_GOOD if batt["remaining"] > 30 else COLOR_WARN if batt["remaining"] > 15 else COLOR_DANGER
+        rows = [("Voltage", f"{batt['voltage']:.1f} V", VALUE_COLOR),
+                ("Current", f"{batt['current']:.1f} A", VALUE_COLOR),
+                ("Used", f"{batt['used']} mAh", VALUE_COLOR),
+                ("Remaining", f"{batt['remaining']} %", r_color)]
+    y = draw_value_rows(screen, x, y + 30, rows)
+
+    if batt is not None:
+        # Remaining-capacity bar
+        bar = pygame.Rect(x, y + 15, min(420, rect.width - 80), 22)
+        pygame.draw.rect(screen, (25, 25, 30), bar, border_radius=5)
+        fill = bar.inflate(-4, -4)
+        fill.width = int(fill.width * min(batt["remaining"], 100) / 100)
+        if fill.width > 0:
+            pygame.draw.rect(screen, rows[3][2], fill, border_radius=4)
@@ -0,0 +1,85 @@
+# bench_crsf_codec.py - batched NumPy CRSF pack/unpack vs. the per-frame scalar codec
+# Usage: python3 bench_crsf_codec.py [frames] [iterations]
+import os
+import re
+import sys
+import time
+import numpy as np
+import crsf_codec as crsf
+
+CPP_PARSER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cpp", "crsf_parser.h")
+
+
+def check_crc_table():
+    """The generated table must equal the one hardcoded in crsf_parser.h."""
+    with open(CPP_PARSER) as f:
+        src = f.read()
+    body = src[src.index("crc_table[256]"):]
+    body = body[body.index("{") + 1:body.index("}")]
+    cpp = [int(h, 16) for h in re.findall(r"0x[0-9A-Fa-f]{2}", body)]
+    assert cpp == crsf.CRC8_TABLE, "CRC8 table differs from crsf_parser.h"
+
+
+def make_channels(n, rng):
+    """Engine-side channel rows: sticks sweeping, switches at the extremes, plus the int16 edges."""
+    t = np.arange(n)[:, None] * 0.004
+    sticks = np.sin(t * np.array([1.0, 1.3, 1.7, 2.3])) * 32767
+    aux = np.where(rng.random((n, 12)) < 0.5, 32767, -32768)
+    ch = np.concatenate([sticks, aux], axis=1).astype(np.int64)
+    ch[:16] = np.array([-32768, -32767, -1, 0, 1, 32766, 32767, 16384] * 2)
+    return ch
+
+
+def timed(fn, iterations):
+    t0 = time.perf_counter_ns()
+    for _ in range(iterations):
+        out = fn()
+    return (time.perf_counter_ns() - t0) / iterations, out
+
+
+def main():
+    args = sys.argv[1:]
+    n = int(args[0]) if args else 10000
+    iterations = int(args[1]) if len(args) > 1 else 5
+    rng = np.random.default_rng(7)
+    check_crc_table()
+
+    logical = make_channels(n, rng)
+    rows = logical.tolist()
+    crsf_vals = crsf.to_crsf_batch(logical)
+
+    # Scalar reference vs. batch, both directions
+    ns_enc_s, frames_s = timed(lambda: [crsf.engine_rc_frame(r) for r in rows], 1)
+    ns_enc_b, frames_b = timed(lambda: crsf.engine_rc_frames(logical), iterations)
+    assert b"".join(frames_s) == frames_b.tobytes(), "batch encode differs from scalar"
+    assert (crsf_vals >= crsf.CRSF_MIN).all() and (crsf_vals <= crsf.CRSF_MAX).all()
+
+    ns_pack_s, _ = timed(lambda: [crsf.encode_rc_frame(r) for r in crsf_vals.tolist()], 1)
+    ns_pack_b, _ = timed(lambda: crsf.encode_rc_frames(crsf_vals), iterations)
+
+    ns_dec_s, decoded_s = timed(lambda: [crsf.decode_frame(f) for f in frames_s], 1)
+    ns_dec_b, (decoded_b, valid) = timed(lambda: crsf.decode_rc_frames(frames_b), iterations)
+    assert valid.all() and all(d[1]["channels"] == r for d, r in zip(decoded_s, decoded_b.tolist()))
+    assert (decoded_b == crsf_vals).all(), "round trip lost channel values"
+
+    # Corrupted frames must be flagged by both paths
+    bad = frames_b.copy()
+    bad[::97, 10] ^= 0x40
+    _, valid = crsf.decode_rc_frames(bad)
+    assert (~valid[::97]).all() and valid.sum() == n - len(valid[::97])
+    assert all(crsf.decode_frame(bytes(f)) is None for f in bad[::97])
+
+    # A capture with garbage between frames splits back into the same frames
+    stream = b"".join(b"\x00\x55" + f for f in frames_s[:500])
+    assert list(crsf.iter_frames(stream)) == frames_s[:500]
+
+    print(f"{n} RC_CHANNELS_PACKED frames, batch timings averaged over {iterations} runs")
+    print(f"  {'operation':<34}{'scalar us/frame':>16}{'batch us/frame':>16}{'speedup':>9}")
+    for name, s, b in (("engine channels -> frame", ns_enc_s, ns_enc_b),
+                       ("CRSF values -> frame", ns_pack_s, ns_pack_b),
+                       ("frame -> CRSF values (+crc)", ns_dec_s, ns_dec_b)):
+        print(f"  {name:<34}{s / n / 1000:16.2f}{b / n / 1000:16.3f}{s / b:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# bench_panels.py - headless per-panel draw benchmark (dummy SDL driver, synthetic touch + telemetry)
+# Usage: python3 bench_panels.py [--frames N] [--only Mapper,WiFi] [--out results.json] [--compare old.json]
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_PANEL_BG
+
+SIDEBAR_WIDTH = 190
+PAGES = {"Input": 2}          # every other paged panel cycles through 3 pages
+ALLOC_FRAMES = 200            # frames per case re-run under tracemalloc (it slows drawing ~10x)
+TOUCH_MODES = ("idle", "touch")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class SyntheticInput:
+    """
+    Stick telemetry sweeping through circles, and a finger that is either up or
+    held near the panel's top-left corner (inside the panel, clear of its
+    buttons) so the touch-down hit tests run without triggering actions.
+    """
+
+    def __init__(self, rect):
+        from telemetry_decoder import TelemetryFrame
+        from telemetry_history import TELEMETRY_HISTORY
+        self.rect = rect
+        self.frame = TelemetryFrame()
+        self.history = TELEMETRY_HISTORY
+        self.i = 0
+        # Graph panels draw the last 10 s; fill it once so they draw full traces
+        for _ in range(600):
+            self.step()
+
+    def step(self):
+        a = self.i * 0.05
+        self.i += 1
+        f = self.frame
+        f.raw[:4] = (np.array([math.sin(a), math.cos(a), math.sin(a * 0.7), math.cos(a * 1.3)]) * 30000).astype(np.int32)
+        f.tuned[:4] = f.raw[:4]
+        f.ch[:4] = 992 + f.raw[:4] // 40
+        f.meta[:] = (0.4, 1000.0, 1, f.meta[3] + 16666)
+        self.history.append(f)
+
+    def touch(self, mode):
+        if mode == "idle":
+            return False, 0, 0
+        return True, self.rect.x + 8 + self.i % 7, self.rect.y + 6 + self.i % 5
+
+
+def build_cases(only=None):
+    """(name, module_or_None, pages, draw(screen, rect, touch_down, x, y, raw, tuned)) for every drawable entry."""
+    import wifi_panel
+    from ui_components import PANEL_MAP, shared_keyboard, shared_keypad, draw_settings_panel
+
+    cases = []
+    for name, fn in PANEL_MAP:
+        if fn is None:
+            continue
+        module = sys.modules[fn.__module__]
+        if name in ("Mapper", "Input"):
+            draw = lambda s, r, d, x, y, raw, tuned, fn=fn: fn(s, r, d, x, y, raw, tuned)
+        else:
+            draw = lambda s, r, d, x, y, raw, tuned, fn=fn: fn(s, r, d, x, y)
+        cases.append((name, module, PAGES.get(name, 3), draw))
+
+    def sidebar(s, r, d, x, y, raw, tuned):
+        draw_settings_panel(s, pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT), d, x, y, -1, raw, tuned)
+    cases.append(("Sidebar", None, 1, sidebar))
+    cases.append(("VirtualKeyboard", None, 1, lambda s, r, d, x, y, raw, tuned: shared_keyboard.draw(s, r, d, x, y)))
+    cases.append(("VirtualKeypad", None, 1, lambda s, r, d, x, y, raw, tuned: shared_keypad.draw(s, r, d, x, y)))
+
+    # Measure drawing, not nmcli/bluetoothctl: keep the WiFi panel from starting scans on page changes
+    wifi_panel.loading = False
+    if only:
+        cases = [c for c in cases if c[0] in only]
+    return cases
+
+
+def prepare(name, module, page):
+    from ui_components import shared_keyboard, shared_keypad
+    shared_keyboard.active = shared_keypad.active = False
+    if name == "VirtualKeyboard":
+        shared_keyboard.open("Bench", "hello", lambda text: None)
+        shared_keyboard.open_time = 0
+    elif name == "VirtualKeypad":
+        shared_keypad.open("Bench", "1234", lambda text: None)
+        shared_keypad.open_time = 0
+    if module is not None and hasattr(module, "current_page"):
+        module.current_page = page
+        if hasattr(module, "last_page"):
+            module.last_page = page
+
+
+def run_case(screen, rect, inp, draw, mode, frames):
+    raw, tuned = inp.frame.raw, inp.frame.tuned
+    times = np.empty(frames)
+    for n in range(frames):
+        inp.step()
+        d, x, y = inp.touch(mode)
+        t0 = time.perf_counter_ns()
+        pygame.draw.rect(screen, COLOR_PANEL_BG, rect)
+        draw(screen, rect, d, x, y, raw, tuned)
+        times[n] = time.perf_counter_ns() - t0
+    times /= 1e6
+
+    # Allocation profile on a shorter run: transient peak per frame and net growth
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    peak = 0
+    for n in range(ALLOC_FRAMES):
+        inp.step()
+        d, x, y = inp.touch(mode)
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        pygame.draw.rect(screen, COLOR_PANEL_BG, rect)
+        draw(screen, rect, d, x, y, raw, tuned)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    net_blocks = sum(s.count_diff for s in diff)
+    net_bytes = sum(s.size_diff for s in diff)
+
+    return {
+        "frames": frames,
+        "mean_ms": float(times.mean()),
+        "p50_ms": float(np.percentile(times, 50)),
+        "p99_ms": float(np.percentile(times, 99)),
+        "max_ms": float(times.max()),
+        "alloc_peak_kb": peak / 1024.0,
+        "alloc_net_blocks_per_frame": net_blocks / ALLOC_FRAMES,
+        "alloc_net_bytes_per_frame": net_bytes / ALLOC_FRAMES,
+    }
+
+
+def compare(results, old_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    print(f"\nvs {old_path} ({old['meta'].get('revision', '?')}), p99 ratio new/old:")
+    for key, modes in results.items():
+        if key not in old["results"]:
+            continue
+        cols = []
+        for mode, r in modes.items():
+            o = old["results"][key].get(mode)
+            if o:
+                ratio = r["p99_ms"] / max(o["p99_ms"], 1e-9)
+                flag = "  <-- slower" if ratio > 1.2 else ""
+                cols.append(f"{mode} {o['p99_ms']:6.2f} -> {r['p99_ms']:6.2f} ms ({ratio:4.2f}x){flag}")
+        print(f"  {key:<22} " + "   ".join(cols))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless per-panel draw benchmark")
+    ap.add_argument("--frames", type=int, default=2000)
+    ap.add_argument("--only", default="", help="comma-separated panel names")
+    ap.add_argument("--out", default=None, help="JSON results path (default bench_panels_<rev>.json)")
+    ap.add_argument("--compare", default=None, help="earlier results JSON to compare p99 against")
+    args = ap.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rect = pygame.Rect(0, 0, SCREEN_WIDTH - SIDEBAR_WIDTH, SCREEN_HEIGHT)
+    inp = SyntheticInput(rect)
+    cases = build_cases(set(args.only.split(",")) if args.only else None)
+
+    revision = git_revision()
+    results = {}
+    print(f"{len(cases)} panels, {args.frames} frames per case, rev {revision}")
+    print(f"  {'panel':<22}{'touch':<7}{'mean':>8}{'p99':>8}{'max':>8}{'peak KB':>9}{'net B/f':>9}")
+    for name, module, pages, draw in cases:
+        for page in range(pages):
+            key = name if pages == 1 else f"{name}/p{page + 1}"
+            results[key] = {}
+            for mode in TOUCH_MODES:
+                prepare(name, module, page)
+                # Warm-up: layer/text caches and lazy state, so the numbers are steady state
+                warmup = max(1, args.frames // 20)
+                for _ in range(warmup):
+                    d, x, y = inp.touch(mode)
+                    draw(screen, rect, d, x, y, inp.frame.raw, inp.frame.tuned)
+                r = run_case(screen, rect, inp, draw, mode, args.frames)
+                results[key][mode] = r
+                print(f"  {key:<22}{mode:<7}{r['mean_ms']:8.3f}{r['p99_ms']:8.3f}{r['max_ms']:8.3f}"
+                      f"{r['alloc_peak_kb']:9.1f}{r['alloc_net_bytes_per_frame']:9.1f}")
+
+    out = args.out or f"bench_panels_{revision}.json"
+    meta = {"revision": revision, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "frames": args.frames,
+            "python": platform.python_version(), "pygame": pygame.version.ver, "machine": platform.machine(),
+            "screen": [SCREEN_WIDTH, SCREEN_HEIGHT]}
+    with open(out, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2)
+    print(f"saved {out}")
+    if args.compare:
+        compare(results, args.compare)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# bench_telemetry_decoder.py - microbenchmark: shared decoder vs. the two legacy status-line parsers
+# Usage: python3 bench_telemetry_decoder.py [iterations]
+import sys
+import time
+from telemetry_decoder import TelemetryFrame, decode_status_line, DECODE_STATS
+
+
+def make_status_line():
+    """Builds a line in the exact format main.cpp writes with --status-file."""
+    parts = ["latency_ms:0.42 rate_hz:1000.0 connected:1"]
+    parts += [f"ch{i + 1}:{172 + i * 100}" for i in range(16)]
+    parts += [f"tunedid{i}:{(i * 1423) % 65535 - 32768}" for i in range(23)]
+    parts += [f"rawid{i}:{(i * 2711) % 65535 - 32768}" for i in range(23)]
+    return " ".join(parts) + "\n"
+
+
+def legacy_main_parse(content, raw_signals, tuned_signals, ch_sent):
+    """The inline parser main.py used before telemetry_decoder existed."""
+    content = content.strip()
+    parts = content.split()
+    data = {p_item.split(':', 1)[0]: p_item.split(':', 1)[1] for p_item in parts if ':' in p_item}
+    for key, val in data.items():
+        if key.startswith('rawid'):
+            idx = int(key.replace('rawid', ''))
+            if idx < 23: raw_signals[idx] = int(float(val))
+        elif key.startswith('tunedid'):
+            idx = int(key.replace('tunedid', ''))
+            if idx < 23: tuned_signals[idx] = int(float(val))
+        elif key.startswith('ch'):
+            idx = int(key.replace('ch', '')) - 1
+            if idx < 16: ch_sent[idx] = val
+    connected = int(float(data['connected'])) if 'connected' in data else 0
+    latency = float(data['latency_ms']) if 'latency_ms' in data else 0.0
+    rate = float(data['rate_hz']) if 'rate_hz' in data else 0.0
+    return connected, latency, rate
+
+
+def legacy_flight_reader_parse(line):
+    """The parse loop from the old flight_reader.read_flight_data (file I/O removed)."""
+    parts = line.strip().split()
+    data = {
+        'latency_ms': 0.0,
+        'rate_hz': 0.0,
+        'connected': 0,
+        'channels': [0] * 16,
+        'tuned_signals': [0] * 23,
+        'raw_signals': [0] * 23
+    }
+    for part in parts:
+        if ':' in part:
+            k, v = part.split(':', 1)
+            try:
+                if k == 'latency_ms':
+                    data['latency_ms'] = float(v)
+                elif k == 'rate_hz':
+                    data['rate_hz'] = float(v)
+                elif k == 'connected':
+                    data['connected'] = int(v)
+                elif k.startswith('ch'):
+                    idx = int(k[2:]) - 1
+                    if 0 <= idx < 16:
+                        data['channels'][idx] = int(v)
+                elif k.startswith('tunedid'):
+                    idx = int(k.replace('tunedid', ''))
+                    if 0 <= idx < 23:
+                        data['tuned_signals'][idx] = int(v)
+                elif k.startswith('rawid'):
+                    idx = int(k.replace('rawid', ''))
+                    if 0 <= idx < 23:
+                        data['raw_signals'][idx] = int(v)
+            except ValueError:
+                pass
+    return data
+
+
+def time_per_call(fn, iterations):
+    t0 = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - t0) / iterations / 1000.0
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    line = make_status_line()
+    frame = TelemetryFrame()
+    raw, tuned, ch = [0] * 23, [0] * 23, ["0"] * 16
+
+    # Sanity: all three paths must agree before timing them
+    assert decode_status_line(line, frame)
+    legacy_main_parse(line, raw, tuned, ch)
+    fr = legacy_flight_reader_parse(line)
+    assert list(frame.raw) == raw == fr['raw_signals']
+    assert list(frame.tuned) == tuned == fr['tuned_signals']
+    assert list(frame.ch) == [int(c) for c in ch] == fr['channels']
+    assert not decode_status_line(line[:len(line) // 2], frame), "torn line accepted"
+
+    results = {
+        "telemetry_decoder": time_per_call(lambda: decode_status_line(line, frame), iterations),
+        "legacy main.py": time_per_call(lambda: legacy_main_parse(line, raw, tuned, ch), iterations),
+        "legacy flight_reader": time_per_call(lambda: legacy_flight_reader_parse(line), iterations),
+    }
+    base = results["telemetry_decoder"]
+    print(f"{iterations} iterations, {len(line)} byte line")
+    for name, us in results.items():
+        print(f"  {name:<22} {us:8.2f} us/line  ({us / base:4.1f}x)")
+    print(f"  decoder self-reported: {DECODE_STATS['total_ns'] / max(1, DECODE_STATS['decoded']) / 1000.0:.2f} us/line, "
+          f"{DECODE_STATS['rejected']} rejected")
+
+
+if __name__ == "__main__":
+    main()
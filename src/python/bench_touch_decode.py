@@ -0,0 +1,144 @@
+# bench_touch_decode.py - microbenchmark: batch input_event decoding vs. the per-event evdev loop
+# Usage: python3 bench_touch_decode.py [dump_file] [iterations]
+# Record a dump on the Pi with:  timeout 10 cat /dev/input/eventN > touch.dump   (drag around while it runs)
+import sys
+import time
+from touch_decode import (TouchDecoder, EVENT, EVENT_SIZE, EV_SYN, EV_KEY, EV_ABS, SYN_REPORT,
+                          BTN_TOUCH, ABS_MT_POSITION_X, ABS_MT_POSITION_Y)
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+try:
+    from evdev import InputEvent
+except ImportError:
+    InputEvent = None
+
+MAX_X = MAX_Y = 4095
+ABS_MT_SLOT, ABS_MT_TRACKING_ID, ABS_X, ABS_Y = 0x2F, 0x39, 0x00, 0x01
+EV_MSC, MSC_TIMESTAMP = 0x04, 0x05
+
+
+def make_dump(strokes=200, reports_per_stroke=60):
+    """Synthetic single-finger drags, laid out the way a typical MT digitizer reports them."""
+    out = bytearray()
+    t = 1_700_000_000.0
+    def ev(typ, code, value):
+        out.extend(EVENT.pack(int(t), int((t % 1) * 1e6), typ, code, value))
+    for s in range(strokes):
+        for r in range(reports_per_stroke):
+            x = (s * 397 + r * 53) % MAX_X
+            y = (s * 211 + r * 31) % MAX_Y
+            if r == 0:
+                ev(EV_ABS, ABS_MT_SLOT, 0)
+                ev(EV_ABS, ABS_MT_TRACKING_ID, s)
+            ev(EV_ABS, ABS_MT_POSITION_X, x)
+            ev(EV_ABS, ABS_MT_POSITION_Y, y)
+            if r == 0:
+                ev(EV_KEY, BTN_TOUCH, 1)
+            ev(EV_ABS, ABS_X, x)
+            ev(EV_ABS, ABS_Y, y)
+            ev(EV_MSC, MSC_TIMESTAMP, r * 8000)
+            ev(EV_SYN, SYN_REPORT, 0)
+            t += 0.008
+        ev(EV_ABS, ABS_MT_TRACKING_ID, -1)
+        ev(EV_KEY, BTN_TOUCH, 0)
+        ev(EV_SYN, SYN_REPORT, 0)
+        t += 0.3
+    return bytes(out)
+
+
+def legacy_evdev_loop(data):
+    """
+    The pre-batch logic_process path: one InputEvent object per event (as
+    InputDevice.read() yields them) and per-event scaling. Reports are
+    collected instead of published so the results can be compared.
+    """
+    out = []
+    tx = ty = 0
+    is_down = False
+    for sec, usec, typ, code, value in EVENT.iter_unpack(data):
+        event = InputEvent(sec, usec, typ, code, value)
+        if event.type == EV_ABS:
+            if event.code == ABS_MT_POSITION_X:
+                tx = int(event.value * SCREEN_WIDTH / MAX_X)
+            elif event.code == ABS_MT_POSITION_Y:
+                ty = int(event.value * SCREEN_HEIGHT / MAX_Y)
+        elif event.type == EV_KEY:
+            if event.code == BTN_TOUCH:
+                is_down = bool(event.value)
+        elif event.type == EV_SYN and event.code == SYN_REPORT:
+            out.append((is_down, tx, ty))
+    return out
+
+
+def chunks(data, events_per_read):
+    step = events_per_read * EVENT_SIZE
+    return [data[i:i + step] for i in range(0, len(data), step)]
+
+
+def run_decoder(batches, numpy_min=None):
+    dec = TouchDecoder(MAX_X, MAX_Y)
+    decode = dec.decode
+    if numpy_min == "struct":
+        decode = lambda b: dec.decode_struct(memoryview(b)[:len(b) // EVENT_SIZE * EVENT_SIZE])
+    elif numpy_min == "numpy":
+        decode = lambda b: dec.decode_numpy(b, len(b) // EVENT_SIZE)
+    out = []
+    for b in batches:
+        out.extend(decode(b))
+    return out
+
+
+def time_per_event(fn, n_events, iterations):
+    t0 = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - t0) / iterations / n_events
+
+
+def main():
+    args = sys.argv[1:]
+    data = None
+    if args and not args[0].isdigit():
+        with open(args.pop(0), "rb") as f:
+            data = f.read()
+        data = data[:len(data) // EVENT_SIZE * EVENT_SIZE]
+    iterations = int(args[0]) if args else 20
+    data = data or make_dump()
+    n_events = len(data) // EVENT_SIZE
+
+    # Sanity: every path must publish the same press/release edges and the same final position
+    def edges(reports):
+        out, down = [], False
+        for r in reports:
+            if r[0] != down:
+                out.append(r)
+                down = r[0]
+        return out
+    every_report = [r[:3] for r in run_decoder(chunks(data, 1), "struct")]
+    for per_read in (8, 64, 256, 1024):
+        batches = chunks(data, per_read)
+        got = run_decoder(batches, "struct")
+        assert got == run_decoder(batches, "numpy"), per_read
+        got = [r[:3] for r in got]
+        assert edges(got) == edges(every_report) and got[-1] == every_report[-1], per_read
+    if InputEvent is not None:
+        assert legacy_evdev_loop(data) == every_report
+
+    print(f"{n_events} events, {EVENT_SIZE} bytes each, {iterations} iterations")
+    print(f"  {'path':<28} {'events/read':>11} {'ns/event':>9}")
+    if InputEvent is not None:
+        base = time_per_event(lambda: legacy_evdev_loop(data), n_events, iterations)
+        print(f"  {'evdev InputEvent loop':<28} {'-':>11} {base:9.1f}  (1.0x)")
+    else:
+        base = None
+        print("  evdev not installed - legacy path skipped")
+    for per_read in (8, 64, 256, 1024):
+        batches = chunks(data, per_read)
+        for mode in ("struct", "numpy", None):
+            ns = time_per_event(lambda: run_decoder(batches, mode), n_events, iterations)
+            ratio = f"  ({base / ns:.1f}x)" if base else ""
+            print(f"  {'TouchDecoder ' + (mode or 'auto'):<28} {per_read:>11} {ns:9.1f}{ratio}")
+
+
+if __name__ == "__main__":
+    main()
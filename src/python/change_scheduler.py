@@ -0,0 +1,108 @@
+# change_scheduler.py - coalesces bursts of UI edits into one engine update / one settings write
+import threading
+import time
+
+SETTLE_TIME = 0.15      # flush once edits have been quiet this long...
+MAX_DELAY = 0.5         # ...but never hold a change back longer than this while edits keep coming
+RETRY_MIN = 0.25        # first retry of a failed action; doubles per failure...
+RETRY_MAX = 5.0         # ...up to this
+
+
+class ChangeScheduler:
+    """
+    Panels call mark() when they change state (the new value is already in
+    TUNING_STATE / CHANNEL_MAPS, so it is drawn immediately). main.py calls
+    poll() once per frame; when a burst settles, each dirty target's action
+    runs exactly once. stats counts edits received vs. actions issued.
+    Actions that finish elsewhere (engine push on a worker thread) call
+    report(); a failure re-runs the action after a growing backoff.
+    """
+
+    def __init__(self, settle=SETTLE_TIME, max_delay=MAX_DELAY):
+        self.settle = settle
+        self.max_delay = max_delay
+        self.actions = {}
+        self.dirty = set()
+        self.first_edit = 0.0
+        self.last_edit = 0.0
+        self.retry_at = {}
+        self.backoff = {}
+        self._lock = threading.Lock()
+        self.stats = {"edits": 0, "flushes": 0, "retries": 0}
+
+    def register(self, name, action):
+        self.actions[name] = action
+        self.stats[name] = 0
+
+    def mark(self, *names):
+        """Records one edit that dirties the given targets (e.g. "tuning", "engine")."""
+        now = time.monotonic()
+        if not self.dirty:
+            self.first_edit = now
+        self.last_edit = now
+        self.dirty.update(names)
+        self.stats["edits"] += 1
+
+    def pending(self):
+        return bool(self.dirty)
+
+    def report(self, name, ok):
+        """
+        Result of an asynchronous action; safe to call from any thread.
+        Returns the retry delay after a failure, 0.0 on success.
+        """
+        with self._lock:
+            if ok:
+                self.backoff.pop(name, None)
+                self.retry_at.pop(name, None)
+                return 0.0
+            delay = min(self.backoff.get(name, RETRY_MIN / 2) * 2, RETRY_MAX)
+            self.backoff[name] = delay
+            self.retry_at[name] = time.monotonic() + delay
+            return delay
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        due = set()
+        if self.retry_at:
+            with self._lock:
+                due = {name for name, t in self.retry_at.items() if now >= t}
+                for name in due:
+                    del self.retry_at[name]
+            if due:
+                # A due retry doesn't wait for the burst to settle; it carries any pending edit for the same target
+                self.stats["retries"] += len(due)
+                self.dirty -= due
+                self._run(due)
+        if not self.dirty:
+            return bool(due)
+        if now - self.last_edit < self.settle and now - self.first_edit < self.max_delay:
+            return bool(due)
+        self.flush()
+        return True
+
+    def flush(self):
+        """Runs every dirty action now (also used on shutdown so no edit is lost)."""
+        dirty, self.dirty = self.dirty, set()
+        if self.retry_at:
+            with self._lock:
+                dirty.update(self.retry_at)
+                self.retry_at.clear()
+        if not dirty:
+            return
+        self.stats["flushes"] += 1
+        self._run(dirty)
+
+    def _run(self, dirty):
+        # Registration order, so settings hit disk before the (slower) engine handshake
+        for name, action in self.actions.items():
+            if name in dirty:
+                try:
+                    action()
+                except Exception as e:
+                    print(f"Change Scheduler Error ({name}): {e}")
+                self.stats[name] += 1
+
+
+# Shared instance: panels mark, main.py registers actions and polls
+CHANGE_SCHEDULER = ChangeScheduler()
@@ -0,0 +1,62 @@
+# check_dirty_renderer.py - DirtyRenderer output vs. a full redraw, frame by frame, with overlapping widgets
+# Usage: python3 check_dirty_renderer.py [frames]      (exits non-zero if any frame differs)
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from render_core import DirtyRenderer
+
+SIZE = (400, 300)
+WIDGETS = 8
+CHANGE_P = 0.15      # chance per frame that a widget changes state (a fifth of those hide it)
+
+
+def make_draw(font, pos, i, state):
+    """Anti-aliased text plus a ring: redrawing it over itself without restoring the background would show."""
+    def draw(surf):
+        if state is None:
+            return pygame.Rect(0, 0, 0, 0)
+        x, y = pos[i]
+        r = surf.blit(font.render(f"W{i}:{state}", True, (255, 255, (i * 40) % 256)), (x + state % 20, y))
+        return r.union(pygame.draw.circle(surf, (200, 100, i * 30), (x + 30, y + state % 15 + 10), 8, 2))
+    return draw
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode(SIZE)
+    bg = pygame.Surface(SIZE)
+    for y in range(SIZE[1]):
+        pygame.draw.line(bg, (y % 256, 40, 255 - y % 256), (0, y), (SIZE[0] - 1, y))
+    font = pygame.font.Font(None, 30)
+
+    rng = random.Random(1)
+    pos = [(rng.randrange(0, SIZE[0] - 100), rng.randrange(0, SIZE[1] - 50)) for _ in range(WIDGETS)]
+    screen, ref = pygame.Surface(SIZE), pygame.Surface(SIZE)
+    renderer = DirtyRenderer(screen, bg)
+    states = [0] * WIDGETS
+    bad = 0
+    for _ in range(frames):
+        for i in range(WIDGETS):
+            if rng.random() < CHANGE_P:
+                states[i] = None if rng.random() < 0.2 else rng.randrange(100)
+        renderer.begin()
+        for i in range(WIDGETS):
+            renderer.widget(i, states[i], make_draw(font, pos, i, states[i]))
+        renderer.redraw_all = False     # what present() does, without needing a display
+        ref.blit(bg, (0, 0))
+        for i in range(WIDGETS):
+            make_draw(font, pos, i, states[i])(ref)
+        bad += pygame.image.tostring(ref, "RGB") != pygame.image.tostring(screen, "RGB")
+
+    print(f"{frames} frames, {WIDGETS} overlapping widgets")
+    print("RENDER OK" if not bad else f"{bad} frame(s) differ from a full redraw")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# check_mapper_parity.py - compares mapping_plan.MappingPlan against cpp/InputMapper.h compiled with g++
+# Usage: python3 check_mapper_parity.py      (needs g++ and nlohmann/json on the include path; exits non-zero on mismatch)
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+from mapping_plan import MappingPlan, NONE_ID
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+
+CPP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cpp")
+
+# Reads jobs from stdin, prints the 16 mapped channels for every signal row:
+#   M <16 map ids> <split_target> <pos_src> <neg_src> <split_flags> <rows> <23 signals per row...>
+HARNESS = r'''
+#include "InputMapper.h"
+#include <cstdio>
+#include <iostream>
+#include <string>
+
+int main() {
+    std::string kind;
+    while (std::cin >> kind) {
+        int16_t maps[16];
+        for (int i = 0; i < 16; i++) { int v; std::cin >> v; maps[i] = (int16_t)v; }
+        int target, pos, neg, flags, rows;
+        std::cin >> target >> pos >> neg >> flags >> rows;
+        InputMapper mapper;
+        mapper.set_from_config(maps, target, pos, neg, flags);
+        std::vector<int> raw(23);
+        LogicalSignals out;
+        for (int r = 0; r < rows; r++) {
+            for (int i = 0; i < 23; i++) std::cin >> raw[i];
+            mapper.update(raw, out);
+            for (int i = 0; i < 16; i++) std::printf("%d ", out.channels[i]);
+            std::printf("\n");
+        }
+    }
+    return 0;
+}
+'''
+
+
+def build_harness(workdir):
+    src = os.path.join(workdir, "harness.cpp")
+    exe = os.path.join(workdir, "harness")
+    with open(src, "w") as f:
+        f.write(HARNESS)
+    subprocess.run(["g++", "-std=c++17", "-O0", "-I", CPP_DIR, src, "-o", exe], check=True)
+    return exe
+
+
+def signal_rows(rng):
+    """Engine-shaped rows (axes, +-32767 buttons, 21/22 held at -32768), arbitrary int16 rows and the extremes."""
+    n = 400
+    engine = np.full((n, NUM_SIGNALS), -32768, dtype=np.int32)
+    engine[:, :4] = rng.integers(-32768, 32768, (n, 4))
+    engine[:, 4:6] = rng.integers(0, 32768, (n, 2))           # triggers
+    engine[:, 6:21] = np.where(rng.random((n, 15)) < 0.5, 32767, -32768)
+    anything = rng.integers(-32768, 32768, (n, NUM_SIGNALS)).astype(np.int32)
+    edges = np.array([[v] * NUM_SIGNALS for v in (-32768, -32767, -1, 0, 1, 16383, 16384, 32766, 32767)], dtype=np.int32)
+    return np.concatenate([engine, anything, edges])
+
+
+def main():
+    rng = np.random.default_rng(4321)
+    rows = signal_rows(rng)
+
+    identity = list(range(NUM_CH))
+    odd_ids = [NONE_ID, 21, 23, 99, -1, 0, 5, 20, NONE_ID, 3, 2, 1, 0, 12, 6, NONE_ID]
+    cases = [(identity, -1, NONE_ID, NONE_ID, 0), (odd_ids, -1, NONE_ID, NONE_ID, 0), (identity, 16, 0, 1, 15)]
+    # Every center/reverse combination, split sources covering NONE and out-of-range ids
+    for flags, (pos, neg) in itertools.product(range(16), ((4, 5), (0, NONE_ID), (NONE_ID, NONE_ID), (200, 3), (6, 21))):
+        cases.append((odd_ids if flags & 1 else identity, flags % NUM_CH, pos, neg, flags))
+
+    lines, expected = [], []
+    for maps, target, pos, neg, flags in cases:
+        split = {"target_ch": target, "pos_id": pos, "neg_id": neg,
+                 "pos_center": bool(flags & 1), "pos_reverse": bool(flags & 2),
+                 "neg_center": bool(flags & 4), "neg_reverse": bool(flags & 8)}
+        plan = MappingPlan(maps, split)
+        expected.append(np.array([plan.apply(row).copy() for row in rows]))
+        lines.append(f"M {' '.join(map(str, maps))} {target} {pos} {neg} {flags} {len(rows)} "
+                     + " ".join(map(str, rows.ravel())))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        exe = build_harness(workdir)
+        result = subprocess.run([exe], input="\n".join(lines) + "\n", capture_output=True, text=True, check=True)
+    got = np.array(result.stdout.split(), dtype=np.int32).reshape(len(cases), len(rows), NUM_CH)
+
+    failures = 0
+    for (maps, target, pos, neg, flags), py_out, cpp in zip(cases, expected, got):
+        bad = np.argwhere(py_out != cpp)
+        ok = len(bad) == 0
+        detail = "" if ok else f"  first mismatch row {bad[0][0]} ch{bad[0][1] + 1}: py={py_out[tuple(bad[0])]} cpp={cpp[tuple(bad[0])]}"
+        if not ok:
+            print(f"FAIL maps={'odd' if maps is odd_ids else 'identity'} target={target} pos={pos} neg={neg} flags={flags:04b}{detail}")
+        failures += not ok
+
+    print(f"{len(cases)} configs x {len(rows)} rows")
+    print("PARITY OK" if not failures else f"{failures} config(s) differ")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
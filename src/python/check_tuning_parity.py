@@ -0,0 +1,170 @@
+# check_tuning_parity.py - compares tuning_math.py / response_lut.py against cpp/input_tuning.h / response_lut.h compiled with g++
+# Usage: python3 check_tuning_parity.py      (needs g++ on PATH; exits non-zero on mismatch)
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import tuning_math as tm
+from response_lut import LUT_POINTS, build_lut, lut_response
+
+CPP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cpp")
+CURVE_ABS_TOL = 1e-6   # ~1/30 of one int16 output step
+
+
+def curve_expected_exact(curve_type, expo):
+    """
+    True where apply_curve must match bit for bit. STANDARD with expo < 0 goes
+    through powf and EXTREME through expf; tuning_math rounds the double result
+    once, which can land 1 ulp away from glibc, so those only get CURVE_ABS_TOL.
+    """
+    if curve_type == tm.CURVE_STANDARD:
+        return expo >= 0
+    return curve_type != tm.CURVE_EXTREME
+
+# Reads jobs from stdin, prints one result per input value:
+#   C <type> <expo> <n> <v...>                              -> apply_curve float bits (hex)
+#   T <dz> <sens> <alpha> <type> <expo> <cine> <spd> <acc> <n> <raw...> -> apply_tuning ints
+#   L <table...> <n> <v...>                                 -> ResponseLUT::response float bits (hex)
+HARNESS = r'''
+#include "input_tuning.h"
+#include "response_lut.h"
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <iostream>
+#include <string>
+
+static float rf() { std::string s; std::cin >> s; return std::strtof(s.c_str(), nullptr); }
+static int ri() { int v; std::cin >> v; return v; }
+
+int main() {
+    std::string kind;
+    while (std::cin >> kind) {
+        if (kind == "C") {
+            int type = ri(); float expo = rf(); int n = ri();
+            for (int i = 0; i < n; i++) {
+                float out = apply_curve(rf(), type, expo);
+                uint32_t bits; std::memcpy(&bits, &out, 4);
+                std::printf("%08x\n", bits);
+            }
+        } else if (kind == "L") {
+            ResponseTable table;
+            for (int i = 0; i < LUT_POINTS; i++) table.t[i] = rf();
+            int n = ri();
+            for (int i = 0; i < n; i++) {
+                float out = ResponseLUT::response(&table, rf());
+                uint32_t bits; std::memcpy(&bits, &out, 4);
+                std::printf("%08x\n", bits);
+            }
+        } else {
+            float dz = rf(), sens = rf(), alpha = rf(); int type = ri(); float expo = rf();
+            bool cine = ri() != 0; float spd = rf(), acc = rf(); int n = ri();
+            int16_t prev = 0; float vel = 0.0f, pos = 0.0f;
+            for (int i = 0; i < n; i++) {
+                int v = ri();
+                apply_tuning(v, dz, sens, alpha, type, expo, cine, spd, acc, prev, vel, pos, 0.001f);
+                std::printf("%d\n", v);
+            }
+        }
+    }
+    return 0;
+}
+'''
+
+
+def f32hex(x):
+    return float(np.float32(x)).hex()
+
+
+def build_harness(workdir):
+    src = os.path.join(workdir, "harness.cpp")
+    exe = os.path.join(workdir, "harness")
+    with open(src, "w") as f:
+        f.write(HARNESS)
+    subprocess.run(["g++", "-std=c++17", "-O0", "-I", CPP_DIR, src, "-o", exe], check=True)
+    return exe
+
+
+def main():
+    rng = np.random.default_rng(1234)
+    curve_inputs = np.concatenate([np.linspace(-1, 1, 2001), rng.uniform(-1, 1, 2000), [0.0, 0.0009, -0.0009, 0.001]]).astype(np.float32)
+    raw_sweep = np.concatenate([np.arange(-32768, 32768, 37), rng.integers(-32768, 32768, 2000)]).astype(np.int32)
+    steps = np.repeat(np.array([0, 32767, -32768, 12000, 0], dtype=np.int32), 400)
+
+    curve_cases = [(t, e) for t in range(4) for e in (-10.0, -3.3, -0.05, 0.0, 0.05, 2.5, 7.7, 10.0)]
+    tuning_cases = [
+        # dz,   sens, alpha, type, expo, cine, spd,  acc
+        (0.05, 1.0, 0.2, 0, 0.0, False, 8.0, 3.5),
+        (0.1, 1.7, 0.0, 1, 4.2, False, 8.0, 3.5),
+        (0.0, 0.6, 0.55, 2, 6.0, False, 8.0, 3.5),
+        (0.25, 2.3, 0.9, 3, -8.0, False, 8.0, 3.5),
+        (0.05, 1.0, 0.2, 1, -3.0, True, 10.0, 6.0),
+        (0.02, 1.4, 0.4, 3, 12.0, True, 2.5, 0.7),
+    ]
+    lut_cases = [
+        # rate, type, expo
+        (1.0, 0, 0.0),
+        (1.7, 1, -4.0),
+        (0.6, 2, 6.0),
+        (2.3, 3, 8.0),
+    ]
+
+    lines, expected = [], []
+    for t, e in curve_cases:
+        lines.append(f"C {t} {f32hex(e)} {len(curve_inputs)} " + " ".join(f32hex(v) for v in curve_inputs))
+        out = tm.apply_curve(curve_inputs, t, np.float32(e))
+        expected.append(("curve", (t, e), out.view(np.uint32)))
+    for case in tuning_cases:
+        dz, sens, alpha, t, e, cine, spd, acc = case
+        series = steps if cine else raw_sweep
+        lines.append(f"T {f32hex(dz)} {f32hex(sens)} {f32hex(alpha)} {t} {f32hex(e)} {int(cine)} {f32hex(spd)} {f32hex(acc)} {len(series)} "
+                     + " ".join(map(str, series)))
+        out, _ = tm.apply_tuning_series(series, np.float32(dz), np.float32(sens), np.float32(alpha), t, np.float32(e),
+                                        cine, np.float32(spd), np.float32(acc))
+        expected.append(("tuning", case, out))
+    for case in lut_cases:
+        table = build_lut(*case)[0]
+        lines.append("L " + " ".join(f32hex(v) for v in table) + f" {len(curve_inputs)} " + " ".join(f32hex(v) for v in curve_inputs))
+        expected.append(("lut", case, lut_response(table, curve_inputs).view(np.uint32)))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        exe = build_harness(workdir)
+        result = subprocess.run([exe], input="\n".join(lines) + "\n", capture_output=True, text=True, check=True)
+    got = iter(result.stdout.split())
+
+    failures = 0
+    for kind, case, py_out in expected:
+        if kind == "curve":
+            cpp = np.array([int(next(got), 16) for _ in range(len(py_out))], dtype=np.uint32)
+            ulps = np.abs(cpp.view(np.int32).astype(np.int64) - py_out.view(np.int32).astype(np.int64))
+            abs_err = float(np.max(np.abs(cpp.view(np.float32).astype(np.float64) - py_out.view(np.float32))))
+            exact = curve_expected_exact(*case)
+            if exact:
+                ok = int(ulps.max()) == 0
+            else:
+                # EXTREME's (expf - 1) cancellation can turn a libm rounding difference into a few
+                # ulps near zero; anything far below one int16 output step (1/32767) is invisible
+                ok = int(ulps.max()) <= 1 or abs_err < CURVE_ABS_TOL
+            print(f"{'ok  ' if ok else 'FAIL'} apply_curve type={case[0]} expo={case[1]:6.2f}  expect={'exact' if exact else 'tol  '}"
+                  f"  exact={np.mean(ulps == 0) * 100:6.2f}%  max_abs_err={abs_err:.2e}")
+        elif kind == "lut":
+            # Same float32 interpolation on both sides, so the table lookup must be bit-exact
+            cpp = np.array([int(next(got), 16) for _ in range(len(py_out))], dtype=np.uint32)
+            ok = bool(np.array_equal(cpp, py_out))
+            print(f"{'ok  ' if ok else 'FAIL'} lut_response rate={case[0]:.1f} type={case[1]} expo={case[2]:5.1f}  expect=exact"
+                  f"  exact={np.mean(cpp == py_out) * 100:6.2f}%")
+        else:
+            cpp = np.array([int(next(got)) for _ in range(len(py_out))], dtype=np.int32)
+            diff = np.abs(cpp.astype(np.int64) - py_out)
+            worst = int(diff.max())
+            ok = worst == 0
+            print(f"{'ok  ' if ok else 'FAIL'} apply_tuning {case}  exact={np.mean(diff == 0) * 100:6.2f}%  max_diff={worst}")
+        failures += not ok
+
+    print("PARITY OK" if not failures else f"{failures} case(s) outside tolerance")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
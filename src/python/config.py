@@ -11,6 +11,8 @@ COLOR_GOOD = (40, 255, 80)
 COLOR_WARN = (255, 160, 40)
 COLOR_DANGER = (255, 60, 60)
 COLOR_DISCONNECTED = (255, 100, 100)
+COLOR_SIDEBAR_BG = (30, 30, 35)
+COLOR_PANEL_BG = (35, 35, 40)
 
 GEAR_COLOR = (200, 200, 200)
 GEAR_CENTER = (40, 40)
@@ -20,6 +22,25 @@ BTN_RECT = (934, 10, 80, 80)
 SETTINGS_RECT = (SCREEN_WIDTH - 190, 0, 190, 600)
 SETTINGS_SPEED = 30
 
+# Main screen presents only changed regions; False = full redraw + flip every frame (F key toggles)
+DIRTY_RECT_RENDERING = True
+
+# Frame pacing: loop wakes at MAX_FPS, but only renders on change (touch, telemetry, animation);
+# with nothing happening the screen is still refreshed at IDLE_FPS
+MAX_FPS = 60
+IDLE_FPS = 5
+
+# Per-stage main-loop profiler (P toggles the overlay, D dumps the window to CSV)
+PROFILER_ENABLED = False
+PROFILE_DUMP_DIR = "/tmp"
+
+# Flight recorder: the Logs panel starts/stops it; with AUTOSTART every session records from launch.
+# start() deletes the oldest logs so at most MAX_FILES (new one included) and MAX_BYTES stay on disk.
+FLIGHT_LOG_DIR = "/home/pi4/rc-flight-controller/logs"
+FLIGHT_LOG_AUTOSTART = False
+FLIGHT_LOG_MAX_FILES = 20
+FLIGHT_LOG_MAX_BYTES = 256 * 1024 * 1024   # ~10 h at 50 Hz
+
 DEBOUNCE = 0.5
 STICK_RADIUS = 8
 ICON_X = 20
@@ -0,0 +1,182 @@
+# config_sync.py - versioned binary config packet + ack handshake with the C++ engine (see cpp/config_sync.h)
+import copy
+import socket
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from response_lut import lut_for_state
+
+ENGINE_ADDR = ("127.0.0.1", 5005)
+CFG_VERSION = 1
+CFG_FLAG_LUT = 0x0001
+CFG_HEADER = struct.Struct("<4sHHII")      # magic, version, flags, seq, hash
+CFG_BODY = struct.Struct("<16hbBBB7fBBH")  # must stay 68 bytes, like ConfigBody
+CFG_REPLY = struct.Struct("<4sIIB")        # CACK/CNAK, seq, hash, status
+CFG_QUERY = b"CFG?"                        # followed by u32 seq, echoed in the reply
+NONE_ID = 22                               # mapper source id that always reads -32768
+
+STATUS_NAMES = {0: "OK", 1: "BAD_SIZE", 2: "BAD_VERSION", 3: "BAD_HASH", 4: "BAD_LUT", 5: "BAD_VALUE"}
+BAD_HASH = 3
+
+
+def pack_config_body(channel_maps, split_config, tuning_state):
+    s, t = split_config, tuning_state
+    maps = [int(c) for c in channel_maps[:16]]
+    maps += [NONE_ID] * (16 - len(maps))
+    split_flags = (int(s["pos_center"]) | int(s["pos_reverse"]) << 1
+                   | int(s["neg_center"]) << 2 | int(s["neg_reverse"]) << 3)
+    # Deadzones are divided in float32 exactly like load_system_config() and tuning_math.engine_params()
+    ten = np.float32(10.0)
+    return CFG_BODY.pack(
+        *maps, int(s["target_ch"]), int(s["pos_id"]), int(s["neg_id"]), split_flags,
+        np.float32(t["left_deadzone"]) / ten, np.float32(t["right_deadzone"]) / ten,
+        t["global_rate"], t["expo"], t["smoothing"], t["cine_speed"], t["cine_accel"],
+        int(t["curve_type"]), int(bool(t["cine_on"])), 0)
+
+
+def build_config_packet(channel_maps, split_config, tuning_state, seq):
+    """Returns (packet, hash). The response table rides along so curve params and LUT land together."""
+    payload = pack_config_body(channel_maps, split_config, tuning_state) + lut_for_state(tuning_state)[2]
+    cfg_hash = zlib.crc32(payload)
+    return CFG_HEADER.pack(b"CFG1", CFG_VERSION, CFG_FLAG_LUT, seq & 0xFFFFFFFF, cfg_hash) + payload, cfg_hash
+
+
+class ConfigSync:
+    """
+    Sends the full config as one packet and waits for the engine's ack.
+    sync() first asks the engine for its current hash and skips the push
+    when it already runs this exact config.
+    """
+
+    def __init__(self, addr=ENGINE_ADDR, timeout=0.05, retries=3):
+        self.addr = addr
+        self.timeout = timeout
+        self.retries = retries
+        self.seq = 0
+        self.engine_hash = None
+        self.stats = {"pushes": 0, "acks": 0, "nacks": 0, "timeouts": 0, "skipped": 0, "last_rtt_ms": 0.0}
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _request(self, packet, seq):
+        """Sends packet and returns (ok, hash, status) for the matching reply, or None on timeout."""
+        self.sock.sendto(packet, self.addr)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                data = self.sock.recv(64)
+            except socket.timeout:
+                return None
+            if len(data) != CFG_REPLY.size:
+                continue
+            magic, r_seq, r_hash, status = CFG_REPLY.unpack(data)
+            if r_seq == seq and magic in (b"CACK", b"CNAK"):   # late replies to older requests are dropped
+                return magic == b"CACK", r_hash, status
+
+    def query(self):
+        """Hash of the config the engine is running (0 if edited live), or None if it didn't answer."""
+        self.seq = self.seq % 0xFFFFFFFF + 1
+        try:
+            reply = self._request(CFG_QUERY + struct.pack("<I", self.seq), self.seq)
+        except OSError:
+            return None
+        self.engine_hash = reply[1] if reply else None
+        return self.engine_hash
+
+    def push(self, channel_maps, split_config, tuning_state):
+        self.seq = self.seq % 0xFFFFFFFF + 1
+        packet, cfg_hash = build_config_packet(channel_maps, split_config, tuning_state, self.seq)
+        for attempt in range(self.retries):
+            self.stats["pushes"] += 1
+            t0 = time.perf_counter()
+            try:
+                reply = self._request(packet, self.seq)
+            except OSError as e:
+                print(f"Config Sync Error: {e}")
+                reply = None
+            if reply is None:
+                self.stats["timeouts"] += 1
+                continue
+            ok, r_hash, status = reply
+            self.stats["last_rtt_ms"] = (time.perf_counter() - t0) * 1000.0
+            if ok and r_hash == cfg_hash:
+                self.stats["acks"] += 1
+                self.engine_hash = cfg_hash
+                return True
+            self.stats["nacks"] += 1
+            print(f"Config Sync: engine rejected config ({STATUS_NAMES.get(status, status)})")
+            if status != BAD_HASH:
+                return False
+        return False
+
+    def sync(self, channel_maps, split_config, tuning_state, force=False):
+        if not force:
+            _, cfg_hash = build_config_packet(channel_maps, split_config, tuning_state, 0)
+            if self.query() == cfg_hash:
+                self.stats["skipped"] += 1
+                return True
+        return self.push(channel_maps, split_config, tuning_state)
+
+    def close(self):
+        self.sock.close()
+
+
+class BackgroundPush:
+    """
+    Runs ConfigSync.push() on a worker thread, so a slow or absent engine
+    (up to timeout x retries per push) never stalls the render loop.
+    submit() snapshots the config and returns at once; submits that arrive
+    while a push is in flight collapse into one push of the newest snapshot.
+    on_result(ok) is called from the worker after every push.
+    """
+
+    def __init__(self, sync, on_result=None):
+        self.sync = sync
+        self.on_result = on_result
+        self._pending = None
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, channel_maps, split_config, tuning_state):
+        snapshot = (list(channel_maps), dict(split_config), copy.deepcopy(tuning_state))
+        with self._cond:
+            self._pending = snapshot
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout=1.0):
+        """Waits for the queued push to finish (used at shutdown)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending is not None or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                snapshot, self._pending = self._pending, None
+                self._busy = True
+            ok = self.sync.push(*snapshot)
+            if self.on_result is not None:
+                self.on_result(ok)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+# Shared instance used by main.py
+CONFIG_SYNC = ConfigSync()
@@ -0,0 +1,297 @@
+# crsf_codec.py - CRSF frame encode/decode (see cpp/crsf_sender.h, cpp/crsf_parser.h), scalar and batched NumPy
+#
+# Frame: address, length (type + payload + crc), type, payload, crc8 (poly 0xD5 over type + payload).
+# The scalar functions follow the C++ one frame at a time; the *_batch functions
+# take (N, ...) arrays and are meant for logs and test generation (bench_crsf_codec.py).
+import struct
+import numpy as np
+
+F32 = np.float32
+
+# crsf_parser.h constants
+ADDRESS_RADIO_TRANSMITTER = 0xEE
+SYNC_BYTE = 0xC8
+CRC_POLY = 0xD5
+
+FRAMETYPE_GPS = 0x02
+FRAMETYPE_VARIO = 0x07
+FRAMETYPE_BATTERY_SENSOR = 0x08
+FRAMETYPE_AIRSPEED = 0x0A
+FRAMETYPE_FUEL = 0x0B
+FRAMETYPE_LINK_STATISTICS = 0x14
+FRAMETYPE_RC_CHANNELS_PACKED = 0x16
+FRAMETYPE_ATTITUDE = 0x1E
+FRAMETYPE_FLIGHT_MODE = 0x21
+FRAMETYPE_DEVICE_INFO = 0x29
+FRAMETYPE_ESC_TELEMETRY = 0x7E
+
+# RC_CHANNELS_PACKED: 16 x 11 bits, LSB first
+CHANNELS = 16
+CH_BITS = 11
+CRSF_MIN, CRSF_MID, CRSF_MAX = 172, 992, 1811
+RC_PAYLOAD_SIZE = CHANNELS * CH_BITS // 8       # 22
+RC_FRAME_SIZE = RC_PAYLOAD_SIZE + 4             # 26
+
+
+def _crc8_table(poly):
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return table
+
+
+CRC8_TABLE = _crc8_table(CRC_POLY)
+_CRC8_NP = np.array(CRC8_TABLE, dtype=np.uint8)
+_FIELD_BYTE = np.arange(CHANNELS) * CH_BITS // 8                   # first byte of each 11-bit field
+_FIELD_SHIFT = (np.arange(CHANNELS) * CH_BITS % 8).astype(np.uint32)
+
+
+# --- SCALAR ---
+def crc8(data):
+    crc = 0
+    for b in data:
+        crc = CRC8_TABLE[crc ^ b]
+    return crc
+
+
+def to_crsf(value):
+    """Engine channel (-32768..32767) -> CRSF 172..1811, in float32 like CRSFSender::send_channels()."""
+    norm = F32(value + 32768) / F32(65535.0)
+    return min(CRSF_MAX, max(CRSF_MIN, int(norm * F32(1639.0) + F32(172.0))))
+
+
+def crsf_to_us(value):
+    """CRSF channel value -> RC pulse width in microseconds (992 = 1500 us)."""
+    return 1500.0 + (value - CRSF_MID) * 0.625
+
+
+def pack_channels(values):
+    """16 channel values (0..2047) -> the 22-byte RC_CHANNELS_PACKED payload."""
+    out = bytearray()
+    bits = nbits = 0
+    for v in values:
+        bits |= (int(v) & 0x7FF) << nbits
+        nbits += CH_BITS
+        while nbits >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            nbits -= 8
+    return bytes(out)
+
+
+def unpack_channels(payload):
+    bits = int.from_bytes(payload[:RC_PAYLOAD_SIZE], "little")
+    return [(bits >> (i * CH_BITS)) & 0x7FF for i in range(CHANNELS)]
+
+
+def encode_frame(frame_type, payload, address=SYNC_BYTE):
+    body = bytes((frame_type,)) + bytes(payload)
+    return bytes((address, len(body) + 1)) + body + bytes((crc8(body),))
+
+
+def encode_rc_frame(crsf_values, address=ADDRESS_RADIO_TRANSMITTER):
+    """CRSF channel values (172..1811) -> 26-byte frame."""
+    return encode_frame(FRAMETYPE_RC_CHANNELS_PACKED, pack_channels(crsf_values), address)
+
+
+def engine_rc_frame(logical_channels):
+    """The exact frame CRSFSender::send_channels() writes for 16 engine channels."""
+    return encode_rc_frame([to_crsf(v) for v in logical_channels])
+
+
+# --- TELEMETRY PAYLOADS ---
+# Field names follow TelemetryData in crsf_parser.h; all multi-byte values are big-endian.
+_LINK = struct.Struct(">BBBbBBBBBb")   # RSSI bytes are unsigned -dBm (TelemetryData keeps them as int8)
+_GPS = struct.Struct(">iiHHHB")
+_U32 = struct.Struct(">I")
+_BATTERY = struct.Struct(">HH3sB")
+_I16 = struct.Struct(">h")
+_U16 = struct.Struct(">H")
+_ATTITUDE = struct.Struct(">hhh")
+_DEVICE = struct.Struct(">BBBB")
+
+LINK_FIELDS = ("uplink_rssi_1", "uplink_rssi_2", "uplink_link_quality", "uplink_snr", "active_antenna",
+               "rf_mode", "uplink_tx_power", "downlink_rssi", "downlink_link_quality", "downlink_snr")
+GPS_FIELDS = ("gps_latitude", "gps_longitude", "gps_groundspeed", "gps_heading", "gps_altitude", "gps_satellites")
+ATTITUDE_FIELDS = ("attitude_pitch", "attitude_roll", "attitude_yaw")
+DEVICE_FIELDS = ("mcu_temperature", "load", "heartbeat_status", "arm_status")
+
+
+def decode_payload(frame_type, payload):
+    """
+    parse_crsf_frame()'s switch: the TelemetryData fields one frame sets, or
+    None where the C++ returns false (short payload or unknown type).
+    RC_CHANNELS_PACKED, which the engine never receives, decodes to {"channels": [...]}.
+    """
+    n = len(payload)
+    if frame_type == FRAMETYPE_LINK_STATISTICS:
+        return dict(zip(LINK_FIELDS, _LINK.unpack_from(payload))) if n >= 10 else None
+    if frame_type == FRAMETYPE_GPS:
+        if n < 15:
+            return None
+        d = dict(zip(GPS_FIELDS, _GPS.unpack_from(payload)))
+        if n >= 19:
+            d["gps_hdop"] = float(F32(_U32.unpack_from(payload, 15)[0]) / F32(100.0))
+        return d
+    if frame_type == FRAMETYPE_BATTERY_SENSOR:
+        if n < 8:
+            return None
+        voltage, current, used, remaining = _BATTERY.unpack_from(payload)
+        return {"battery_voltage": voltage, "battery_current": current,
+                "battery_capacity_used": int.from_bytes(used, "big"), "battery_remaining": remaining}
+    if frame_type == FRAMETYPE_VARIO:
+        return {"vario_vertical_speed": _I16.unpack_from(payload)[0]} if n >= 2 else None
+    if frame_type == FRAMETYPE_ATTITUDE:
+        return dict(zip(ATTITUDE_FIELDS, _ATTITUDE.unpack_from(payload))) if n >= 6 else None
+    if frame_type == FRAMETYPE_FLIGHT_MODE:
+        # Null-terminated; the C++ keeps everything but the last byte
+        return {"flight_mode": bytes(payload[:-1]).decode("latin-1")} if n >= 1 else None
+    if frame_type == FRAMETYPE_AIRSPEED:
+        return {"airspeed": _U16.unpack_from(payload)[0]} if n >= 2 else None
+    if frame_type == FRAMETYPE_ESC_TELEMETRY:
+        if n < 2:
+            return None
+        d = {"rpm": _U16.unpack_from(payload)[0]}
+        if n >= 3:
+            d["esc_temperature"] = payload[2]
+        return d
+    if frame_type == FRAMETYPE_FUEL:
+        return {"fuel_level": _U16.unpack_from(payload)[0]} if n >= 2 else None
+    if frame_type == FRAMETYPE_DEVICE_INFO:
+        return dict(zip(DEVICE_FIELDS, _DEVICE.unpack_from(payload))) if n >= 4 else {}
+    if frame_type == FRAMETYPE_RC_CHANNELS_PACKED:
+        return {"channels": unpack_channels(payload)} if n >= RC_PAYLOAD_SIZE else None
+    return None
+
+
+def encode_payload(frame_type, fields):
+    """Inverse of decode_payload() for building test frames; missing fields are 0."""
+    get = lambda k: fields.get(k, 0)
+    if frame_type == FRAMETYPE_LINK_STATISTICS:
+        return _LINK.pack(*(get(k) for k in LINK_FIELDS))
+    if frame_type == FRAMETYPE_GPS:
+        out = _GPS.pack(*(get(k) for k in GPS_FIELDS))
+        if "gps_hdop" in fields:
+            out += _U32.pack(int(round(fields["gps_hdop"] * 100)))
+        return out
+    if frame_type == FRAMETYPE_BATTERY_SENSOR:
+        return _BATTERY.pack(get("battery_voltage"), get("battery_current"),
+                             int(get("battery_capacity_used")).to_bytes(3, "big"), get("battery_remaining"))
+    if frame_type == FRAMETYPE_VARIO:
+        return _I16.pack(get("vario_vertical_speed"))
+    if frame_type == FRAMETYPE_ATTITUDE:
+        return _ATTITUDE.pack(*(get(k) for k in ATTITUDE_FIELDS))
+    if frame_type == FRAMETYPE_FLIGHT_MODE:
+        return fields.get("flight_mode", "").encode("latin-1") + b"\0"
+    if frame_type == FRAMETYPE_AIRSPEED:
+        return _U16.pack(get("airspeed"))
+    if frame_type == FRAMETYPE_ESC_TELEMETRY:
+        return _U16.pack(get("rpm")) + bytes((get("esc_temperature"),))
+    if frame_type == FRAMETYPE_FUEL:
+        return _U16.pack(get("fuel_level"))
+    if frame_type == FRAMETYPE_DEVICE_INFO:
+        return _DEVICE.pack(*(get(k) for k in DEVICE_FIELDS))
+    if frame_type == FRAMETYPE_RC_CHANNELS_PACKED:
+        return pack_channels(fields["channels"])
+    raise ValueError(f"unsupported CRSF frame type 0x{frame_type:02X}")
+
+
+def encode_telemetry(frame_type, address=SYNC_BYTE, **fields):
+    return encode_frame(frame_type, encode_payload(frame_type, fields), address)
+
+
+def decode_frame(frame):
+    """
+    Validates one complete frame like parse_crsf_frame() (address, length, crc)
+    and returns (type, fields), or None.
+    """
+    if len(frame) < 4 or frame[0] not in (ADDRESS_RADIO_TRANSMITTER, SYNC_BYTE):
+        return None
+    length = frame[1]
+    if len(frame) != length + 2 or crc8(frame[2:-1]) != frame[-1]:
+        return None
+    fields = decode_payload(frame[2], frame[3:-1])
+    return None if fields is None else (frame[2], fields)
+
+
+def iter_frames(data):
+    """
+    Splits a raw serial capture into frames the way CRSFSender::receive_loop()
+    does: wait for an address byte, then take length + 2 bytes. Yields bytes
+    objects (crc not checked here; see decode_frame()).
+    """
+    i, n = 0, len(data)
+    while i < n:
+        if data[i] not in (ADDRESS_RADIO_TRANSMITTER, SYNC_BYTE):
+            i += 1
+            continue
+        if i + 1 >= n:
+            return
+        end = i + data[i + 1] + 2
+        if end > n:
+            return
+        yield bytes(data[i:end])
+        i = end
+
+
+# --- BATCHED (NumPy) ---
+def crc8_batch(data):
+    """crc8 of every row of a (N, L) uint8 array -> (N,) uint8. One table gather per column."""
+    cols = np.ascontiguousarray(np.asarray(data, dtype=np.uint8).T)
+    crc = np.zeros(cols.shape[1], dtype=np.uint8)
+    for col in cols:
+        np.bitwise_xor(crc, col, out=crc)
+        crc = _CRC8_NP.take(crc)
+    return crc
+
+
+def to_crsf_batch(values):
+    norm = (np.asarray(values, dtype=np.int64) + 32768).astype(F32) / F32(65535.0)
+    return np.clip((norm * F32(1639.0) + F32(172.0)).astype(np.int64), CRSF_MIN, CRSF_MAX)
+
+
+def pack_channels_batch(values):
+    """(N, 16) channel values -> (N, 22) uint8 payloads, via unpackbits/packbits on the 11-bit fields."""
+    v = np.ascontiguousarray(np.asarray(values).astype("<u2") & 0x7FF)
+    bits = np.unpackbits(v.view(np.uint8).reshape(len(v), CHANNELS, 2), axis=2, bitorder="little")
+    return np.packbits(bits[:, :, :CH_BITS].reshape(len(v), CHANNELS * CH_BITS), axis=1, bitorder="little")
+
+
+def unpack_channels_batch(payloads):
+    """(N, >=22) uint8 payloads -> (N, 16) int32 channel values: each field read from the 3 bytes it spans."""
+    p = np.zeros((len(payloads), RC_PAYLOAD_SIZE + 1), dtype=np.uint32)
+    p[:, :RC_PAYLOAD_SIZE] = np.asarray(payloads, dtype=np.uint8)[:, :RC_PAYLOAD_SIZE]
+    word = p[:, _FIELD_BYTE] | (p[:, _FIELD_BYTE + 1] << 8) | (p[:, _FIELD_BYTE + 2] << 16)
+    return ((word >> _FIELD_SHIFT) & 0x7FF).astype(np.int32)
+
+
+def encode_rc_frames(crsf_values, address=ADDRESS_RADIO_TRANSMITTER):
+    """(N, 16) CRSF values -> (N, 26) uint8 frames."""
+    payload = pack_channels_batch(crsf_values)
+    frames = np.empty((len(payload), RC_FRAME_SIZE), dtype=np.uint8)
+    frames[:, 0] = address
+    frames[:, 1] = RC_PAYLOAD_SIZE + 2
+    frames[:, 2] = FRAMETYPE_RC_CHANNELS_PACKED
+    frames[:, 3:-1] = payload
+    frames[:, -1] = crc8_batch(frames[:, 2:-1])
+    return frames
+
+
+def engine_rc_frames(logical_channels):
+    """(N, 16) engine channels -> the frames send_channels() would write for each row."""
+    return encode_rc_frames(to_crsf_batch(logical_channels))
+
+
+def decode_rc_frames(frames):
+    """
+    (N, 26) uint8 frames -> ((N, 16) channel values, (N,) bool valid).
+    valid checks address, length, type and crc; channels are unpacked for every row.
+    """
+    frames = np.asarray(frames, dtype=np.uint8)
+    valid = ((frames[:, 0] == ADDRESS_RADIO_TRANSMITTER) | (frames[:, 0] == SYNC_BYTE)) \
+        & (frames[:, 1] == RC_PAYLOAD_SIZE + 2) & (frames[:, 2] == FRAMETYPE_RC_CHANNELS_PACKED) \
+        & (crc8_batch(frames[:, 2:-1]) == frames[:, -1])
+    return unpack_channels_batch(frames[:, 3:-1]), valid
@@ -0,0 +1,225 @@
+# crsf_telemetry.py - latest CRSF link/flight telemetry per frame type (see cpp/crsf_telemetry_shm.h)
+import math
+import mmap
+import os
+import struct
+import time
+import crsf_codec as crsf
+
+SHM_PATH = "/dev/shm/crsf_telemetry"
+MAGIC = 0x54535243  # "CRST"
+VERSION = 1
+
+# Must match struct CrsfTelemetryBlock / CrsfTelemetrySlot in C++
+HEADER = struct.Struct("<IIIIIIQ")     # magic, version, seq, frames_ok, frames_rejected, reserved, timestamp_us
+SLOT = struct.Struct("<IBBHQ64s")      # count, type, len, reserved, timestamp_us, payload
+SLOTS = 10
+OFF_SEQ = 8
+BLOCK_SIZE = HEADER.size + SLOTS * SLOT.size   # 832
+SLOT_TYPES = (crsf.FRAMETYPE_LINK_STATISTICS, crsf.FRAMETYPE_BATTERY_SENSOR, crsf.FRAMETYPE_ATTITUDE,
+              crsf.FRAMETYPE_GPS, crsf.FRAMETYPE_VARIO, crsf.FRAMETYPE_FLIGHT_MODE, crsf.FRAMETYPE_AIRSPEED,
+              crsf.FRAMETYPE_ESC_TELEMETRY, crsf.FRAMETYPE_FUEL, crsf.FRAMETYPE_DEVICE_INFO)
+
+STALE_AFTER = 2.0        # seconds without a frame of a type before its values are shown as missing
+REOPEN_INTERVAL = 1.0
+
+
+class CrsfTelemetry:
+    """
+    Reads the segment the engine's CRSF receive thread publishes (~20 Hz at most).
+    poll() is a 4-byte sequence check when nothing changed; otherwise it copies
+    the block, and only slots whose frame count moved are decoded with
+    crsf_codec.decode_payload(). latest[type] holds the decoded TelemetryData
+    fields of the newest frame of each type, received[type] its monotonic time.
+    """
+
+    def __init__(self, path=SHM_PATH):
+        self.path = path
+        self.mm = None
+        self.last_seq = 0
+        self.next_open = 0.0
+        self.counts = {}
+        self.latest = {}
+        self.received = {}
+        self.stale = set()
+        self.frames_ok = 0
+        self.frames_rejected = 0
+        self.stats = {"polls": 0, "updates": 0, "decoded": 0, "torn": 0}
+
+    def open(self):
+        """Returns True once the segment exists and carries a valid header."""
+        if self.mm is not None:
+            return True
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            if os.fstat(fd).st_size < BLOCK_SIZE:
+                return False
+            self.mm = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ)
+        except (OSError, ValueError):
+            return False
+        finally:
+            os.close(fd)
+        magic, version = struct.unpack_from("<II", self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            return False
+        return True
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+    def poll(self, retries=4):
+        """
+        Picks up a new publish, if any. Returns True when some frame type got
+        fresh values or just went stale, i.e. when the UI has something to redraw.
+        """
+        self.stats["polls"] += 1
+        changed = self._read_segment(retries)
+        now = time.monotonic()
+        stale = {t for t, r in self.received.items() if now - r > STALE_AFTER}
+        if stale != self.stale:
+            self.stale = stale
+            changed = True
+        return changed
+
+    def _read_segment(self, retries):
+        if self.mm is None:
+            now = time.monotonic()
+            if now < self.next_open:
+                return False
+            self.next_open = now + REOPEN_INTERVAL
+            if not self.open():
+                return False
+
+        mm = self.mm
+        for _ in range(retries):
+            seq = struct.unpack_from("<I", mm, OFF_SEQ)[0]
+            if seq & 1:
+                continue
+            if seq == self.last_seq:
+                return False
+            snap = mm[:BLOCK_SIZE]
+            if struct.unpack_from("<I", mm, OFF_SEQ)[0] == seq:
+                break
+            self.stats["torn"] += 1
+        else:
+            return False
+        self.last_seq = seq
+        self.stats["updates"] += 1
+
+        _, _, _, self.frames_ok, self.frames_rejected, _, _ = HEADER.unpack_from(snap)
+        changed = False
+        for i in range(SLOTS):
+            count, frame_type, length, _, ts_us, payload = SLOT.unpack_from(snap, HEADER.size + i * SLOT.size)
+            if count == 0 or count == self.counts.get(frame_type):
+                continue
+            self.counts[frame_type] = count
+            fields = crsf.decode_payload(frame_type, payload[:length])
+            if fields is None:
+                continue
+            self.latest[frame_type] = fields
+            self.received[frame_type] = ts_us / 1e6
+            self.stats["decoded"] += 1
+            changed = True
+        return changed
+
+    def age(self, frame_type):
+        """Seconds since the newest frame of this type, or None if none arrived yet."""
+        t = self.received.get(frame_type)
+        return None if t is None else time.monotonic() - t
+
+    def get(self, frame_type, max_age=STALE_AFTER):
+        """Decoded fields of the newest frame of this type, or None if missing or stale."""
+        age = self.age(frame_type)
+        if age is None or age > max_age:
+            return None
+        return self.latest[frame_type]
+
+    # --- DISPLAY UNITS (as print_telemetry() in crsf_parser.h) ---
+    def link(self):
+        """{'lq': %, 'rssi': dBm, 'snr': dB, 'rf_mode', 'tx_power'} or None."""
+        d = self.get(crsf.FRAMETYPE_LINK_STATISTICS)
+        if d is None:
+            return None
+        # RSSI travels as an unsigned byte meaning -dBm (0..255), so -128 dBm and below don't wrap
+        return {"lq": d["uplink_link_quality"], "rssi": -d["uplink_rssi_1"], "snr": d["uplink_snr"],
+                "rf_mode": d["rf_mode"], "tx_power": d["uplink_tx_power"]}
+
+    def battery(self):
+        """{'voltage': V, 'current': A, 'used': mAh, 'remaining': %} or None."""
+        d = self.get(crsf.FRAMETYPE_BATTERY_SENSOR)
+        if d is None:
+            return None
+        return {"voltage": d["battery_voltage"] / 10.0, "current": d["battery_current"] / 10.0,
+                "used": d["battery_capacity_used"], "remaining": d["battery_remaining"]}
+
+    def attitude(self):
+        """{'pitch', 'roll', 'yaw'} in degrees (the frame carries radians * 10000), or None."""
+        d = self.get(crsf.FRAMETYPE_ATTITUDE)
+        if d is None:
+            return None
+        return {k: math.degrees(d[f"attitude_{k}"] / 10000.0) for k in ("pitch", "roll", "yaw")}
+
+    def gps(self):
+        """{'lat', 'lon': deg, 'speed': km/h, 'alt': m, 'sats'} or None."""
+        d = self.get(crsf.FRAMETYPE_GPS)
+        if d is None:
+            return None
+        return {"lat": d["gps_latitude"] / 1e7, "lon": d["gps_longitude"] / 1e7, "speed": d["gps_groundspeed"] / 10.0,
+                "alt": d["gps_altitude"] - 1000, "sats": d["gps_satellites"]}
+
+
+class CrsfTelemetryWriter:
+    """
+    Engine side of the segment, for stand-ins for the C++ engine (engine_sim.py).
+    record() fills a slot like CrsfTelemetryShm::record(); publish() copies
+    all slots under the seqlock like publish_if_due().
+    """
+
+    def __init__(self, path=SHM_PATH):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, BLOCK_SIZE)
+            self.mm = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        self.mm[:] = bytes(BLOCK_SIZE)
+        self.slots = [[0, t, b"", 0] for t in SLOT_TYPES]   # count, type, payload, timestamp_us
+        self.frames_ok = 0
+        self.seq = 0
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, 0, 0, 0, 0, 0)
+
+    def record(self, frame_type, payload, timestamp_us):
+        slot = self.slots[SLOT_TYPES.index(frame_type)]
+        slot[0] += 1
+        slot[2] = bytes(payload[:64])
+        slot[3] = timestamp_us
+        self.frames_ok += 1
+
+    def publish(self, timestamp_us):
+        s = self.seq
+        struct.pack_into("<I", self.mm, OFF_SEQ, (s + 1) & 0xFFFFFFFF)   # odd: write in progress
+        HEADER.pack_into(self.mm, 0, MAGIC, VERSION, (s + 1) & 0xFFFFFFFF, self.frames_ok, 0, 0, timestamp_us)
+        for i, (count, frame_type, payload, ts) in enumerate(self.slots):
+            SLOT.pack_into(self.mm, HEADER.size + i * SLOT.size, count, frame_type, len(payload), 0, ts, payload)
+        self.seq = (s + 2) & 0xFFFFFFFF
+        struct.pack_into("<I", self.mm, OFF_SEQ, self.seq)
+
+    def close(self, unlink=False):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+CRSF_TELEMETRY = CrsfTelemetry()
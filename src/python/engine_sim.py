@@ -0,0 +1,430 @@
+# engine_sim.py - hardware-free stand-in for the C++ engine: UDP config on 5005, telemetry shm, synthetic sticks + CRSF telemetry
+# Usage: python3 engine_sim.py [--scenario sweep|noise|step|idle] [--rate 50] [--tick-rate 1000]
+#                              [--disconnect-every S] [--duration S] [--status-file] [--port 5005] [--crsf-shm PATH]
+#
+# Runs the engine's tuning (tuning_math / response_lut) and mapping (mapping_plan) on generated
+# controller input and publishes it exactly like main.cpp, so main.py can be run and profiled on
+# any Linux box, at telemetry rates well above the engine's 50 Hz. Don't run it next to the real engine.
+import argparse
+import json
+import select
+import signal
+import socket
+import struct
+import time
+import zlib
+import numpy as np
+
+import crsf_codec as crsf
+from crsf_codec import to_crsf_batch
+from crsf_telemetry import SHM_PATH as CRSF_SHM_PATH, CrsfTelemetryWriter
+from config_sync import CFG_HEADER, CFG_BODY, CFG_REPLY, CFG_VERSION, CFG_FLAG_LUT, CFG_QUERY, NONE_ID
+from mapping_plan import MappingPlan
+from response_lut import LUT_HEADER, LUT_POINTS, lut_response
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+from telemetry_shm import SHM_PATH, TelemetryShmWriter
+from telemetry_watcher import STATUS_FILE
+from tuning_math import F32, AUX_DEADZONE, ENGINE_DT, TuningState, apply_deadzone, shape_input, finish_tuning_series
+
+MAPPER_PATH = "/home/pi4/rc-flight-controller/src/config/inputmapper.json"
+TUNING_PATH = "/home/pi4/rc-flight-controller/src/config/inputtuning.json"
+ENGINE_PORT = 5005
+SCENARIOS = ("sweep", "noise", "step", "idle")
+NUM_AXES = 6                 # axes 0-5 go through tuning, 6-20 are buttons, 21/22 stay -32768
+DISCONNECT_TIME = 2.0        # seconds the controller stays "unplugged" with --disconnect-every
+MAX_CATCHUP = 0.25           # after a stall, simulate at most this much engine time per publish
+STATS_INTERVAL = 5.0
+CRSF_INTERVAL = 0.05         # receive thread publish cap (CRSF_TELEMETRY_INTERVAL_MS)
+
+# ConfigStatus values from config_sync.h
+CFG_OK, CFG_BAD_SIZE, CFG_BAD_VERSION, CFG_BAD_HASH, CFG_BAD_LUT, CFG_BAD_VALUE = range(6)
+LUT_TABLE_SIZE = 4 * LUT_POINTS
+
+
+# --- SYNTHETIC CONTROLLER ---
+def scenario_signals(name, t, rng):
+    """
+    Raw controller signals (len(t), 23) as main.cpp reads them: int16 sticks,
+    0..32767 triggers, +-32767 buttons and -32768 for the unused ids 21/22.
+    """
+    n = len(t)
+    raw = np.full((n, NUM_SIGNALS), -32768, dtype=np.int32)
+    col = t[:, None]
+    if name == "sweep":
+        # Four stick axes at unrelated frequencies (Lissajous), triggers breathing, one button walking
+        sticks = np.sin(2 * np.pi * col * np.array([0.25, 0.31, 0.40, 0.53]))
+        raw[:, :4] = np.rint(sticks * 32767)
+        raw[:, 4:6] = np.rint((0.5 - 0.5 * np.cos(2 * np.pi * col * np.array([0.2, 0.27]))) * 32767)
+        pressed = (t * 2).astype(np.int64) % 15
+        raw[np.arange(n), 6 + pressed] = 32767
+    elif name == "noise":
+        # Slow drift plus per-tick sensor jitter: every published frame differs
+        drift = np.sin(2 * np.pi * col * np.array([0.05, 0.07, 0.11, 0.13])) * 8000
+        raw[:, :4] = np.clip(np.rint(drift + rng.normal(0.0, 800.0, (n, 4))), -32768, 32767)
+        raw[:, 4:6] = np.clip(np.rint(rng.normal(0.0, 400.0, (n, 2))), 0, 32767)
+        raw[:, 6:21] = np.where(rng.random((n, 15)) < 0.001, 32767, -32768)
+    elif name == "step":
+        # Full-scale steps once a second: shows the low-pass / cinematic response
+        level = np.array([0, 32767, 0, -32768])[(t.astype(np.int64)) % 4]
+        raw[:, :4] = level[:, None]
+        raw[:, 4:6] = np.where(level > 0, 32767, 0)[:, None]
+        raw[:, 6:21] = np.where(level != 0, 32767, -32768)[:, None]
+    else:
+        # Centred and motionless: nothing changes, so the UI should go idle
+        raw[:, :6] = 0
+    return raw
+
+
+# --- CONFIG PACKETS ---
+def parse_config_packet(data):
+    """
+    parse_config_packet() from config_sync.h.
+    Returns (status, seq, hash, body, lut_table); body/table are None unless status is CFG_OK.
+    """
+    if len(data) < CFG_HEADER.size:
+        return CFG_BAD_SIZE, 0, 0, None, None
+    _, version, flags, seq, cfg_hash = CFG_HEADER.unpack_from(data)
+    if version != CFG_VERSION:
+        return CFG_BAD_VERSION, seq, cfg_hash, None, None
+    lut_len = LUT_HEADER.size + LUT_TABLE_SIZE if flags & CFG_FLAG_LUT else 0
+    if len(data) != CFG_HEADER.size + CFG_BODY.size + lut_len:
+        return CFG_BAD_SIZE, seq, cfg_hash, None, None
+    if zlib.crc32(data[CFG_HEADER.size:]) != cfg_hash:
+        return CFG_BAD_HASH, seq, cfg_hash, None, None
+    body = CFG_BODY.unpack_from(data, CFG_HEADER.size)
+    table = None
+    if lut_len:
+        off = CFG_HEADER.size + CFG_BODY.size
+        magic, points, _, lut_crc = LUT_HEADER.unpack_from(data, off)
+        if magic != b"LUT1" or points != LUT_POINTS or zlib.crc32(data[off + LUT_HEADER.size:]) != lut_crc:
+            return CFG_BAD_LUT, seq, cfg_hash, None, None
+        table = np.frombuffer(data, dtype="<f4", count=LUT_POINTS, offset=off + LUT_HEADER.size).copy()
+    split_target, curve = body[16], body[27]
+    if curve > 3 or split_target < -1 or split_target > 15:
+        return CFG_BAD_VALUE, seq, cfg_hash, None, None
+    return CFG_OK, seq, cfg_hash, body, table
+
+
+def split_from_flags(target, pos, neg, flags):
+    return {"target_ch": target, "pos_id": pos, "neg_id": neg,
+            "pos_center": bool(flags & 1), "pos_reverse": bool(flags & 2),
+            "neg_center": bool(flags & 4), "neg_reverse": bool(flags & 8)}
+
+
+class EngineSim:
+    """
+    The engine's live state (mapper, tuning atomics, response table, applied
+    config hash) plus its tick loop. Packets are handled between tick blocks:
+    each publish runs every 1 kHz tick since the previous one at once
+    (shape_input is vectorized over the block), then maps and publishes the
+    last tick, like main.cpp's 50 Hz publish of its 1 kHz loop.
+    """
+
+    def __init__(self, scenario="sweep", tick_rate=1000.0, disconnect_every=0.0, seed=0):
+        self.scenario = scenario
+        self.tick_rate = tick_rate
+        self.disconnect_every = disconnect_every
+        self.rng = np.random.default_rng(seed)
+
+        # InputMapper defaults: every channel on NONE, no split
+        self.channel_map = [NONE_ID] * NUM_CH
+        self.split = split_from_flags(-1, NONE_ID, NONE_ID, 0)
+        self.plan = MappingPlan(self.channel_map, self.split)
+        # main.cpp's atomics, in engine units (deadzones already / 10)
+        self.tuning = {"l_dz": F32(0.05), "r_dz": F32(0.05), "sens": F32(1.0), "expo": F32(0.0), "curve": 0,
+                       "smooth": F32(0.2), "cine_on": False, "cine_spd": F32(8.0), "cine_acc": F32(3.5)}
+        self.lut = None
+        self.config_hash = 0
+
+        self.state = TuningState(NUM_AXES)
+        self.tick = 0
+        self.tuned = np.full(NUM_SIGNALS, -32768, dtype=np.int32)
+        self.raw = np.full(NUM_SIGNALS, -32768, dtype=np.int32)
+        self.connected = False
+        self.tick_ms = 0.0
+        self.stats = {"ticks": 0, "publishes": 0, "skipped_ticks": 0, "overruns": 0, "block_ms": 0.0,
+                      "cfg_ok": 0, "cfg_rejected": 0, "queries": 0, "text": 0}
+
+    # --- STARTUP CONFIG (load_system_config) ---
+    def load_files(self, mapper_path=MAPPER_PATH, tuning_path=TUNING_PATH):
+        try:
+            with open(tuning_path) as f:
+                t = json.load(f).get("tuning")
+            if t is not None:
+                ten = F32(10.0)
+                self.tuning.update(
+                    l_dz=F32(t.get("left_deadzone", 0.5)) / ten, r_dz=F32(t.get("right_deadzone", 0.5)) / ten,
+                    sens=F32(t.get("global_rate", 1.0)), expo=F32(t.get("expo", 0.0)),
+                    curve=int(t.get("curve_type", 0)), smooth=F32(t.get("smoothing", 0.2)),
+                    cine_on=bool(t.get("cine_on", False)), cine_spd=F32(t.get("cine_speed", 8.0)),
+                    cine_acc=F32(t.get("cine_accel", 3.5)))
+                print(f"Config Loaded. DZs: {self.tuning['l_dz']} / {self.tuning['r_dz']}")
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            with open(mapper_path) as f:
+                d = json.load(f)
+            maps = d.get("channel_map", [])
+            for i in range(min(len(maps), NUM_CH)):
+                self.channel_map[i] = int(maps[i])
+            s = d.get("split_config", {})
+            target = int(s.get("target_ch", -1))
+            if 0 <= target < NUM_CH:
+                self.split = {"target_ch": target, "pos_id": int(s.get("pos_id", NONE_ID)),
+                              "neg_id": int(s.get("neg_id", NONE_ID))}
+                for k in ("pos_center", "pos_reverse", "neg_center", "neg_reverse"):
+                    self.split[k] = bool(s.get(k, False))
+        except OSError:
+            print(f"[MAPPER] Failed to open: {mapper_path}")
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"[MAPPER] JSON Parse Error: {e}")
+        self.plan = MappingPlan(self.channel_map, self.split)
+
+    # --- UDP (socket_listener) ---
+    def handle_packet(self, data):
+        """Returns the reply to send back, or None."""
+        if data[:4] == b"CFG1":
+            status, seq, cfg_hash, body, table = parse_config_packet(data)
+            if status == CFG_OK:
+                self.apply_config(body, table, cfg_hash)
+                self.stats["cfg_ok"] += 1
+            else:
+                self.stats["cfg_rejected"] += 1
+            return CFG_REPLY.pack(b"CACK" if status == CFG_OK else b"CNAK", seq, cfg_hash, status)
+        if len(data) == 8 and data[:4] == CFG_QUERY:
+            self.stats["queries"] += 1
+            seq = struct.unpack_from("<I", data, 4)[0]
+            return CFG_REPLY.pack(b"CACK", seq, self.config_hash, CFG_OK)
+        # Text keys are live edits; the applied config no longer matches any hash
+        self.config_hash = 0
+        self.stats["text"] += 1
+        msg = data.decode("ascii", "replace")
+        t = self.tuning
+        try:
+            if msg.startswith("SET_MAP|"):
+                sections = msg.split("|")
+                if len(sections) >= 3:
+                    self.set_from_packet(sections[1].split(","), sections[2].split(","))
+            elif msg.startswith("L_DZ:"):
+                t["l_dz"] = F32(msg[5:])
+            elif msg.startswith("R_DZ:"):
+                t["r_dz"] = F32(msg[5:])
+            # Curve params invalidate the LUT until the next CFG1 push brings a fresh one
+            elif msg.startswith("RATE:"):
+                t["sens"], self.lut = F32(msg[5:]), None
+            elif msg.startswith("EXPO:"):
+                t["expo"], self.lut = F32(msg[5:]), None
+            elif msg.startswith("CURVE:"):
+                t["curve"], self.lut = int(msg[6:]), None
+            elif msg.startswith("SMOOTH:"):
+                t["smooth"] = F32(msg[7:])
+            elif msg.startswith("CINE_ON:"):
+                t["cine_on"] = int(msg[8:]) == 1
+            elif msg.startswith("CINE_SPD:"):
+                t["cine_spd"] = F32(msg[9:])
+            elif msg.startswith("CINE_ACC:"):
+                t["cine_acc"] = F32(msg[9:])
+        except ValueError:
+            pass
+        return None
+
+    def set_from_packet(self, map_vals, split_vals):
+        """InputMapper::set_from_packet()."""
+        for i, v in enumerate(map_vals[:NUM_CH]):
+            self.channel_map[i] = int(v)
+            if self.split["target_ch"] == i:
+                self.split = split_from_flags(-1, NONE_ID, NONE_ID, 0)
+        if len(split_vals) >= 7:
+            target = int(split_vals[0])
+            if 0 <= target < NUM_CH:
+                flags = sum(1 << b for b, v in enumerate(split_vals[3:7]) if int(v) == 1)
+                self.split = split_from_flags(target, int(split_vals[1]), int(split_vals[2]), flags)
+        self.plan = MappingPlan(self.channel_map, self.split)
+
+    def apply_config(self, body, table, cfg_hash):
+        """main.cpp apply_config(): the whole mapper + tuning state from one CFG1 body."""
+        maps = list(body[:NUM_CH])
+        target, pos, neg, flags, l_dz, r_dz, sens, expo, smooth, cine_spd, cine_acc, curve, cine_on, _ = body[NUM_CH:]
+        self.channel_map = maps
+        self.split = split_from_flags(target, pos, neg, flags)
+        self.plan = MappingPlan(self.channel_map, self.split)
+        self.tuning.update(l_dz=F32(l_dz), r_dz=F32(r_dz), sens=F32(sens), expo=F32(expo), curve=int(curve),
+                           smooth=F32(smooth), cine_on=cine_on != 0, cine_spd=F32(cine_spd), cine_acc=F32(cine_acc))
+        self.lut = table
+        self.config_hash = cfg_hash
+
+    # --- TICKS ---
+    def is_connected(self, t):
+        if self.disconnect_every <= 0:
+            return True
+        return t % self.disconnect_every < self.disconnect_every - DISCONNECT_TIME
+
+    def run_ticks(self, n):
+        """Advances the engine by n ticks; self.raw/self.tuned hold the last one."""
+        t0 = time.perf_counter()
+        t = (self.tick + np.arange(n)) / self.tick_rate
+        self.tick += n
+        self.stats["ticks"] += n
+        self.connected = self.is_connected(t[-1])
+        if not self.connected:
+            self.raw[:] = -32768
+            self.tuned[:] = -32768
+        else:
+            raw = scenario_signals(self.scenario, t, self.rng)
+            tu = self.tuning
+            dz = np.array([tu["l_dz"], tu["l_dz"], tu["r_dz"], tu["r_dz"], AUX_DEADZONE, AUX_DEADZONE], dtype=F32)
+            axes = raw[:, :NUM_AXES]
+            if self.lut is not None:
+                shaped = lut_response(self.lut, apply_deadzone(axes, dz))
+            else:
+                shaped = shape_input(axes, dz, tu["sens"], tu["curve"], tu["expo"])
+            out, self.state = finish_tuning_series(shaped, tu["smooth"], tu["cine_on"], tu["cine_spd"], tu["cine_acc"],
+                                                   ENGINE_DT, self.state)
+            self.raw[:] = raw[-1]
+            self.tuned[:] = raw[-1]
+            self.tuned[:NUM_AXES] = out[-1]
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.tick_ms = ms / n
+        self.stats["block_ms"] += ms
+
+    def crsf_channels(self):
+        """Mapped (and, for now, unmixed) channels in CRSF units, computed like main.cpp's publish."""
+        return to_crsf_batch(self.plan.apply(self.tuned))
+
+
+def publish_crsf(writer, sim, t):
+    """
+    Receiver telemetry a quad on the bench might send: link stats, a slowly
+    draining 4S pack and an attitude that follows the roll/pitch sticks.
+    """
+    ts = time.monotonic_ns() // 1000
+    lq = 100 - int(20 * (1 + np.sin(t * 0.3)) / 2)
+    writer.record(crsf.FRAMETYPE_LINK_STATISTICS, crsf.encode_payload(crsf.FRAMETYPE_LINK_STATISTICS, {
+        "uplink_rssi_1": 50 + (100 - lq), "uplink_rssi_2": 55 + (100 - lq), "uplink_link_quality": lq,
+        "uplink_snr": 9, "rf_mode": 4, "uplink_tx_power": 3, "downlink_link_quality": 100}), ts)
+    used = int(t * 2.5)
+    writer.record(crsf.FRAMETYPE_BATTERY_SENSOR, crsf.encode_payload(crsf.FRAMETYPE_BATTERY_SENSOR, {
+        "battery_voltage": max(140, 168 - used // 60), "battery_current": 85 + int(40 * abs(sim.tuned[1]) / 32768),
+        "battery_capacity_used": used, "battery_remaining": max(0, 100 - used // 15)}), ts)
+    rad = 0.7854 * 10000 / 32768   # full stick = 45 deg, in the frame's radians * 10000
+    writer.record(crsf.FRAMETYPE_ATTITUDE, crsf.encode_payload(crsf.FRAMETYPE_ATTITUDE, {
+        "attitude_roll": int(sim.tuned[0] * rad), "attitude_pitch": int(sim.tuned[1] * rad),
+        "attitude_yaw": int((t * 0.2 % 6.2832 - 3.1416) * 10000)}), ts)
+    writer.publish(ts)
+
+
+def write_status_file(path, sim, ch):
+    """The --status-file text mirror, byte-for-byte in main.cpp's format."""
+    parts = [f"latency_ms:{sim.tick_ms:.2f} rate_hz:{sim.tick_rate:.1f} connected:{int(sim.connected)}"]
+    parts += [f"ch{i + 1}:{v}" for i, v in enumerate(ch.tolist())]
+    parts += [f"tunedid{i}:{v}" for i, v in enumerate(sim.tuned.tolist())]
+    parts += [f"rawid{i}:{v}" for i, v in enumerate(sim.raw.tolist())]
+    with open(path, "w") as f:
+        f.write(" ".join(parts) + "\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stand-in for the C++ engine (no controller or CRSF module needed)")
+    ap.add_argument("--scenario", choices=SCENARIOS, default="sweep")
+    ap.add_argument("--rate", type=float, default=50.0, help="telemetry publishes per second (engine: 50)")
+    ap.add_argument("--tick-rate", type=float, default=1000.0, help="simulated engine ticks per second")
+    ap.add_argument("--disconnect-every", type=float, default=0.0,
+                    help=f"unplug the controller for {DISCONNECT_TIME:.0f} s out of every S seconds")
+    ap.add_argument("--duration", type=float, default=0.0, help="stop after S seconds (0 = run until Ctrl-C)")
+    ap.add_argument("--port", type=int, default=ENGINE_PORT)
+    ap.add_argument("--shm", default=SHM_PATH)
+    ap.add_argument("--crsf-shm", default=CRSF_SHM_PATH, help="CRSF telemetry segment (empty = don't publish)")
+    ap.add_argument("--status-file", action="store_true", help=f"also write {STATUS_FILE} like main.cpp --status-file")
+    ap.add_argument("--no-config-files", action="store_true", help="start from engine defaults, ignore the JSON settings")
+    args = ap.parse_args()
+
+    tick_rate = max(args.tick_rate, args.rate)   # every publish needs at least one tick behind it
+    sim = EngineSim(args.scenario, tick_rate, args.disconnect_every)
+    if not args.no_config_files:
+        sim.load_files()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.bind(("0.0.0.0", args.port))
+    except OSError as e:
+        print(f"Engine Sim: cannot bind UDP {args.port} ({e}) - is the real engine running?")
+        return 1
+    sock.setblocking(False)
+    shm = TelemetryShmWriter(args.shm)
+    crsf_shm = CrsfTelemetryWriter(args.crsf_shm) if args.crsf_shm else None
+
+    running = True
+
+    def stop(*_):
+        nonlocal running
+        running = False
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"Engine Sim started: scenario={args.scenario} publish={args.rate:g} Hz tick={tick_rate:g} Hz port={args.port}")
+    period = 1.0 / args.rate
+    max_catchup = max(1, int(MAX_CATCHUP * tick_rate))
+    t_start = time.monotonic()
+    next_pub = t_start
+    next_stats = t_start + STATS_INTERVAL
+    next_crsf = t_start
+    last = dict(sim.stats)
+
+    while running:
+        readable, _, _ = select.select([sock], [], [], max(0.0, next_pub - time.monotonic()))
+        if readable:
+            while True:
+                try:
+                    data, addr = sock.recvfrom(16384)
+                except BlockingIOError:
+                    break
+                reply = sim.handle_packet(data)
+                if reply is not None:
+                    sock.sendto(reply, addr)
+
+        now = time.monotonic()
+        if now < next_pub:
+            continue
+        if args.duration and now - t_start >= args.duration:
+            break
+
+        n = int((now - t_start) * tick_rate) - sim.tick
+        if n > max_catchup:
+            sim.stats["skipped_ticks"] += n - max_catchup
+            sim.tick += n - max_catchup
+            n = max_catchup
+        if n > 0:
+            sim.run_ticks(n)
+            ch = sim.crsf_channels()
+            shm.publish(time.monotonic_ns() // 1000, sim.tick_ms, tick_rate, sim.connected, ch, sim.tuned, sim.raw)
+            if args.status_file:
+                write_status_file(STATUS_FILE, sim, ch)
+            sim.stats["publishes"] += 1
+        if crsf_shm is not None and now >= next_crsf:
+            publish_crsf(crsf_shm, sim, now - t_start)
+            next_crsf = now + CRSF_INTERVAL
+
+        next_pub += period
+        if next_pub < now:
+            sim.stats["overruns"] += 1
+            next_pub = now + period
+
+        if now >= next_stats:
+            d = {k: sim.stats[k] - last[k] for k in sim.stats}
+            ms_per_tick = d["block_ms"] / d["ticks"] if d["ticks"] else 0.0
+            print(f"Engine Sim: {d['publishes'] / STATS_INTERVAL:6.1f} pub/s  {d['ticks'] / STATS_INTERVAL:7.1f} ticks/s  "
+                  f"{ms_per_tick * 1000:6.1f} us/tick  overruns {d['overruns']}  skipped {d['skipped_ticks']}  "
+                  f"cfg {d['cfg_ok']} ok / {d['cfg_rejected']} rejected  text {d['text']}")
+            last = dict(sim.stats)
+            next_stats = now + STATS_INTERVAL
+
+    print(f"Engine Sim stopped: {sim.stats}")
+    shm.close()
+    if crsf_shm is not None:
+        crsf_shm.close()
+    sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
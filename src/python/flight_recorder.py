@@ -0,0 +1,228 @@
+# flight_recorder.py - append-only binary flight data recorder + memory-mapped log reader
+import os
+import queue
+import threading
+import time
+import numpy as np
+from config import FLIGHT_LOG_DIR, FLIGHT_LOG_MAX_FILES, FLIGHT_LOG_MAX_BYTES
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+
+LOG_DIR = FLIGHT_LOG_DIR
+LOG_EXT = ".rcl"
+MAGIC = b"RCFLOG1"  # stored NUL-padded to 8 bytes
+HEADER_SIZE = 64
+
+# One fixed-size record per engine publish (144 bytes)
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),            # seconds since recording start
+    ("latency_ms", "<f4"),
+    ("rate_hz", "<f4"),
+    ("connected", "<i4"),
+    ("ch", "<i2", NUM_CH),
+    ("tuned", "<i2", NUM_SIGNALS),
+    ("raw", "<i2", NUM_SIGNALS),
+])
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("record_size", "<u4"),
+    ("start_wall", "<f8"),
+    ("reserved", "u1", HEADER_SIZE - 24),
+])
+
+CHUNK_RECORDS = 50      # ~1 s of telemetry per write()
+CHUNK_POOL = 4          # chunks that may be in flight before records are dropped
+FSYNC_INTERVAL = 2.0
+
+
+class FlightRecorder:
+    """
+    record() only copies one frame into a preallocated chunk, so it never blocks.
+    Full chunks are handed to a writer thread which appends them and fsyncs
+    every FSYNC_INTERVAL seconds. If the disk falls behind, records are dropped
+    (and counted) instead of stalling the render loop.
+    """
+
+    def __init__(self, log_dir=LOG_DIR, max_files=FLIGHT_LOG_MAX_FILES, max_bytes=FLIGHT_LOG_MAX_BYTES):
+        self.log_dir = log_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.path = None
+        self.active = False
+        self.stats = {"records": 0, "dropped": 0, "chunks": 0, "fsyncs": 0, "bytes": 0, "pruned": 0}
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        self._chunk = None
+        self._fill = 0
+        self._t0 = 0.0
+        self._thread = None
+
+    def start(self):
+        if self.active:
+            return self.path
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Recorder Error: {e}")
+            return None
+        self.prune()
+        wall = time.time()
+        fd, path = self._create(time.strftime("flight_%Y%m%d_%H%M%S", time.localtime(wall)))
+        if fd is None:
+            return None
+        self.path = path
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header["magic"], header["version"] = MAGIC, 1
+        header["record_size"], header["start_wall"] = RECORD_DTYPE.itemsize, wall
+
+        # Fresh queues per session; a writer left over from a stop() that timed out keeps its own
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        for _ in range(CHUNK_POOL):
+            self._free.put(np.zeros(CHUNK_RECORDS, dtype=RECORD_DTYPE))
+        self._chunk, self._fill = self._free.get(), 0
+        self._t0 = time.monotonic()
+        self.active = True
+        self._thread = threading.Thread(target=self._writer, args=(fd, header.tobytes(), self._full, self._free), daemon=True)
+        self._thread.start()
+        return self.path
+
+    def _create(self, stem):
+        """
+        Opens a new log exclusively: a restart within the same second gets a
+        _1, _2, ... suffix instead of appending a second header to the last log.
+        Returns (fd, path), or (None, None) on error.
+        """
+        for n in range(100):
+            path = os.path.join(self.log_dir, stem + (f"_{n}" if n else "") + LOG_EXT)
+            try:
+                return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644), path
+            except FileExistsError:
+                continue
+            except OSError as e:
+                print(f"Recorder Error: {e}")
+                return None, None
+        print(f"Recorder Error: no free log name for {stem}")
+        return None, None
+
+    def prune(self):
+        """
+        Retention: deletes the oldest logs until, with the log about to be
+        started, at most max_files remain and the old ones total <= max_bytes.
+        """
+        kept, total, full = 0, 0, False
+        for path in list_logs(self.log_dir):    # newest first
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            full = full or kept + 1 >= self.max_files or total + size > self.max_bytes
+            if not full:
+                kept += 1
+                total += size
+                continue
+            try:
+                os.remove(path)
+                self.stats["pruned"] += 1
+            except OSError as e:
+                print(f"Recorder Error: {e}")
+
+    def record(self, frame):
+        """Copies one TelemetryFrame into the current chunk (no I/O)."""
+        if not self.active:
+            return
+        if self._chunk is None:
+            try:
+                self._chunk, self._fill = self._free.get_nowait(), 0
+            except queue.Empty:
+                self.stats["dropped"] += 1
+                return
+        rec = self._chunk[self._fill]
+        rec["t"] = time.monotonic() - self._t0
+        rec["latency_ms"], rec["rate_hz"], rec["connected"] = frame.meta[0], frame.meta[1], frame.meta[2]
+        rec["ch"], rec["tuned"], rec["raw"] = frame.ch, frame.tuned, frame.raw
+        self._fill += 1
+        self.stats["records"] += 1
+        if self._fill == CHUNK_RECORDS:
+            self._full.put((self._chunk, self._fill))
+            self._chunk = None
+
+    def stop(self):
+        """Flushes the partial chunk and waits for the writer to close the file."""
+        if not self.active:
+            return
+        self.active = False
+        if self._chunk is not None and self._fill:
+            self._full.put((self._chunk, self._fill))
+        self._chunk = None
+        self._full.put(None)
+        self._thread.join(timeout=5.0)
+
+    def _writer(self, fd, header_bytes, full, free):
+        try:
+            os.write(fd, header_bytes)
+            last_sync = time.monotonic()
+            while True:
+                try:
+                    item = full.get(timeout=FSYNC_INTERVAL)
+                except queue.Empty:
+                    item = False
+                if item:
+                    chunk, n = item
+                    data = chunk[:n].tobytes()
+                    os.write(fd, data)
+                    self.stats["chunks"] += 1
+                    self.stats["bytes"] += len(data)
+                    free.put(chunk)
+                if item is None or time.monotonic() - last_sync >= FSYNC_INTERVAL:
+                    os.fsync(fd)
+                    self.stats["fsyncs"] += 1
+                    last_sync = time.monotonic()
+                if item is None:
+                    break
+        except OSError as e:
+            print(f"Recorder Error: {e}")
+            if full is self._full:
+                self.active = False
+        finally:
+            os.close(fd)
+
+
+class FlightLog:
+    """Read-only, memory-mapped view of a recorded log; a trailing partial record is ignored."""
+
+    def __init__(self, path):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC or header["record_size"][0] != RECORD_DTYPE.itemsize:
+            raise ValueError(f"Not a flight log: {path}")
+        self.start_wall = float(header["start_wall"][0])
+        n = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if n > 0:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def duration(self):
+        return float(self.records["t"][-1]) if len(self.records) else 0.0
+
+    def index_at(self, t):
+        """Record index at (or just before) time t seconds into the log."""
+        return max(0, int(np.searchsorted(self.records["t"], t, side="right")) - 1)
+
+
+def list_logs(log_dir=LOG_DIR):
+    """Newest-first list of log file paths."""
+    try:
+        names = [n for n in os.listdir(log_dir) if n.endswith(LOG_EXT)]
+    except OSError:
+        return []
+    return [os.path.join(log_dir, n) for n in sorted(names, reverse=True)]
+
+
+# Shared instance fed by main.py, controlled from logs_panel
+FLIGHT_RECORDER = FlightRecorder()
@@ -0,0 +1,61 @@
+# font_cache.py - process-wide font registry + LRU cache of rendered text surfaces
+from collections import OrderedDict
+import pygame
+
+FONT_FACE = "monospace"
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+
+_fonts = {}
+
+
+def get_font(size, bold=False, face=FONT_FACE):
+    """Resolves (face, size, bold) through SysFont once; later calls are a dict lookup."""
+    key = (face, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """
+    Rendered (antialiased) text surfaces keyed by (font, text, color), evicted
+    least-recently-used once their pixel memory exceeds max_bytes.
+    Returned surfaces are shared: blit them, never draw on them.
+    """
+
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._surfs = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self._surfs.move_to_end(key)
+            self.stats["hits"] += 1
+            return surf
+        self.stats["misses"] += 1
+        surf = font.render(text, True, color)
+        self._surfs[key] = surf
+        self.bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        while self.bytes > self.max_bytes and len(self._surfs) > 1:
+            _, old = self._surfs.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+            self.stats["evictions"] += 1
+        return surf
+
+    def clear(self):
+        self._surfs.clear()
+        self.bytes = 0
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color):
+    """Cached font.render(text, True, color)."""
+    return TEXT_CACHE.render(font, text, color)
@@ -0,0 +1,116 @@
+# frame_profiler.py - per-stage timers for the main loop (rolling percentiles, overlay, CSV dump)
+import time
+import numpy as np
+from config import PROFILER_ENABLED, MAX_FPS
+
+PROFILE_FRAMES = 600           # rolling window (10 s at 60 fps)
+SUMMARY_INTERVAL = 0.5         # seconds between percentile refreshes for the overlay
+
+perf_counter_ns = time.perf_counter_ns
+
+
+def _noop(*_):
+    pass
+
+
+class FrameProfiler:
+    """
+    mark(stage) charges the time since the previous mark (or begin()) to
+    `stage`; end() files the frame into a ring of the last PROFILE_FRAMES
+    rendered frames (ticks the frame scheduler skips never reach end()).
+    While disabled, begin/mark/end are bound to a no-op, so the loop pays
+    one empty call per stage and nothing is stored.
+    Percentiles are only computed by summary(), at most every SUMMARY_INTERVAL.
+    """
+
+    def __init__(self, stages, frames=PROFILE_FRAMES, enabled=PROFILER_ENABLED):
+        self.stages = tuple(stages)
+        self._index = {name: i for i, name in enumerate(self.stages)}
+        self.ring = np.zeros((frames, len(self.stages)), dtype=np.int64)
+        self.count = 0
+        self._row = [0] * len(self.stages)
+        self._last = 0
+        self._summary = None
+        self._summary_t = 0.0
+        self.frame_cost_ns = self._calibrate()
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.begin, self.mark, self.end = self._begin, self._mark, self._end
+            self._begin()   # may be switched on mid-frame
+        else:
+            self.begin = self.mark = self.end = _noop
+
+    def _begin(self):
+        row = self._row
+        for i in range(len(row)):
+            row[i] = 0
+        self._last = perf_counter_ns()
+
+    def _mark(self, stage):
+        now = perf_counter_ns()
+        self._row[self._index[stage]] += now - self._last
+        self._last = now
+
+    def _end(self):
+        self.ring[self.count % len(self.ring)] = self._row
+        self.count += 1
+
+    def window(self):
+        """Per-frame stage times (ns) for the frames in the ring, oldest first."""
+        n = min(self.count, len(self.ring))
+        if self.count <= len(self.ring):
+            return self.ring[:n]
+        start = self.count % len(self.ring)
+        return np.concatenate((self.ring[start:], self.ring[:start]))
+
+    def summary(self, force=False):
+        """
+        {stage: (p50, p95, p99) in ms} plus "frame" for the per-frame total,
+        refreshed at most every SUMMARY_INTERVAL (returns the cached one otherwise).
+        """
+        now = time.monotonic()
+        if not force and self._summary is not None and now - self._summary_t < SUMMARY_INTERVAL:
+            return self._summary
+        self._summary_t = now
+        win = self.window()
+        if len(win) == 0:
+            self._summary = {}
+            return self._summary
+        totals = win.sum(axis=1)
+        pct = np.percentile(np.column_stack((win, totals)), (50, 95, 99), axis=0) / 1e6
+        self._summary = {name: tuple(pct[:, i]) for i, name in enumerate(self.stages + ("frame",))}
+        return self._summary
+
+    def overhead(self):
+        """(µs per frame, % of the MAX_FPS budget) the profiler itself costs while enabled."""
+        us = self.frame_cost_ns / 1000.0
+        return us, us / (10000.0 / MAX_FPS)
+
+    def dump(self, path):
+        """Writes the window as CSV (one row per frame, µs per stage)."""
+        win = self.window()
+        header = ",".join(self.stages + ("frame",))
+        data = np.column_stack((win, win.sum(axis=1))) / 1000.0
+        np.savetxt(path, data, fmt="%.1f", delimiter=",", header=header, comments="")
+        return len(win)
+
+    def _calibrate(self, n=500):
+        """Cost of one profiled frame (begin, a mark per stage, end) on this machine."""
+        t0 = perf_counter_ns()
+        for _ in range(n):
+            self._begin()
+            for stage in self.stages:
+                self._mark(stage)
+            self._end()
+        cost = (perf_counter_ns() - t0) // n
+        self.ring[:] = 0
+        self.count = 0
+        return cost
+
+
+# Stages of main.py's loop, in order
+MAIN_STAGES = ("touch", "telemetry", "events", "sync", "preview", "widgets", "panel", "present")
+PROFILER = FrameProfiler(MAIN_STAGES)
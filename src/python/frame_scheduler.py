@@ -0,0 +1,94 @@
+# frame_scheduler.py - renders only when something on screen can have changed
+import time
+import numpy as np
+from config import MAX_FPS, IDLE_FPS
+
+RENDER_COST_ALPHA = 0.05   # EMA weight for the measured cost of one rendered frame
+
+
+class FrameScheduler:
+    """
+    main.py still wakes at max_fps to drain the touch pipe, poll telemetry and
+    pump events (all cheap), but only runs the render pass when request() was
+    called for this tick: displayed telemetry changed, touch went down/up/moved,
+    a finger is held, an animation (sidebar slide, a panel's spinner) is running
+    or a key was hit.
+    Otherwise a frame is forced every 1/min_fps so clocks and latency readouts
+    keep ticking. stats["saved_ms"] estimates CPU not spent, from the average
+    cost of the frames that were rendered.
+    """
+
+    def __init__(self, max_fps=MAX_FPS, min_fps=IDLE_FPS):
+        self.max_fps = max_fps
+        self.min_fps = min_fps
+        self.reasons = set()
+        self.last_render = 0.0
+        self.next_tick = time.perf_counter()
+        self.render_start = 0.0
+        self.last_touch = None
+        self.last_shown = None
+        self.stats = {"ticks": 0, "rendered": 0, "skipped": 0, "idle": 0,
+                      "render_ms": 0.0, "saved_ms": 0.0, "sleep_ms": 0.0}
+
+    def request(self, reason):
+        """Asks for a render this tick; reason is only used for stats ("touch", "anim", ...)."""
+        self.reasons.add(reason)
+
+    def touch_changed(self, down, x, y):
+        """Requests a frame when the touch state differs from last tick or a finger is held."""
+        state = (down, x, y)
+        if down or state != self.last_touch:
+            self.request("touch")
+        self.last_touch = state
+
+    def telemetry_changed(self, frame):
+        """
+        Requests a frame when anything the main screen draws from telemetry changed.
+        Loop latency jitters on every publish, so it alone doesn't count; it is
+        refreshed by the idle frames.
+        """
+        shown = self.last_shown
+        if (shown is None or frame.connected != shown[3] or not np.array_equal(frame.ch, shown[2])
+                or not np.array_equal(frame.tuned, shown[1]) or not np.array_equal(frame.raw, shown[0])):
+            self.last_shown = (frame.raw.copy(), frame.tuned.copy(), frame.ch.copy(), frame.connected)
+            self.request("telemetry")
+
+    def should_render(self, now=None):
+        now = time.perf_counter() if now is None else now
+        self.stats["ticks"] += 1
+        if not self.reasons and now - self.last_render < 1.0 / self.min_fps:
+            self.stats["skipped"] += 1
+            self.stats["saved_ms"] += self.stats["render_ms"]
+            return False
+        if not self.reasons:
+            self.stats["idle"] += 1
+        for reason in self.reasons:
+            self.stats[reason] = self.stats.get(reason, 0) + 1
+        self.reasons.clear()
+        self.last_render = now
+        self.render_start = now
+        return True
+
+    def rendered(self):
+        """Call after present(); feeds the per-frame cost estimate."""
+        ms = (time.perf_counter() - self.render_start) * 1000.0
+        self.stats["rendered"] += 1
+        if self.stats["rendered"] == 1:
+            self.stats["render_ms"] = ms
+        else:
+            self.stats["render_ms"] += RENDER_COST_ALPHA * (ms - self.stats["render_ms"])
+
+    def sleep(self):
+        """Waits for the next max_fps tick (replaces clock.tick); never bursts to catch up."""
+        self.next_tick += 1.0 / self.max_fps
+        now = time.perf_counter()
+        delay = self.next_tick - now
+        if delay > 0:
+            time.sleep(delay)
+            self.stats["sleep_ms"] += delay * 1000.0
+        else:
+            self.next_tick = now
+
+
+# Shared instance driven by main.py
+FRAME_SCHEDULER = FrameScheduler()
@@ -2,14 +2,16 @@ import pygame
 import time
 import json
 import os
-import socket
 from config import *
+import numpy as np
 from ui_helpers import draw_numeric_stepper
+from response_lut import lut_for_state, lut_static_response
+from change_scheduler import CHANGE_SCHEDULER
+from settings_writer import SETTINGS_WRITER
+from font_cache import get_font, render_text
 
 # --- CONFIG & PERSISTENCE ---
 TUNING_FILE = "/home/pi4/rc-flight-controller/src/config/inputtuning.json"
-UDP_IP, UDP_PORT = "127.0.0.1", 5005
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
 # Shared raw input array (updated by main loop)
 RAW_INPUTS = [0.0] * 23 
@@ -43,23 +45,9 @@ prev_states = {
 }
 last_release = {k: 0.0 for k in prev_states.keys()}
 
-def stream_to_cpp(key, value):
-    """Sends tuning updates to the C++ Flight Core via UDP."""
-    try:
-        val = int(value) if isinstance(value, bool) else value
-        message = f"{key}:{val}"
-        sock.sendto(message.encode(), (UDP_IP, UDP_PORT))
-    except Exception:
-        pass 
-
 def save_settings():
-    """Saves current tuning state to JSON."""
-    try:
-        os.makedirs(os.path.dirname(TUNING_FILE), exist_ok=True)
-        with open(TUNING_FILE, 'w') as f:
-            json.dump({"tuning": TUNING_STATE}, f, indent=4)
-    except Exception:
-        pass
+    """Queues a snapshot of the tuning state for the background writer."""
+    SETTINGS_WRITER.submit(TUNING_FILE, {"tuning": TUNING_STATE})
 
 def load_settings():
     """Loads tuning state from JSON on startup."""
@@ -75,7 +63,7 @@ load_settings()
 
 def draw_input_tuning_panel(screen, rect, touch_down, touch_x, touch_y, raw_signals=None, tuned_signals=None):
     global RAW_INPUTS, current_page, last_interaction_time, selector_active_for, curve_menu_open, last_overlay_toggle
-    if raw_signals: RAW_INPUTS = raw_signals
+    if raw_signals is not None: RAW_INPUTS = raw_signals
     
     was_changed = False
 
@@ -91,8 +79,8 @@ def draw_input_tuning_panel(screen, rect, touch_down, touch_x, touch_y, raw_sign
         return was_changed
 
     # Draw Title
-    title_font = pygame.font.SysFont("monospace", 26, bold=True)
-    title = title_font.render("Input Signal Tuning", True, (255, 255, 255))
+    title_font = get_font(26, bold=True)
+    title = render_text(title_font, "Input Signal Tuning", (255, 255, 255))
     screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 20))
 
     # --- PAGE 0: ROUTING & EXPO ---
@@ -111,12 +99,13 @@ def draw_input_tuning_panel(screen, rect, touch_down, touch_x, touch_y, raw_sign
         curve_btn = pygame.Rect(rect.left + 10, r_y + 110, 220, 60)
         pygame.draw.rect(screen, (40, 44, 52), curve_btn, border_radius=12)
         pygame.draw.rect(screen, (255, 215, 0), curve_btn, 2, border_radius=12)
-        c_val = pygame.font.SysFont("monospace", 18, bold=True).render(CURVE_NAMES[TUNING_STATE["curve_type"]], True, (255, 255, 255))
+        c_val = render_text(get_font(18, bold=True), CURVE_NAMES[TUNING_STATE["curve_type"]], (255, 255, 255))
         screen.blit(c_val, (curve_btn.centerx - c_val.get_width()//2, curve_btn.centery - c_val.get_height()//2))
-        lbl_c = pygame.font.SysFont("monospace", 12, bold=True).render("RESPONSE ALGO", True, (150, 150, 150))
+        lbl_c = render_text(get_font(12, bold=True), "RESPONSE ALGO", (150, 150, 150))
         screen.blit(lbl_c, (curve_btn.x + 5, curve_btn.y - 18))
 
         e_res = draw_numeric_stepper(screen, rect.left + 65, curve_btn.bottom + 50, TUNING_STATE["expo"], "Stick Expo (Negative=Sharp)", touch_down, touch_x, touch_y)
+        draw_curve_preview(screen, pygame.Rect(rect.left + 330, curve_btn.bottom + 20, 260, 130))
         
         target_x = curve_btn.right + 25
         t_keys = ["curve_lh_id", "curve_lv_id", "curve_rh_id", "curve_rv_id"]
@@ -158,6 +147,28 @@ def draw_input_tuning_panel(screen, rect, touch_down, touch_x, touch_y, raw_sign
     
     return was_changed
 
+PREVIEW_INPUTS = np.linspace(-32767, 32767, 129).astype(np.int32)
+_preview_cache = {"key": None, "pts": None}
+
+def draw_curve_preview(screen, rect):
+    """Plots the left stick's settled response from the same table the engine interpolates."""
+    t = TUNING_STATE
+    key = (t["left_deadzone"], t["global_rate"], t["curve_type"], t["expo"])
+    if _preview_cache["key"] != key:
+        table, _, _ = lut_for_state(t)
+        out = lut_static_response(table, PREVIEW_INPUTS, np.float32(t["left_deadzone"]) / np.float32(10.0))
+        pts = np.empty((len(PREVIEW_INPUTS), 2), dtype=np.int32)
+        pts[:, 0] = rect.x + (PREVIEW_INPUTS + 32767) * (rect.width - 1) // 65534
+        pts[:, 1] = rect.bottom - 1 - (out + 32767) * (rect.height - 1) // 65534
+        _preview_cache["key"], _preview_cache["pts"] = key, pts
+
+    pygame.draw.rect(screen, (20, 22, 28), rect, border_radius=8)
+    pygame.draw.line(screen, (50, 52, 60), (rect.left, rect.centery), (rect.right, rect.centery))
+    pygame.draw.line(screen, (50, 52, 60), (rect.centerx, rect.top), (rect.centerx, rect.bottom))
+    pygame.draw.lines(screen, (255, 215, 0), False, _preview_cache["pts"], 2)
+    lbl = render_text(get_font(12, bold=True), "RESPONSE (L STICK)", (150, 150, 150))
+    screen.blit(lbl, (rect.x + 5, rect.y - 18))
+
 def draw_cinematic_row(screen, x, y, touch_down, tx, ty):
     global last_interaction_time
     changed = False
@@ -171,12 +182,11 @@ def draw_cinematic_row(screen, x, y, touch_down, tx, ty):
 
     if touch_down and box_rect.collidepoint(tx, ty) and (time.time() - last_interaction_time > 0.3):
         TUNING_STATE["cine_on"] = not TUNING_STATE["cine_on"]
-        stream_to_cpp("CINE_ON", TUNING_STATE["cine_on"])
-        save_settings()
+        CHANGE_SCHEDULER.mark("tuning", "engine")
         last_interaction_time = time.time()
         changed = True
 
-    lbl = pygame.font.SysFont("monospace", 15, bold=True).render("CINEMATIC", True, (0, 200, 255))
+    lbl = render_text(get_font(15, bold=True), "CINEMATIC", (0, 200, 255))
     screen.blit(lbl, (box_rect.x, box_rect.y - 18))
     return changed
 
@@ -186,26 +196,20 @@ def handle_stepper_input(l, r, e, s, g, csp, cac):
     changed = False
     checks = []
     
-    if l: checks.extend([("l_dec", l[1], "left_deadzone", -0.1, 0.0, 5.0, "L_DZ"), ("l_inc", l[3], "left_deadzone", 0.1, 0.0, 5.0, "L_DZ")])
-    if r: checks.extend([("r_dec", r[1], "right_deadzone", -0.1, 0.0, 5.0, "R_DZ"), ("r_inc", r[3], "right_deadzone", 0.1, 0.0, 5.0, "R_DZ")])
-    if e: checks.extend([("e_dec", e[1], "expo", -0.1, -10.0, 10.0, "EXPO"), ("e_inc", e[3], "expo", 0.1, -10.0, 10.0, "EXPO")])
-    if s: checks.extend([("s_dec", s[1], "smoothing", -0.05, 0, 1, "SMOOTH"), ("s_inc", s[3], "smoothing", 0.05, 0, 1, "SMOOTH")])
-    if g: checks.extend([("g_dec", g[1], "global_rate", -0.1, 0.1, 3.0, "RATE"), ("g_inc", g[3], "global_rate", 0.1, 0.1, 3.0, "RATE")])
+    if l: checks.extend([("l_dec", l[1], "left_deadzone", -0.1, 0.0, 5.0), ("l_inc", l[3], "left_deadzone", 0.1, 0.0, 5.0)])
+    if r: checks.extend([("r_dec", r[1], "right_deadzone", -0.1, 0.0, 5.0), ("r_inc", r[3], "right_deadzone", 0.1, 0.0, 5.0)])
+    if e: checks.extend([("e_dec", e[1], "expo", -0.1, -10.0, 10.0), ("e_inc", e[3], "expo", 0.1, -10.0, 10.0)])
+    if s: checks.extend([("s_dec", s[1], "smoothing", -0.05, 0, 1), ("s_inc", s[3], "smoothing", 0.05, 0, 1)])
+    if g: checks.extend([("g_dec", g[1], "global_rate", -0.1, 0.1, 3.0), ("g_inc", g[3], "global_rate", 0.1, 0.1, 3.0)])
     
-    if csp: checks.extend([("csp_dec", csp[1], "cine_speed", -0.5, 0.1, 20.0, "CINE_SPD"), ("csp_inc", csp[3], "cine_speed", 0.5, 0.1, 20.0, "CINE_SPD")])
-    if cac: checks.extend([("cac_dec", cac[1], "cine_accel", -0.1, 0.1, 25.0, "CINE_ACC"), ("cac_inc", cac[3], "cine_accel", 0.1, 0.1, 25.0, "CINE_ACC")])
+    if csp: checks.extend([("csp_dec", csp[1], "cine_speed", -0.5, 0.1, 20.0), ("csp_inc", csp[3], "cine_speed", 0.5, 0.1, 20.0)])
+    if cac: checks.extend([("cac_dec", cac[1], "cine_accel", -0.1, 0.1, 25.0), ("cac_inc", cac[3], "cine_accel", 0.1, 0.1, 25.0)])
 
-    for key, pressed, target, delta, v_min, v_max, udp_key in checks:
+    for key, pressed, target, delta, v_min, v_max in checks:
         if not pressed and prev_states[key] and (now - last_release[key]) >= 0.05:
             new_val = round(max(v_min, min(v_max, TUNING_STATE[target] + delta)), 2)
             TUNING_STATE[target] = new_val
-            
-            if udp_key in ["L_DZ", "R_DZ"]:
-                stream_to_cpp(udp_key, round(new_val / 10.0, 2))
-            else:
-                stream_to_cpp(udp_key, new_val)
-                
-            save_settings()
+            CHANGE_SCHEDULER.mark("tuning", "engine")
             last_release[key] = now
             changed = True
         prev_states[key] = pressed
@@ -223,14 +227,14 @@ def draw_single_mapper_box(screen, rect, state_key, label, touch_down, tx, ty, t
     pygame.draw.rect(screen, (20, 22, 28), rect, border_radius=8)
     pygame.draw.rect(screen, (0, 255, 120), rect, 2, border_radius=8)
     id_val = TUNING_STATE.get(state_key)
-    lbl = pygame.font.SysFont("monospace", 14, bold=True).render(label, True, (0, 255, 120))
+    lbl = render_text(get_font(14, bold=True), label, (0, 255, 120))
     screen.blit(lbl, (rect.x + 8, rect.y + 4))
     
     if id_val is not None and id_val < 23:
-        v_txt = pygame.font.SysFont("monospace", 24, bold=True).render(f"ID {id_val:02}", True, (255, 255, 255))
+        v_txt = render_text(get_font(24, bold=True), f"ID {id_val:02}", (255, 255, 255))
         screen.blit(v_txt, (rect.x + 8, rect.y + 18))
-        tuned_v = int(tuned_signals[id_val]) if tuned_signals and id_val < len(tuned_signals) else 0
-        screen.blit(pygame.font.SysFont("monospace", 16, bold=True).render(str(tuned_v), True, (0, 255, 100)), (rect.x + 8, rect.bottom - 22))
+        tuned_v = int(tuned_signals[id_val]) if tuned_signals is not None and id_val < len(tuned_signals) else 0
+        screen.blit(get_font(16, bold=True).render(str(tuned_v), True, (0, 255, 100)), (rect.x + 8, rect.bottom - 22))
         
     if touch_down and rect.collidepoint(tx, ty) and (time.time() - last_overlay_toggle > 0.5):
         selector_active_for = state_key
@@ -250,16 +254,15 @@ def draw_id_selector_overlay(screen, rect, touch_down, tx, ty):
         btn = pygame.Rect(start_x + (i % 5 * 118), start_y + (i // 5 * 63), 110, 55)
         is_sel = TUNING_STATE.get(selector_active_for) == i
         pygame.draw.rect(screen, (0, 80, 40) if is_sel else (45, 45, 55), btn, border_radius=6)
-        screen.blit(pygame.font.SysFont("monospace", 17, bold=True).render(f"ID {i:02}", True, (255, 255, 255)), (btn.x + 8, btn.y + 5))
+        screen.blit(render_text(get_font(17, bold=True), f"ID {i:02}", (255, 255, 255)), (btn.x + 8, btn.y + 5))
         
         raw_v = int(RAW_INPUTS[i]) if i < len(RAW_INPUTS) else 0
-        v_txt = pygame.font.SysFont("monospace", 17, bold=True).render(str(raw_v), True, (0, 255, 100))
+        v_txt = get_font(17, bold=True).render(str(raw_v), True, (0, 255, 100))
         screen.blit(v_txt, (btn.x + 8, btn.y + 28))
         
         if touch_down and btn.collidepoint(tx, ty) and (time.time() - last_overlay_toggle > 0.5):
             TUNING_STATE[selector_active_for] = i
-            stream_to_cpp(selector_active_for.upper(), i)
-            save_settings()
+            CHANGE_SCHEDULER.mark("tuning", "engine")
             selector_active_for = None
             last_overlay_toggle = time.time()
             changed = True
@@ -275,13 +278,12 @@ def draw_curve_selector_overlay(screen, rect, touch_down, tx, ty):
     for i, name in enumerate(CURVE_NAMES):
         btn = pygame.Rect(rect.centerx - 120, rect.y + 80 + (i * 75), 240, 60)
         pygame.draw.rect(screen, (0, 255, 150) if TUNING_STATE["curve_type"] == i else (45, 48, 60), btn, border_radius=12)
-        txt = pygame.font.SysFont("monospace", 22, bold=True).render(name, True, (255, 255, 255))
+        txt = render_text(get_font(22, bold=True), name, (255, 255, 255))
         screen.blit(txt, (btn.centerx - txt.get_width()//2, btn.centery - txt.get_height()//2))
         
         if touch_down and btn.collidepoint(tx, ty) and (time.time() - last_overlay_toggle > 0.5):
             TUNING_STATE["curve_type"] = i
-            stream_to_cpp("CURVE", i)
-            save_settings()
+            CHANGE_SCHEDULER.mark("tuning", "engine")
             curve_menu_open = False
             last_overlay_toggle = time.time()
             changed = True
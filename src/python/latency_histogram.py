@@ -0,0 +1,101 @@
+# latency_histogram.py - decaying log-bucket latency histograms + end-to-end touch latency stages
+import math
+import time
+import numpy as np
+
+DECAY_STEP = 0.5   # seconds between decay passes (decay is applied in steps, not per sample)
+MIN_WEIGHT = 0.5   # decayed sample mass below which the histogram counts as empty again
+
+
+class LatencyHistogram:
+    """
+    Log-spaced buckets (~4% wide) between lo_ms and hi_ms plus an underflow and
+    an overflow bucket. Counts and the tracked max decay with `half_life`, so
+    percentiles follow recent behaviour instead of the whole session and an
+    old spike fades out. Decay runs on the clock, from reads as well as add(),
+    so the numbers keep falling while no samples arrive and drop to 0 once the
+    remaining weight is under MIN_WEIGHT. add() is O(1); percentile() works on demand.
+    """
+
+    def __init__(self, lo_ms=0.01, hi_ms=1000.0, buckets=300, half_life=10.0):
+        self.edges = np.geomspace(lo_ms, hi_ms, buckets + 1)
+        self.counts = np.zeros(buckets + 2)
+        self.half_life = half_life
+        self._log_lo = math.log(lo_ms)
+        self._scale = buckets / math.log(hi_ms / lo_ms)
+        self._last_decay = time.monotonic()
+        self.max = 0.0
+        self.last = 0.0
+        self.samples = 0
+
+    def decay(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now - self._last_decay < DECAY_STEP:
+            return
+        f = 0.5 ** ((now - self._last_decay) / self.half_life)
+        self.counts *= f
+        self.max *= f
+        self._last_decay = now
+        if self.counts.sum() < MIN_WEIGHT:
+            self.counts[:] = 0.0
+            self.max = 0.0
+
+    def add(self, ms, now=None):
+        self.decay(now)
+        if ms > 0.0:
+            i = min(max(int((math.log(ms) - self._log_lo) * self._scale) + 1, 0), len(self.counts) - 1)
+        else:
+            i = 0
+        self.counts[i] += 1.0
+        self.max = max(self.max, ms)
+        self.last = ms
+        self.samples += 1
+
+    def percentile(self, q, now=None):
+        """Upper edge of the bucket holding the q-th fraction of the (decayed) samples, capped at max."""
+        self.decay(now)
+        total = self.counts.sum()
+        if total <= 0.0:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.counts), q * total))
+        if i == 0:
+            return min(self.edges[0], self.max)
+        return min(float(self.edges[min(i, len(self.edges) - 1)]), self.max)
+
+    def summary(self, now=None):
+        """(p50, p95, p99, max) in ms."""
+        self.decay(now)
+        return self.percentile(0.50), self.percentile(0.95), self.percentile(0.99), self.max
+
+    def reset(self):
+        self.counts[:] = 0.0
+        self.max = self.last = 0.0
+        self.samples = 0
+
+
+# Stages of one touch report, all on the realtime clock the kernel stamps events with:
+#   input  = kernel event -> published to the touch slot (reader wakeup + decode)
+#   ipc    = published -> read by the UI loop (includes waiting for the next tick)
+#   render = read -> frame presented
+TOUCH_STAGES = ("input", "ipc", "render", "total")
+
+
+class TouchLatency:
+    """Records each touch report once, in the first frame that puts it on screen."""
+
+    def __init__(self):
+        self.hist = {stage: LatencyHistogram() for stage in TOUCH_STAGES}
+        self.last_event = 0.0
+
+    def record(self, t_event, t_publish, t_read, t_present):
+        if t_event <= 0.0 or t_event == self.last_event:
+            return False
+        self.last_event = t_event
+        now = time.monotonic()
+        for stage, dt in zip(TOUCH_STAGES, (t_publish - t_event, t_read - t_publish,
+                                            t_present - t_read, t_present - t_event)):
+            self.hist[stage].add(max(dt, 0.0) * 1000.0, now)
+        return True
+
+
+TOUCH_LATENCY = TouchLatency()
@@ -0,0 +1,42 @@
+# layer_cache.py - pre-rendered static layers for panels and the settings sidebar
+import pygame
+
+
+class LayerCache:
+    """
+    get(name, key, size, build) returns an opaque surface holding a panel's
+    static content. build(surface) paints it in local coordinates and only runs
+    the first time, when `key` (page, active index, ...) or the size changes,
+    or after invalidate(). Panels blit the layer, then draw their dynamic parts.
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get(self, name, key, size, build):
+        size = tuple(size)
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == key and entry[1].get_size() == size:
+            self.stats["hits"] += 1
+            return entry[1]
+        if entry is not None and entry[1].get_size() == size:
+            surf = entry[1]
+        else:
+            surf = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+        build(surf)
+        self._layers[name] = (key, surf)
+        self.stats["builds"] += 1
+        return surf
+
+    def invalidate(self, name=None):
+        """Forces a rebuild of one layer (or all of them) on next use."""
+        if name is None:
+            self._layers.clear()
+        else:
+            self._layers.pop(name, None)
+
+
+LAYER_CACHE = LayerCache()
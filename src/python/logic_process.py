@@ -1,132 +1,157 @@
-# logic_process.py - touchscreen input with resolution-aware scaling
-from evdev import InputDevice, ecodes, list_devices
-from select import select
+# logic_process.py - blocking (epoll) touchscreen reader with inotify hotplug, batch-decoded from the device fd
+import os
+import select
 import time
-from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from touch_shm import TouchSlot, TOUCH_SHM_PATH
+from touch_decode import TouchDecoder
+from touch_discovery import InputDirWatcher, TouchFinder, IN_CREATE, IN_ATTRIB
 
-def logic_process(conn):
+MEASURE_INTERVAL = 5.0   # seconds between measurement-mode reports
+
+def logic_process(touch_path=TOUCH_SHM_PATH, measure=False):
+    # Latest state is overwritten in place; main.py reads it once per frame
+    slot = TouchSlot(touch_path)
+    finder = TouchFinder()
+    watcher = InputDirWatcher()
     touch_dev = None
-    device_path = None
-    high_priority_keywords = ["biqu", "btt", "hdmi7", "hdmi5", "bi-qu", "bigtreetech", "usb touchscreen", "generic touch", "usb touch", "hid-compliant", "hid compliant"]
-    exclude_keywords = ["sony", "controller", "wireless", "ps", "dual", "gamepad", "xbox", "joy", "mouse", "keyboard"]
+    decoder = TouchDecoder()
+    stats = {"wakeups": 0, "reports": 0, "publishes": 0, "lat_sum": 0.0, "lat_max": 0.0}
+    last_report = time.monotonic()
+    published = None
+    lost_at = None          # monotonic time the touchscreen went away (None = never had one)
+    last_scan_attempt = 0.0
 
-    def try_open_touch():
-        nonlocal touch_dev, device_path
-        if touch_dev:
-            try:
-                touch_dev.close()
-            except:
-                pass
-        touch_dev = None
-        device_path = None
-        candidates = []
-        
-        for path in list_devices():
-            try:
-                dev = InputDevice(path)
-                name_lower = dev.name.lower()
-                if any(kw in name_lower for kw in exclude_keywords):
-                    continue
-                caps = dev.capabilities()
-                has_mt = ecodes.ABS_MT_POSITION_X in caps.get(ecodes.EV_ABS, [])
-                has_touch = ecodes.BTN_TOUCH in caps.get(ecodes.EV_KEY, [])
-                if has_mt or has_touch:
-                    candidates.append((path, dev.name, has_mt, has_touch))
-                    if any(kw in name_lower for kw in high_priority_keywords):
-                        touch_dev = dev
-                        device_path = path
-                        return True
-            except:
-                pass
-        
-        if touch_dev is None and candidates:
-            candidates.sort(key=lambda x: (not x[2], not x[3]), reverse=True)
-            touch_dev = InputDevice(candidates[0][0])
-            device_path = candidates[0][0]
-            return True
-        return False
+    # Blocks in the kernel until the digitizer has input, or /dev/input changes; no polling timeout
+    ep = select.epoll()
+    if watcher.fd is not None:
+        ep.register(watcher.fd, select.EPOLLIN)
 
-    print("Initial scan for touchscreen...")
-    if not try_open_touch():
-        print("No touchscreen found initially.")
-        conn.send([999.0, False, 0, 0])
-    else:
+    def publish(latency_ms, down, x, y, t_event=0.0):
+        nonlocal published
+        slot.publish(latency_ms, down, x, y, t_event)
+        published = (down, x, y)
+        stats["publishes"] += 1
+        if t_event:     # only real input carries a latency; -1 / 999 are device-state sentinels
+            stats["lat_sum"] += latency_ms
+            stats["lat_max"] = max(stats["lat_max"], latency_ms)
+
+    def report_stats():
+        nonlocal last_report
+        now = time.monotonic()
+        dt = now - last_report
+        if dt < MEASURE_INTERVAL:
+            return
+        n = max(stats["publishes"], 1)
+        print(f"Touch: {stats['wakeups'] / dt:6.1f} wakeups/s  {stats['reports'] / dt:6.1f} reports/s  "
+              f"{stats['publishes'] / dt:6.1f} publishes/s  event->publish avg {stats['lat_sum'] / n:.3f} ms "
+              f"max {stats['lat_max']:.3f} ms")
+        stats.update(wakeups=0, reports=0, publishes=0, lat_sum=0.0, lat_max=0.0)
+        last_report = now
+
+    def attach(found, t_seen=None):
+        """Grabs a device returned by TouchFinder and starts reading it."""
+        nonlocal touch_dev, decoder
+        dev, _, max_x, max_y = found
         try:
-            touch_dev.grab()
-            print(f"Device {touch_dev.name} grabbed exclusively")
+            dev.grab()
+            print(f"Device {dev.name} grabbed exclusively")
         except Exception as e:
             print(f"Grab failed: {e}")
+        touch_dev = dev
+        decoder = TouchDecoder(max_x, max_y)
+        ep.register(dev.fd, select.EPOLLIN | select.EPOLLERR | select.EPOLLHUP)
+        if t_seen is not None:
+            # Hotplug: node appeared -> touch readable (cache hit skips capabilities/absinfo)
+            print(f"Touch available {(time.monotonic() - t_seen) * 1000.0:.1f} ms after {os.path.basename(dev.path)} appeared "
+                  f"({time.monotonic() - lost_at:.1f} s without touch, "
+                  f"{finder.stats['cache_hits']}/{finder.stats['probes']} probes from fingerprint cache)")
 
-    is_down = False
-    tx = ty = 0
-    last_scan_attempt = time.time()
+    def detach():
+        nonlocal touch_dev, lost_at
+        try:
+            ep.unregister(touch_dev.fd)
+        except (OSError, ValueError):
+            pass
+        try:
+            touch_dev.close()
+        except OSError:
+            pass
+        touch_dev = None
+        lost_at = time.monotonic()
+        # FIX: Ensure main process knows touch is UP when device is lost
+        publish(-1.0, False, 0, 0)
 
-    # Get initial digitizer limits
-    if touch_dev:
-        abs_x = touch_dev.absinfo(ecodes.ABS_MT_POSITION_X)
-        abs_y = touch_dev.absinfo(ecodes.ABS_MT_POSITION_Y)
-        max_x = abs_x.max if abs_x and abs_x.max > 0 else 4095
-        max_y = abs_y.max if abs_y and abs_y.max > 0 else 4095
+    print("Initial scan for touchscreen...")
+    found = finder.scan()
+    if found is None:
+        print("No touchscreen found initially.")
+        publish(999.0, False, 0, 0)
+        lost_at = time.monotonic()
     else:
-        max_x = max_y = 4095
-
-    
+        attach(found)
 
     while True:
-        if touch_dev is None:
-            # FIX: Ensure main process knows touch is UP when device is lost
-            is_down = False 
-            conn.send([-1.0, False, 0, 0])
-            
-            if time.time() - last_scan_attempt >= 2.0:
-                last_scan_attempt = time.time()
-                if try_open_touch():
-                    try:
-                        touch_dev.grab()
-                        # Refresh digitizer max values on reconnect
-                        info_x = touch_dev.absinfo(ecodes.ABS_MT_POSITION_X)
-                        info_y = touch_dev.absinfo(ecodes.ABS_MT_POSITION_Y)
-                        max_x = info_x.max if info_x and info_x.max > 0 else 4095
-                        max_y = info_y.max if info_y and info_y.max > 0 else 4095
-                    except:
-                        pass
-            time.sleep(0.5)
+        if measure:
+            report_stats()
+
+        if touch_dev is None and watcher.fd is None:
+            # No inotify: fall back to a full rescan every 2 s
+            timeout = max(0.0, last_scan_attempt + 2.0 - time.monotonic())
+        else:
+            timeout = -1
+        if measure:
+            timeout = MEASURE_INTERVAL if timeout < 0 else min(timeout, MEASURE_INTERVAL)
+
+        events = ep.poll(timeout)
+        stats["wakeups"] += 1
+
+        if touch_dev is None and watcher.fd is None and time.monotonic() - last_scan_attempt >= 2.0:
+            last_scan_attempt = time.monotonic()
+            found = finder.scan()
+            if found is not None:
+                attach(found, last_scan_attempt)
             continue
 
-        try:
-            t_start = time.perf_counter_ns()
-            # 12ms timeout for select matches roughly 80Hz polling
-            r, _, _ = select([touch_dev.fd], [], [], 0.012)
-
-            if r:
-                for event in touch_dev.read():
-                    if event.type == ecodes.EV_ABS:
-                        if event.code == ecodes.ABS_MT_POSITION_X:
-                            tx = int(event.value * SCREEN_WIDTH / max_x)
-                        elif event.code == ecodes.ABS_MT_POSITION_Y:
-                            ty = int(event.value * SCREEN_HEIGHT / max_y)
-                    
-                    elif event.type == ecodes.EV_KEY:
-                        if event.code == ecodes.BTN_TOUCH:
-                            is_down = bool(event.value)
-                    
-                    elif event.type == ecodes.EV_SYN and event.code == ecodes.SYN_REPORT:
-                        latency_ms = (time.perf_counter_ns() - t_start) / 1_000_000
-                        conn.send([latency_ms, is_down, tx, ty])
-            else:
-                # Still send the current state even if no new movement to keep main loop alive
-                latency_ms = (time.perf_counter_ns() - t_start) / 1_000_000
-                conn.send([latency_ms, is_down, tx, ty])
-
-        except OSError as e:
-            # Error 19 is 'No such device' (unplugged)
-            if e.errno == 19:
-                print("Touch device lost - re-scanning...")
-                touch_dev = None
-                is_down = False # Force release
-                conn.send([-1.0, False, 0, 0])
-            else:
-                raise
-
-        # Micro-sleep to prevent 100% CPU usage while maintaining low latency
-        time.sleep(0.0005)
\ No newline at end of file
+        for fd, mask in events:
+            if fd == watcher.fd:
+                # New / re-permissioned nodes are only probed while we have no touchscreen
+                t_seen = time.monotonic()
+                changed = [path for path, ev_mask in watcher.read() if ev_mask & (IN_CREATE | IN_ATTRIB)]
+                if touch_dev is None and changed:
+                    found = finder.scan(dict.fromkeys(changed))
+                    if found is not None:
+                        attach(found, t_seen)
+                continue
+
+            if touch_dev is None or fd != touch_dev.fd:
+                continue
+            try:
+                # One os.read() drains everything the kernel queued; the decoder scales
+                # coordinates once per report and keeps only press/release + the last position
+                reports = decoder.stats["reports"]
+                for down, x, y, t_first in decoder.read(fd):
+                    if (down, x, y) != published:
+                        publish((time.time() - t_first) * 1000.0, down, x, y, t_first)
+                stats["reports"] += decoder.stats["reports"] - reports
+
+            except BlockingIOError:
+                # Spurious wakeup, nothing queued
+                pass
+            except OSError as e:
+                # Error 19 is 'No such device' (unplugged)
+                if e.errno == 19:
+                    print("Touch device lost - waiting for it to come back...")
+                    detach()
+                else:
+                    raise
+
+if __name__ == "__main__":
+    # Standalone measurement: python3 logic_process.py  (prints wakeups/s and event->publish latency)
+    slot_path = TOUCH_SHM_PATH + "_measure"
+    TouchSlot(slot_path, create=True).close()
+    try:
+        logic_process(slot_path, measure=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.unlink(slot_path)
@@ -1,49 +1,120 @@
-# logs_panel.py - Generated Paginated UI Panel
+# logs_panel.py - live graph, flight recorder control and log playback
 import pygame
 import time
+import os
 from config import *
+from ui_helpers import draw_history_graph, draw_paged_panel
+from telemetry_history import TELEMETRY_HISTORY
+from flight_recorder import FLIGHT_RECORDER, FlightLog, list_logs
+from font_cache import get_font, render_text
 
 # Local State
 current_page = 0
 last_interaction_time = 0
 
+GRAPH_SECONDS = 10.0
+GRAPH_COLS = slice(0, 4)  # four columns -> zero-copy view
+GRAPH_COLORS = [(0, 255, 100), (0, 200, 255), (255, 200, 100), (255, 80, 80)]
+
+# Recorder / Playback State
+log_files = []
+log_files_page = -1      # page the list was last refreshed for
+playback_log = None
+playback_t = 0.0
+
 def draw_logs_panel(screen, rect, touch_down, touch_x, touch_y):
-    global current_page, last_interaction_time
-    
-    # Title Rendering
-    title_font = pygame.font.SysFont("monospace", 28, bold=True)
-    title = title_font.render(f"Logs: Page {current_page + 1}", True, (255, 255, 255))
-    screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 30))
-
-    # Placeholder Content
-    font = pygame.font.SysFont("monospace", 20, bold=True)
-    msg = font.render(f"Logs settings coming soon...", True, (100, 100, 100))
-    screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.centery))
-
-    # --- NAVIGATION ARROWS ---
-    arrow_w, arrow_h = 60, 45
-    prev_rect = pygame.Rect(rect.centerx - 70, rect.bottom - 70, arrow_w, arrow_h)
-    next_rect = pygame.Rect(rect.centerx + 10, rect.bottom - 70, arrow_w, arrow_h)
-
-    # Draw Back Arrow
-    p_pres = touch_down and prev_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if p_pres else (40, 40, 50), prev_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(prev_rect.centerx+10, prev_rect.centery-10), (prev_rect.centerx-10, prev_rect.centery), (prev_rect.centerx+10, prev_rect.centery+10)])
+    global current_page, last_interaction_time, log_files_page
     
-    # Draw Next Arrow
-    n_pres = touch_down and next_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if n_pres else (40, 40, 50), next_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(next_rect.centerx-10, next_rect.centery-10), (next_rect.centerx+10, next_rect.centery), (next_rect.centerx-10, next_rect.centery+10)])
-
-    # --- PAGE INDICATOR DOTS ---
-    for i in range(3):
-        dot_x = rect.centerx - 20 + (i * 20)
-        dot_y = rect.bottom - 85
-        color = (255, 255, 255) if i == current_page else (100, 100, 100)
-        pygame.draw.circle(screen, color, (dot_x, dot_y), 4)
+    # Static title/arrows come from a cached layer; page content is drawn live
+    p_pres, n_pres = draw_paged_panel(screen, rect, "logs", f"Logs: Page {current_page + 1}", current_page,
+                                      touch_down, touch_x, touch_y)
+
+    font = get_font(20, bold=True)
+    small_font = get_font(14, bold=True)
+    if current_page == 0:
+        # Live scrolling graph straight from the telemetry ring buffer
+        graph_rect = pygame.Rect(rect.x + 30, rect.y + 90, rect.width - 60, rect.height - 200)
+        ts, vals = TELEMETRY_HISTORY.window("ch", GRAPH_SECONDS)
+        draw_history_graph(screen, graph_rect, ts, vals[:, GRAPH_COLS], GRAPH_COLORS, GRAPH_SECONDS, 172, 1811)
+        lbl = render_text(small_font, "Sent CH1-CH4 (CRSF), last 10 s", (150, 150, 150))
+        screen.blit(lbl, (graph_rect.x, graph_rect.y - 20))
+    elif current_page == 1:
+        draw_recorder_page(screen, rect, touch_down, touch_x, touch_y, font, small_font)
+    else:
+        draw_playback_page(screen, rect, touch_down, touch_x, touch_y, font, small_font)
 
     # Switching Logic (Debounced)
     if (p_pres or n_pres) and (time.time() - last_interaction_time) > 0.25:
         if p_pres: current_page = (current_page - 1) % 3
         if n_pres: current_page = (current_page + 1) % 3
+        log_files_page = -1
         last_interaction_time = time.time()
+
+def draw_recorder_page(screen, rect, touch_down, touch_x, touch_y, font, small_font):
+    """Start/stop recording and pick a log for playback."""
+    global current_page, last_interaction_time, log_files, log_files_page, playback_log, playback_t
+
+    # Directory listing only when the page is (re)entered, not every frame
+    if log_files_page == -1:
+        log_files, log_files_page = list_logs()[:5], current_page
+
+    rec_btn = pygame.Rect(rect.x + 30, rect.y + 90, 160, 55)
+    is_rec = FLIGHT_RECORDER.active
+    pygame.draw.rect(screen, (180, 40, 40) if is_rec else (50, 52, 60), rec_btn, border_radius=12)
+    r_txt = render_text(font, "STOP" if is_rec else "REC", (255, 255, 255))
+    screen.blit(r_txt, (rec_btn.centerx - r_txt.get_width()//2, rec_btn.centery - r_txt.get_height()//2))
+
+    st = FLIGHT_RECORDER.stats
+    info = f"{st['records']} rec  {st['bytes'] // 1024} KB  {st['dropped']} dropped" if is_rec else "Recorder idle"
+    screen.blit(small_font.render(info, True, (150, 150, 150)), (rec_btn.right + 20, rec_btn.y + 8))
+    if FLIGHT_RECORDER.path:
+        screen.blit(render_text(small_font, os.path.basename(FLIGHT_RECORDER.path), (100, 100, 110)), (rec_btn.right + 20, rec_btn.y + 30))
+
+    if touch_down and rec_btn.collidepoint(touch_x, touch_y) and (time.time() - last_interaction_time) > 0.5:
+        if is_rec: FLIGHT_RECORDER.stop()
+        else: FLIGHT_RECORDER.start()
+        log_files_page = -1
+        last_interaction_time = time.time()
+
+    for i, path in enumerate(log_files):
+        row = pygame.Rect(rect.x + 30, rect.y + 170 + i * 52, rect.width - 60, 44)
+        pygame.draw.rect(screen, (40, 44, 52), row, border_radius=8)
+        screen.blit(render_text(small_font, os.path.basename(path), (255, 255, 255)), (row.x + 12, row.centery - 8))
+        if touch_down and row.collidepoint(touch_x, touch_y) and (time.time() - last_interaction_time) > 0.5:
+            try:
+                playback_log, playback_t = FlightLog(path), 0.0
+                current_page = 2
+            except (OSError, ValueError) as e:
+                print(f"Log Open Error: {e}")
+            last_interaction_time = time.time()
+
+def draw_playback_page(screen, rect, touch_down, touch_x, touch_y, font, small_font):
+    """Scrub-able view over a memory-mapped log; only the visible window is touched."""
+    global playback_t
+    if playback_log is None or len(playback_log) == 0:
+        msg = render_text(font, "Select a log on page 2", (100, 100, 100))
+        screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.centery))
+        return
+
+    recs = playback_log.records
+    graph_rect = pygame.Rect(rect.x + 30, rect.y + 90, rect.width - 60, rect.height - 260)
+    scrub_rect = pygame.Rect(rect.x + 30, graph_rect.bottom + 30, rect.width - 60, 36)
+    duration = max(playback_log.duration, 1e-6)
+
+    if touch_down and scrub_rect.inflate(0, 20).collidepoint(touch_x, touch_y):
+        playback_t = (touch_x - scrub_rect.x) / scrub_rect.width * duration
+    playback_t = max(0.0, min(duration, playback_t))
+
+    end = playback_log.index_at(playback_t) + 1
+    start = playback_log.index_at(playback_t - GRAPH_SECONDS)
+    window = recs[start:end]
+    draw_history_graph(screen, graph_rect, window["t"], window["ch"][:, GRAPH_COLS], GRAPH_COLORS, GRAPH_SECONDS, 172, 1811)
+
+    pygame.draw.rect(screen, (40, 44, 52), scrub_rect, border_radius=8)
+    knob_x = scrub_rect.x + int(playback_t / duration * scrub_rect.width)
+    pygame.draw.rect(screen, (0, 200, 255), (knob_x - 4, scrub_rect.y - 4, 8, scrub_rect.height + 8), border_radius=3)
+
+    cur = recs[end - 1]
+    ch = cur["ch"]
+    readout = f"{playback_t:7.2f}s / {duration:.1f}s  CH1:{ch[0]} CH2:{ch[1]} CH3:{ch[2]} CH4:{ch[3]}"
+    screen.blit(small_font.render(readout, True, (200, 200, 200)), (graph_rect.x, graph_rect.y - 20))
@@ -1,58 +1,45 @@
 import pygame
 import sys
-import os
 import time
-import socket
-import numpy as np
-from multiprocessing import Process, Pipe
+from multiprocessing import Process
 from logic_process import logic_process
-from render_core import create_gradient_bg
+from render_core import create_gradient_bg, DirtyRenderer
 from ui_components import (
     draw_gear_button, draw_settings_panel, draw_controller_icon, 
     PANEL_MAP, shared_keyboard, shared_keypad
 )
-from input_tuning_panel import load_settings, TUNING_STATE
-from mapper_panel import load_mapper_settings, get_tuned_val, CHANNEL_MAPS, SPLIT_CONFIG
+from input_tuning_panel import load_settings, save_settings, TUNING_STATE
+from mapper_panel import load_mapper_settings, save_mapper_settings, map_preview, CHANNEL_MAPS, SPLIT_CONFIG
+from telemetry_decoder import TelemetryFrame
+from telemetry_watcher import TelemetryWatcher
+from telemetry_history import TELEMETRY_HISTORY
+from crsf_telemetry import CRSF_TELEMETRY
+from flight_recorder import FLIGHT_RECORDER
+from config_sync import CONFIG_SYNC, BackgroundPush
+from change_scheduler import CHANGE_SCHEDULER
+from settings_writer import SETTINGS_WRITER
+from frame_scheduler import FRAME_SCHEDULER
+from touch_shm import TouchSlot
+from latency_histogram import TOUCH_LATENCY
+from frame_profiler import PROFILER
 from config import *
+from font_cache import get_font, render_text
+from ui_helpers import draw_profiler_overlay
 
-# --- UDP SETUP FOR C++ ENGINE ---
-udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-ENGINE_ADDR = ("127.0.0.1", 5005)
-
-def sync_to_engine(retries=3, delay=1.0):
+# --- CONFIG SYNC WITH C++ ENGINE ---
+def sync_to_engine(force=False):
     """
-    Sends the current mapping and tuning rules to the C++ engine.
+    Sends the current mapping and tuning rules to the C++ engine as one acked packet.
+    Skipped when the engine already reports the same config hash (unless force).
     """
     print("Syncing configs to C++ engine...")
-    for attempt in range(retries):
-        try:
-            # 1. SYNC CHANNEL MAPS
-            m_str = ",".join(map(str, CHANNEL_MAPS))
-            s = SPLIT_CONFIG
-            split_data = f"{s['target_ch']},{s['pos_id']},{s['neg_id']},{int(s['pos_center'])},{int(s['pos_reverse'])},{int(s['neg_center'])},{int(s['neg_reverse'])}"
-            packet = f"SET_MAP|{m_str}|{split_data}"
-            udp_sock.sendto(packet.encode(), ENGINE_ADDR)
-
-            # 2. SYNC TUNING PARAMS (Smoothing, Rates, Cinematic, Deadzones)
-            t = TUNING_STATE
-            params = [
-                f"SMOOTH:{t['smoothing']}",
-                f"RATE:{t['global_rate']}",
-                f"EXPO:{t['expo']}",
-                f"CINE_ON:{int(t['cine_on'])}",
-                f"CINE_SPD:{t['cine_speed']}", 
-                f"CINE_ACC:{t['cine_accel']}",
-                f"L_DZ:{round(t['left_deadzone'] / 10.0, 2)}",
-                f"R_DZ:{round(t['right_deadzone'] / 10.0, 2)}"
-            ]
-            for p_msg in params:
-                udp_sock.sendto(p_msg.encode(), ENGINE_ADDR)
-            print("Sync complete.")
-            return True 
-
-        except Exception as e:
-            print(f"UDP Sync Attempt {attempt+1} Error: {e}. Retrying in {delay}s...")
-            time.sleep(delay)
+    skipped = CONFIG_SYNC.stats["skipped"]
+    if CONFIG_SYNC.sync(CHANNEL_MAPS, SPLIT_CONFIG, TUNING_STATE, force=force):
+        if CONFIG_SYNC.stats["skipped"] != skipped:
+            print(f"Engine already running config {CONFIG_SYNC.engine_hash:08x}.")
+        else:
+            print(f"Sync complete (config {CONFIG_SYNC.engine_hash:08x}, rtt {CONFIG_SYNC.stats['last_rtt_ms']:.2f} ms).")
+        return True
     print("Sync failed after retries.")
     return False
 
@@ -61,9 +48,22 @@ load_settings()
 load_mapper_settings()
 sync_to_engine()
 
-# Setup communication for touch/logic
-parent_conn, child_conn = Pipe(False)
-p = Process(target=logic_process, args=(child_conn,), daemon=True)
+def engine_push_done(ok):
+    """Worker-thread callback: a failed push is re-queued with backoff so the engine can't stay on an old config."""
+    delay = CHANGE_SCHEDULER.report("engine", ok)
+    if delay:
+        print(f"Config push failed, retrying in {delay:.2f} s.")
+
+# Panel edits are coalesced: one settings write per file and one engine push per burst.
+# The push runs on a worker thread; the render loop never waits for the engine's ack.
+ENGINE_PUSH = BackgroundPush(CONFIG_SYNC, on_result=engine_push_done)
+CHANGE_SCHEDULER.register("tuning", save_settings)
+CHANGE_SCHEDULER.register("mapper", save_mapper_settings)
+CHANGE_SCHEDULER.register("engine", lambda: ENGINE_PUSH.submit(CHANNEL_MAPS, SPLIT_CONFIG, TUNING_STATE))
+
+# Setup communication for touch/logic (shared-memory slot, created before the reader attaches)
+touch = TouchSlot(create=True)
+p = Process(target=logic_process, args=(touch.path,), daemon=True)
 p.start()
 
 pygame.display.init()
@@ -72,37 +72,45 @@ pygame.font.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE)
 pygame.mouse.set_visible(False)
 
-font = pygame.font.SysFont("monospace", 18, bold=True)
-small_font = pygame.font.SysFont("monospace", 14, bold=True)
-debug_font = pygame.font.SysFont("monospace", 17, bold=True)
+font = get_font(18, bold=True)
+small_font = get_font(14, bold=True)
+debug_font = get_font(17, bold=True)
 bg = create_gradient_bg(SCREEN_WIDTH, SCREEN_HEIGHT, COLOR_BG_DARK, COLOR_BG_LIGHT)
 settings_rect = pygame.Rect(SCREEN_WIDTH, 0, 190, SCREEN_HEIGHT)
+renderer = DirtyRenderer(screen, bg, full_frame=not DIRTY_RECT_RENDERING)
+overlay_rect = pygame.Rect(0, 0, 0, 0)   # area the sidebar/sub-panel covered last frame
 
 # UI State
 settings_visible = False
 active_panel_index = -1
 last_nav_time = 0
 ui_lock_time = 0   # <--- GLOBAL TOUCH SHIELD TIMER
-peak_latency = 0.0
 
-# Persistent Flight Data
+# Persistent Flight Data (filled in place from the engine's shared-memory segment)
 connected = 0
 flight_latency_ms = flight_rate_hz = 0.0
-raw_signals = [0] * 23 
-tuned_signals = [0] * 23 
-ch_sent = ["0"] * 16
+frame = TelemetryFrame()
+raw_signals, tuned_signals, ch_sent = frame.raw, frame.tuned, frame.ch
+telemetry = TelemetryWatcher()
+if FLIGHT_LOG_AUTOSTART:
+    FLIGHT_RECORDER.start()  # Logs panel can stop/restart it either way
 
-clock = pygame.time.Clock()
+latest = (0.1, False, 0, 0, 0.0, 0.0)   # kept if a read ever comes back torn
 running = True
 
 try:
     while running:
-        # 1. Handle Touch Pipe
-        latest = [0.1, False, 0, 0]
-        while parent_conn.poll(): 
-            latest = parent_conn.recv()
-        t_lat, t_down, tx, ty = latest
-        peak_latency = max(peak_latency, t_lat)
+        PROFILER.begin()
+
+        # 1. Read Touch Slot (latest state; a queued press/release wins so quick taps aren't lost)
+        latest = touch.read() or latest
+        _, t_down, tx, ty, t_event, t_pub = latest
+        t_read = time.time()
+        edge = touch.pop_edge()
+        if edge is not None:
+            t_down, tx, ty, t_event, t_pub = edge
+        FRAME_SCHEDULER.touch_changed(t_down, tx, ty)
+        PROFILER.mark("touch")
 
         now = time.time()
         
@@ -116,90 +124,123 @@ try:
         # This is the filtered signal we pass to UI elements
         safe_t_down = t_down and not is_locked
 
-        # 2. Parse Telemetry from C++ Engine
-        if os.path.exists('/tmp/flight_status.txt'):
-            try:
-                with open('/tmp/flight_status.txt', 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        parts = content.split()
-                        data = {p_item.split(':', 1)[0]: p_item.split(':', 1)[1] for p_item in parts if ':' in p_item}
-                        for key, val in data.items():
-                            if key.startswith('rawid'):
-                                idx = int(key.replace('rawid', ''))
-                                if idx < 23: raw_signals[idx] = int(float(val))
-                            elif key.startswith('tunedid'):
-                                idx = int(key.replace('tunedid', ''))
-                                if idx < 23: tuned_signals[idx] = int(float(val))
-                            elif key.startswith('ch'):
-                                idx = int(key.replace('ch', '')) - 1
-                                if idx < 16: ch_sent[idx] = val
-                        if 'connected' in data: connected = int(float(data['connected']))
-                        if 'latency_ms' in data: flight_latency_ms = float(data['latency_ms'])
-                        if 'rate_hz' in data: flight_rate_hz = float(data['rate_hz'])
-            except Exception: 
-                pass
-
-        # 3. Stick Preview Logic
-        mapped_preview = [0] * 16
-        for i in range(16):
-            if i == SPLIT_CONFIG["target_ch"]:
-                s = SPLIT_CONFIG
-                p_raw = tuned_signals[s["pos_id"]] if s["pos_id"] < 23 else -32768
-                n_raw = tuned_signals[s["neg_id"]] if s["neg_id"] < 23 else -32768
-                p_tuned = get_tuned_val(p_raw, s["pos_center"], s["pos_reverse"])
-                n_tuned = get_tuned_val(n_raw, s["neg_center"], s["neg_reverse"])
-                mapped_preview[i] = max(-32768, min(32767, p_tuned + n_tuned))
-            else:
-                src_id = CHANNEL_MAPS[i]
-                mapped_preview[i] = tuned_signals[src_id] if src_id < 23 else -32768
-
-        # 4. Rendering
-        screen.blit(bg, (0, 0))
+        # 2. Read Telemetry from C++ Engine (only decodes when the engine published new data)
+        if telemetry.poll(frame):
+            flight_latency_ms, flight_rate_hz, connected = frame.latency_ms, frame.rate_hz, frame.connected
+            TELEMETRY_HISTORY.append(frame)
+            FLIGHT_RECORDER.record(frame)
+            FRAME_SCHEDULER.telemetry_changed(frame)
+        # CRSF link telemetry from the receiver (published by the engine at <= 20 Hz)
+        if CRSF_TELEMETRY.poll():
+            FRAME_SCHEDULER.request("crsf")
+        PROFILER.mark("telemetry")
+
+        # Sidebar still sliding in/out
+        if settings_rect.x != (SCREEN_WIDTH - 190 if settings_visible else SCREEN_WIDTH):
+            FRAME_SCHEDULER.request("anim")
+
+        # 3. Event Handling
+        for event in pygame.event.get():
+            FRAME_SCHEDULER.request("event")
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: 
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                renderer.set_full_frame(not renderer.full_frame)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                PROFILER.set_enabled(not PROFILER.enabled)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_d and PROFILER.enabled:
+                path = f"{PROFILE_DUMP_DIR}/frame_profile_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+                print(f"Profiler: {PROFILER.dump(path)} frames -> {path}")
+            elif event.type == pygame.QUIT:
+                running = False
+        PROFILER.mark("events")
+
+        # 4. Push settled config edits (engine + JSON) once per burst
+        CHANGE_SCHEDULER.poll()
+        PROFILER.mark("sync")
+
+        # Nothing visible changed: skip the frame and just wait for the next tick
+        if not FRAME_SCHEDULER.should_render():
+            FRAME_SCHEDULER.sleep()
+            continue
+
+        # 5. Stick Preview Logic (compiled mapping plan, same semantics as InputMapper::update)
+        mapped_preview = map_preview(tuned_signals)
+        PROFILER.mark("preview")
+
+        # 6. Rendering (only widgets whose content changed are redrawn)
+        renderer.begin()
+        renderer.invalidate(overlay_rect)
         
         # Header Status
-        t_color = (0, 255, 100) if t_lat < 10 else (255, 50, 50)
-        screen.blit(font.render(f"Touch: {t_lat:5.2f}ms  Peak: {peak_latency:4.1f}ms", True, t_color), (16, 14))
-        screen.blit(font.render(f"Flight: {flight_latency_ms:5.2f}ms  Rate: {int(flight_rate_hz)}Hz", True, (100, 180, 255)), (16, 45))
+        # Touch: kernel event -> on screen for the last rendered report, p99 decays over ~10 s
+        t_total = TOUCH_LATENCY.hist["total"]
+        t_color = (0, 255, 100) if t_total.last < 20 else (255, 50, 50)
+        renderer.text("touch", font, f"Touch: {t_total.last:5.2f}ms  p99: {t_total.percentile(0.99):4.1f}ms", t_color, (16, 14))
+        f_color = COLOR_WARN if telemetry.is_stale() else (100, 180, 255)
+        renderer.text("flight", font, f"Flight: {flight_latency_ms:5.2f}ms  Rate: {int(flight_rate_hz)}Hz", f_color, (16, 45))
+        link, batt, att = CRSF_TELEMETRY.link(), CRSF_TELEMETRY.battery(), CRSF_TELEMETRY.attitude()
+        if link:
+            l_color = (0, 255, 100) if link["lq"] >= 70 else COLOR_WARN if link["lq"] >= 30 else COLOR_DANGER
+            renderer.text("link", font, f"Link: LQ {link['lq']:3d}%  RSSI {link['rssi']:4d}dBm", l_color, (440, 14))
+        else:
+            renderer.text("link", font, "Link: LQ --  RSSI --", COLOR_WARN, (440, 14))
+        batt_txt = f"{batt['voltage']:4.1f}V" if batt else "--"
+        att_txt = f"R {att['roll']:6.1f}  P {att['pitch']:6.1f}" if att else "--"
+        renderer.text("batt", font, f"Batt: {batt_txt}  Att: {att_txt}", (100, 180, 255), (440, 45))
 
         # Debug Data Table
         debug_y = 85
-        r_txt = debug_font.render(f"RAW ID  00:{raw_signals[0]:6d} 01:{raw_signals[1]:6d} 02:{raw_signals[2]:6d} 03:{raw_signals[3]:6d}", True, (255, 200, 100))
-        t_txt = debug_font.render(f"TUNED  CH1:{mapped_preview[0]:6d} CH2:{mapped_preview[1]:6d} CH3:{mapped_preview[2]:6d} CH4:{mapped_preview[3]:6d}", True, (100, 255, 100))
-        s_txt = debug_font.render(f"SENT   CH1:{str(ch_sent[0]):>6} CH2:{str(ch_sent[1]):>6} CH3:{str(ch_sent[2]):>6} CH4:{str(ch_sent[3]):>6}", True, (100, 180, 255))
-        screen.blit(r_txt, (SCREEN_WIDTH//2 - r_txt.get_width()//2, debug_y))
-        screen.blit(t_txt, (SCREEN_WIDTH//2 - t_txt.get_width()//2, debug_y + 25))
-        screen.blit(s_txt, (SCREEN_WIDTH//2 - s_txt.get_width()//2, debug_y + 50))
+        renderer.text("raw", debug_font, f"RAW ID  00:{raw_signals[0]:6d} 01:{raw_signals[1]:6d} 02:{raw_signals[2]:6d} 03:{raw_signals[3]:6d}", (255, 200, 100), (0, debug_y), SCREEN_WIDTH//2)
+        renderer.text("tuned", debug_font, f"TUNED  CH1:{mapped_preview[0]:6d} CH2:{mapped_preview[1]:6d} CH3:{mapped_preview[2]:6d} CH4:{mapped_preview[3]:6d}", (100, 255, 100), (0, debug_y + 25), SCREEN_WIDTH//2)
+        renderer.text("sent", debug_font, f"SENT   CH1:{str(ch_sent[0]):>6} CH2:{str(ch_sent[1]):>6} CH3:{str(ch_sent[2]):>6} CH4:{str(ch_sent[3]):>6}", (100, 180, 255), (0, debug_y + 50), SCREEN_WIDTH//2)
 
         # Stick Visualizers
         stick_centers = [(SCREEN_WIDTH//2 - 120, 350, 0, 1, "CH 1/2"), (SCREEN_WIDTH//2 + 120, 350, 2, 3, "CH 3/4")]
         for sx, sy, x_idx, y_idx, label in stick_centers:
-            pygame.draw.circle(screen, (60, 60, 65), (sx, sy), 60, 3)
-            jx = sx + (mapped_preview[x_idx] / 32768.0) * 60
-            jy = sy + (mapped_preview[y_idx] / 32768.0) * 60
-            pygame.draw.circle(screen, (0, 255, 100), (int(jx), int(jy)), 10)
-            lbl = small_font.render(label, True, (120, 120, 130))
-            screen.blit(lbl, (sx - lbl.get_width()//2, sy + 70))
+            jx = int(sx + (mapped_preview[x_idx] / 32768.0) * 60)
+            jy = int(sy + (mapped_preview[y_idx] / 32768.0) * 60)
+            def draw_stick(surf, sx=sx, sy=sy, jx=jx, jy=jy, label=label):
+                area = pygame.draw.circle(surf, (60, 60, 65), (sx, sy), 60, 3)
+                area.union_ip(pygame.draw.circle(surf, (0, 255, 100), (jx, jy), 10))
+                lbl = render_text(small_font, label, (120, 120, 130))
+                return area.union(surf.blit(lbl, (sx - lbl.get_width()//2, sy + 70)))
+            renderer.widget(label, (jx, jy), draw_stick)
 
         # Bottom Icons
-        draw_controller_icon(screen, 20, SCREEN_HEIGHT - 75, connected == 1)
+        renderer.widget("controller", connected == 1, lambda surf: (draw_controller_icon(surf, 20, SCREEN_HEIGHT - 75, connected == 1),
+                                                                    pygame.Rect(20, SCREEN_HEIGHT - 75, 80, 60))[1])
         
         # Gear Button (Uses safe_t_down)
         gear_rect = pygame.Rect(BTN_RECT)
         gear_pressed = safe_t_down and gear_rect.collidepoint(tx, ty)
-        draw_gear_button(screen, gear_rect, gear_pressed)
+        renderer.widget("gear", gear_pressed, lambda surf: (draw_gear_button(surf, gear_rect, gear_pressed), gear_rect)[1])
         
         if gear_pressed and (now - last_nav_time) > 0.4:
             settings_visible = not settings_visible
             last_nav_time = now
             ui_lock_time = now # Shield background when toggling sidebar
 
-        # 5. Settings Sidebar & Sub-Panel Logic
+        # Profiler overlay (state only changes when the summary refreshes)
+        if PROFILER.enabled:
+            renderer.widget("profiler", PROFILER.summary(),
+                            lambda surf: draw_profiler_overlay(surf, (SCREEN_WIDTH - 10, SCREEN_HEIGHT - 10), PROFILER, "bottomright"))
+        else:
+            renderer.widget("profiler", None, lambda surf: pygame.Rect(0, 0, 0, 0))
+        PROFILER.mark("widgets")
+
+        # 7. Settings Sidebar & Sub-Panel Logic
+        overlay_rect = pygame.Rect(0, 0, 0, 0)
         if settings_visible:
             settings_rect.x = max(settings_rect.x - 30, SCREEN_WIDTH - 190)
+
+            # Sidebar and sub-panels repaint everything they cover each frame
+            overlay_rect = settings_rect.clip(screen.get_rect())
+            if active_panel_index != -1 and PANEL_MAP[active_panel_index][1] is not None:
+                overlay_rect.union_ip(pygame.Rect(0, 0, SCREEN_WIDTH - settings_rect.width, SCREEN_HEIGHT))
             
             # Pass safe_t_down to the UI logic
-            new_clicked, settings_changed = draw_settings_panel(
+            new_clicked, _ = draw_settings_panel(
                 screen, settings_rect, safe_t_down, tx, ty, active_panel_index, raw_signals, tuned_signals
             )
             
@@ -208,9 +249,6 @@ try:
             if prev_overlay_active and not curr_overlay_active:
                 ui_lock_time = now # Lock touch for 300ms so background doesn't click
 
-            if settings_changed:
-                sync_to_engine()
-
             if new_clicked != -1 and (now - last_nav_time) > 0.3:
                 if PANEL_MAP[new_clicked][0] == "Back":
                     settings_visible = False
@@ -222,17 +260,16 @@ try:
         else:
             settings_rect.x = min(settings_rect.x + 30, SCREEN_WIDTH)
             active_panel_index = -1
+        PROFILER.mark("panel")
 
-        pygame.display.flip()
-        
-        # 6. Event Handling
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: 
-                running = False
-            elif event.type == pygame.QUIT:
-                running = False
+        renderer.mark(overlay_rect)
+        renderer.present()
+        PROFILER.mark("present")
+        PROFILER.end()
+        TOUCH_LATENCY.record(t_event, t_pub, t_read, time.time())
+        FRAME_SCHEDULER.rendered()
 
-        clock.tick(60)
+        FRAME_SCHEDULER.sleep()
 
 except KeyboardInterrupt:
     print("\nShutting down gracefully...")
@@ -242,5 +279,21 @@ finally:
         p.terminate()
         p.join(timeout=2.0)
     pygame.quit()
-    udp_sock.close()
+    touch.close(unlink=True)
+    if renderer.stats["frames"]:
+        full_px = SCREEN_WIDTH * SCREEN_HEIGHT
+        avg_px = renderer.stats["pixels"] / renderer.stats["frames"]
+        print(f"Render: {renderer.stats['frames']} frames, avg {avg_px:.0f} px pushed/frame ({avg_px / full_px * 100:.1f}% of full)")
+    fs = FRAME_SCHEDULER.stats
+    if fs["ticks"]:
+        print(f"Frames: {fs['rendered']}/{fs['ticks']} rendered, {fs['skipped']} skipped "
+              f"({fs['skipped'] / fs['ticks'] * 100:.1f}%), ~{fs['saved_ms'] / 1000.0:.1f} s render CPU saved "
+              f"(avg {fs['render_ms']:.2f} ms/frame)")
+    FLIGHT_RECORDER.stop()
+    telemetry.close()
+    CRSF_TELEMETRY.close()
+    CHANGE_SCHEDULER.flush()
+    ENGINE_PUSH.flush()
+    SETTINGS_WRITER.flush()
+    CONFIG_SYNC.close()
     sys.exit(0)
\ No newline at end of file
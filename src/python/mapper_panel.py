@@ -4,6 +4,10 @@ import pygame
 import time
 import json
 import os
+from change_scheduler import CHANGE_SCHEDULER
+from settings_writer import SETTINGS_WRITER
+from font_cache import get_font, render_text
+from mapping_plan import MappingPlan
 
 # --- PERSISTENT PATH CONFIG ---
 SETTINGS_FILE = "/home/pi4/rc-flight-controller/src/config/inputmapper.json"
@@ -26,9 +30,12 @@ selector_active_for_ch = -1
 selector_mode = "simple" 
 selector_open_time = 0 
 
+_plan = None            # MappingPlan for the current config, rebuilt lazily after edits
+
 def get_tuned_val(raw_val, is_center, is_reverse):
     """
-    Transforms raw input into 16-bit space with centering and reversal.
+    Transforms raw input into 16-bit space with centering and reversal,
+    exactly like InputMapper::apply_map_transform().
     Clamps result between -32768 and 32767.
     """
     try:
@@ -36,9 +43,9 @@ def get_tuned_val(raw_val, is_center, is_reverse):
     except:
         val = 0
         
-    # Apply 32768 Shift if centering is active (lifting baseline to 0)
+    # Stretch a 0..32767 input (trigger) over the full -32768..32766 range
     if is_center:
-        val = val + 32768
+        val = val * 2 - 32768
     
     # Apply Polarity Flip
     if is_reverse:
@@ -47,17 +54,31 @@ def get_tuned_val(raw_val, is_center, is_reverse):
     # Hard Clamp to prevent overflow/underflow errors in C++ engine
     return max(-32768, min(32767, val))
 
+def invalidate_mapping_plan():
+    global _plan
+    _plan = None
+
+def mapping_plan():
+    """The compiled plan for the current config (only rebuilt after an edit or load)."""
+    global _plan
+    if _plan is None:
+        _plan = MappingPlan(CHANNEL_MAPS, SPLIT_CONFIG)
+    return _plan
+
+def map_preview(signals):
+    """Engine-equivalent channel outputs for the given tuned signals."""
+    return mapping_plan().apply(signals)
+
+def _mapping_changed():
+    invalidate_mapping_plan()
+    CHANGE_SCHEDULER.mark("mapper", "engine")
+
 def save_mapper_settings():
-    """Saves current mapping state to the specified JSON path."""
-    try:
-        os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump({
-                "channel_map": CHANNEL_MAPS, 
-                "split_config": SPLIT_CONFIG
-            }, f, indent=4)
-    except Exception as e:
-        print(f"Save Error: {e}")
+    """Queues a snapshot of the mapping state for the background writer."""
+    SETTINGS_WRITER.submit(SETTINGS_FILE, {
+        "channel_map": CHANNEL_MAPS, 
+        "split_config": SPLIT_CONFIG
+    })
 
 def load_mapper_settings():
     """Loads mapping state from disk on startup."""
@@ -74,6 +95,7 @@ def load_mapper_settings():
                         SPLIT_CONFIG[k] = loaded_split[k]
         except Exception as e:
             print(f"Load Error: {e}")
+    invalidate_mapping_plan()
 
 # Perform initial load on module import
 load_mapper_settings()
@@ -89,13 +111,13 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
         return draw_selector_grid(screen, rect, touch_down, touch_x, touch_y, raw_axes)
 
     # --- STYLES ---
-    title_font = pygame.font.SysFont("monospace", 28, bold=True)
-    font = pygame.font.SysFont("monospace", 20, bold=True)
-    small_font = pygame.font.SysFont("monospace", 15, bold=True)
+    title_font = get_font(28, bold=True)
+    font = get_font(20, bold=True)
+    small_font = get_font(15, bold=True)
 
     # --- TITLE ---
     page_titles = ["Channels 1-8", "Channels 9-16", "Advanced Split Mix"]
-    title = title_font.render(page_titles[current_page], True, (255, 255, 255))
+    title = render_text(title_font, page_titles[current_page], (255, 255, 255))
     screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 20))
 
     # --- PAGES 1 & 2: CHANNEL LIST ---
@@ -107,7 +129,7 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
             is_ovr = (SPLIT_CONFIG["target_ch"] == ch_idx)
             
             # Label
-            lbl = font.render(f"CH{ch_idx+1:02}:", True, (100,100,110) if is_ovr else (200,200,200))
+            lbl = render_text(font, f"CH{ch_idx+1:02}:", (100,100,110) if is_ovr else (200,200,200))
             screen.blit(lbl, (rect.left + 50, y_off))
             
             # Button Box
@@ -115,7 +137,7 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
             pygame.draw.rect(screen, (30,30,35) if is_ovr else (50,52,60), id_box, border_radius=8)
             
             label = "SPLIT ACTIVE" if is_ovr else (f"ID {CHANNEL_MAPS[ch_idx]:02}" if CHANNEL_MAPS[ch_idx] != 22 else "NONE")
-            txt = font.render(label, True, (80,80,90) if is_ovr else (255,255,255))
+            txt = render_text(font, label, (80,80,90) if is_ovr else (255,255,255))
             screen.blit(txt, (id_box.centerx - txt.get_width()//2, id_box.centery - txt.get_height()//2))
 
             if not is_ovr and touch_down and id_box.collidepoint(touch_x, touch_y) and (time.time()-last_interaction_time) > 0.4:
@@ -129,9 +151,9 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
         # Target Channel Selector
         ch_btn = pygame.Rect(rect.left + 40, y_row, 140, 60)
         pygame.draw.rect(screen, (50, 52, 60), ch_btn, border_radius=10)
-        t_label = small_font.render("TARGET CH", True, (150, 150, 150))
+        t_label = render_text(small_font, "TARGET CH", (150, 150, 150))
         screen.blit(t_label, (ch_btn.x, ch_btn.y - 20))
-        ch_txt = font.render("NONE" if SPLIT_CONFIG["target_ch"] == -1 else f"CH {SPLIT_CONFIG['target_ch']+1}", True, (0, 200, 255))
+        ch_txt = render_text(font, "NONE" if SPLIT_CONFIG["target_ch"] == -1 else f"CH {SPLIT_CONFIG['target_ch']+1}", (0, 200, 255))
         screen.blit(ch_txt, (ch_btn.centerx - ch_txt.get_width()//2, ch_btn.centery - ch_txt.get_height()//2))
 
         sides = [
@@ -145,12 +167,12 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
             src_id = SPLIT_CONFIG[f"{s_key}_id"]
             
             # Pull live tuned data for visual feedback
-            raw_v = tuned_signals[src_id] if tuned_signals and src_id < 23 else (raw_axes[src_id] if src_id < 23 else -32768)
+            raw_v = tuned_signals[src_id] if tuned_signals is not None and src_id < 23 else (raw_axes[src_id] if src_id < 23 else -32768)
             tuned_v = get_tuned_val(raw_v, SPLIT_CONFIG[f"{s_key}_center"], SPLIT_CONFIG[f"{s_key}_reverse"])
             
             pygame.draw.rect(screen, (40, 45, 50), btn_rect, border_radius=10)
             pygame.draw.rect(screen, side["color"], btn_rect, 2, border_radius=10)
-            screen.blit(small_font.render(side["label"], True, (200, 200, 200)), (btn_rect.x, btn_rect.y - 20))
+            screen.blit(render_text(small_font, side["label"], (200, 200, 200)), (btn_rect.x, btn_rect.y - 20))
             
             v_txt = font.render(f"ID {src_id:02}: {tuned_v}", True, (255, 255, 255))
             screen.blit(v_txt, (btn_rect.centerx - v_txt.get_width()//2, btn_rect.centery - v_txt.get_height()//2))
@@ -164,12 +186,12 @@ def draw_mapper_panel(screen, rect, touch_down, touch_x, touch_y, raw_axes, tune
                     pygame.draw.line(screen, (0, 255, 100), (cb_rect.x+5, cb_rect.y+12), (cb_rect.x+20, cb_rect.bottom-5), 3)
                     pygame.draw.line(screen, (0, 255, 100), (cb_rect.x+10, cb_rect.bottom-5), (cb_rect.right-5, cb_rect.y+5), 3)
                 
-                lbl = small_font.render(opt.capitalize(), True, (200, 200, 200))
+                lbl = render_text(small_font, opt.capitalize(), (200, 200, 200))
                 screen.blit(lbl, (cb_rect.right + 6, cb_rect.y + 4))
 
                 if touch_down and cb_rect.collidepoint(touch_x, touch_y) and (time.time()-last_interaction_time) > 0.3:
                     SPLIT_CONFIG[full_key] = not SPLIT_CONFIG[full_key]
-                    save_mapper_settings(); was_changed = True; last_interaction_time = time.time()
+                    _mapping_changed(); was_changed = True; last_interaction_time = time.time()
 
             # Click main ID box to change source ID
             if touch_down and btn_rect.collidepoint(touch_x, touch_y) and (time.time()-last_interaction_time) > 0.5:
@@ -200,10 +222,10 @@ def draw_selector_grid(screen, rect, touch_down, touch_x, touch_y, raw_data):
     global selector_active_for_ch, selector_mode, last_interaction_time, selector_open_time, SPLIT_CONFIG, CHANNEL_MAPS
     is_locked = (time.time() - selector_open_time) < 0.5
     overlay = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA); overlay.fill((10, 10, 15, 250)); screen.blit(overlay, (rect.x, rect.y))
-    font = pygame.font.SysFont("monospace", 17, bold=True)
-    title_font = pygame.font.SysFont("monospace", 26, bold=True)
+    font = get_font(17, bold=True)
+    title_font = get_font(26, bold=True)
     
-    msg = title_font.render("Select Channel" if "ch" in selector_mode else "Select Input ID", True, (0, 200, 255))
+    msg = render_text(title_font, "Select Channel" if "ch" in selector_mode else "Select Input ID", (0, 200, 255))
     screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.y + 15))
     
     cols, rows = 5, 5 
@@ -219,7 +241,7 @@ def draw_selector_grid(screen, rect, touch_down, touch_x, touch_y, raw_data):
         pygame.draw.rect(screen, (45, 45, 55), btn_rect, border_radius=6)
         
         label = f"CH {i+1}" if "ch" in selector_mode else f"ID {i:02}"
-        screen.blit(font.render(label, True, (200, 200, 200)), (bx+8, by+5))
+        screen.blit(render_text(font, label, (200, 200, 200)), (bx+8, by+5))
         
         # Show real-time raw values in the selector for easier ID finding
         if "ch" not in selector_mode:
@@ -232,17 +254,17 @@ def draw_selector_grid(screen, rect, touch_down, touch_x, touch_y, raw_data):
             elif selector_mode == "split_ch": SPLIT_CONFIG["target_ch"] = i
             elif selector_mode == "split_pos": SPLIT_CONFIG["pos_id"] = i
             elif selector_mode == "split_neg": SPLIT_CONFIG["neg_id"] = i
-            save_mapper_settings(); selector_active_for_ch = -1; last_interaction_time = time.time(); return True
+            _mapping_changed(); selector_active_for_ch = -1; last_interaction_time = time.time(); return True
 
     # "NONE" Button at the bottom
     none_rect = pygame.Rect(rect.centerx - 75, rect.bottom - 70, 150, 48)
     pygame.draw.rect(screen, (60, 30, 30), none_rect, border_radius=8)
-    screen.blit(font.render("NONE (22)", True, (255, 255, 255)), (none_rect.centerx - 45, none_rect.centery - 10))
+    screen.blit(render_text(font, "NONE (22)", (255, 255, 255)), (none_rect.centerx - 45, none_rect.centery - 10))
     if not is_locked and touch_down and none_rect.collidepoint(touch_x, touch_y):
         if selector_mode == "split_ch": SPLIT_CONFIG["target_ch"] = -1
         elif selector_mode == "split_pos": SPLIT_CONFIG["pos_id"] = 22
         elif selector_mode == "split_neg": SPLIT_CONFIG["neg_id"] = 22
         else: CHANNEL_MAPS[selector_active_for_ch] = 22
-        save_mapper_settings(); selector_active_for_ch = -1; last_interaction_time = time.time(); return True
+        _mapping_changed(); selector_active_for_ch = -1; last_interaction_time = time.time(); return True
 
     return False
@@ -0,0 +1,50 @@
+# mapping_plan.py - CHANNEL_MAPS + SPLIT_CONFIG compiled for fast evaluation (same semantics as cpp/InputMapper.h)
+import numpy as np
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+
+NONE_ID = 22            # mapper source id the engine never drives (always -32768)
+
+
+class MappingPlan:
+    """
+    CHANNEL_MAPS + SPLIT_CONFIG compiled into a gather index, so the per-frame
+    preview is one copy and one np.take instead of a 16-step Python loop.
+    Slots 0-15 gather the channels' sources, 16/17 the split's pos/neg sources.
+    Ids outside 0..22 point at a trailing -32768 sentinel (get_raw_safe()),
+    and centering/reversal become a (mul, add) pair per split side, applied
+    to just those two values.
+    """
+
+    def __init__(self, channel_maps, split_config):
+        s = split_config
+        maps = [int(c) for c in channel_maps[:NUM_CH]]
+        maps += [NONE_ID] * (NUM_CH - len(maps))
+        ids = np.array(maps + [int(s["pos_id"]), int(s["neg_id"])])
+        self.gather = np.where((ids >= 0) & (ids < NUM_SIGNALS), ids, NUM_SIGNALS).astype(np.intp)
+        target = int(s["target_ch"])
+        self.target = target if 0 <= target < NUM_CH else -1
+
+        self.transforms = []
+        for side in ("pos", "neg"):
+            mul, add = (2, -32768) if s[f"{side}_center"] else (1, 0)
+            if s[f"{side}_reverse"]:
+                mul, add = -mul, -add
+            self.transforms.append((mul, add))
+
+        self.padded = np.full(NUM_SIGNALS + 1, -32768, dtype=np.int32)
+        self.values = np.empty(NUM_CH + 2, dtype=np.int32)
+        self.out = self.values[:NUM_CH]
+        self.split_values = self.values[NUM_CH:]
+
+    def apply(self, signals):
+        """16 mapped channels for a 23-entry signal array (reused buffer, valid until the next call)."""
+        v = self.values
+        self.padded[:NUM_SIGNALS] = signals
+        np.take(self.padded, self.gather, out=v)
+        if self.target >= 0:
+            (p_mul, p_add), (n_mul, n_add) = self.transforms
+            p_raw, n_raw = self.split_values.tolist()
+            p = max(-32768, min(32767, p_raw * p_mul + p_add))
+            n = max(-32768, min(32767, n_raw * n_mul + n_add))
+            v[self.target] = max(-32768, min(32767, p + n))
+        return self.out
@@ -15,4 +15,134 @@ def create_gradient_bg(width, height, color_dark, color_light, add_dither=True):
     arr += noise
     arr = np.clip(arr, 0, 255).astype(np.uint8)
     surface = pygame.surfarray.make_surface(arr.swapaxes(0, 1)).convert()
-    return surface
\ No newline at end of file
+    return surface
+
+class DirtyRenderer:
+    """
+    Dirty-rectangle presenter for the main screen.
+    Widgets are drawn through widget(key, state, draw): draw(screen) paints and
+    returns the Rect it covered, and only runs when `state` differs from the
+    previous frame or something damaged its area. The background is restored
+    under the old footprint first, and present() pushes just those rects.
+    Restoring the background also damages the widgets around it: earlier ones
+    this frame that overlap are redrawn underneath (bottom to top), later ones
+    see the area in `damage` and redraw on top, so stacking order is kept.
+    With full_frame=True every widget is drawn over a full bg blit and flipped.
+    """
+
+    def __init__(self, screen, bg, full_frame=False):
+        self.screen = screen
+        self.bg = bg
+        self.full_frame = full_frame
+        self.screen_rect = screen.get_rect()
+        self.widgets = {}         # key -> (state, rect) from the last time it was drawn
+        self.rects = []
+        self.damage = []
+        self.drawn = []           # (key, rect, draw) of every widget handled this frame, in stacking order
+        self.redraw_all = True    # first frame (and after a mode switch) is a full frame
+        self.stats = {"frames": 0, "full_frames": 0, "pixels": 0, "last_pixels": 0, "last_rects": 0}
+
+    def set_full_frame(self, enabled):
+        self.full_frame = enabled
+        self.redraw_all = True
+
+    def begin(self):
+        self.rects, self.damage, self.drawn = [], [], []
+        if self.full_frame or self.redraw_all:
+            self.screen.blit(self.bg, (0, 0))
+
+    def invalidate(self, rect):
+        """Restores the background under rect; widgets overlapping it redraw this frame."""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if not rect.width or not rect.height or self.full_frame or self.redraw_all:
+            return
+        self._restore(rect)
+
+    def mark(self, rect):
+        """Pushes rect this frame without touching its contents (immediate-mode overlays)."""
+        if not (self.full_frame or self.redraw_all):
+            self.rects.append(pygame.Rect(rect))
+
+    def _restore(self, area):
+        """
+        Puts the background back under area. Widgets already handled this frame
+        that overlap it (directly or through each other) are erased with it and
+        redrawn in their original order; everything touched becomes damage.
+        """
+        damaged = [area]
+        hit = []
+        grew = True
+        while grew:
+            grew = False
+            for i, (key, rect, draw) in enumerate(self.drawn):
+                if i not in hit and rect.collidelist(damaged) != -1:
+                    hit.append(i)
+                    damaged.append(rect)
+                    grew = True
+        for r in damaged:
+            self.screen.blit(self.bg, r, r)
+        for i in sorted(hit):
+            key, rect, draw = self.drawn[i]
+            rect = pygame.Rect(draw(self.screen))
+            self.drawn[i] = (key, rect, draw)
+            self.widgets[key] = (self.widgets[key][0], rect)
+            damaged.append(rect)
+        self.damage.extend(damaged)
+        self.rects.extend(damaged)
+
+    def widget(self, key, state, draw):
+        prev = self.widgets.get(key)
+        if self.full_frame or self.redraw_all:
+            rect = pygame.Rect(draw(self.screen))
+            self.widgets[key] = (state, rect)
+            return rect
+        if prev is not None and prev[0] == state and prev[1].collidelist(self.damage) == -1:
+            self.drawn.append((key, prev[1], draw))
+            return prev[1]
+        if prev is not None:
+            self._restore(prev[1])
+        rect = pygame.Rect(draw(self.screen))
+        self.widgets[key] = (state, rect)
+        self.drawn.append((key, rect, draw))
+        # Later widgets overlapping the new pixels redraw on top of them
+        self.damage.append(rect)
+        self.rects.append(rect)
+        return rect
+
+    def text(self, key, font, text, color, pos, center_x=None):
+        """Text widget; the glyphs are only rendered again when text or color change."""
+        def draw(screen):
+            surf = font.render(text, True, color)
+            x = center_x - surf.get_width() // 2 if center_x is not None else pos[0]
+            return screen.blit(surf, (x, pos[1]))
+        return self.widget(key, (text, color), draw)
+
+    def present(self):
+        self.stats["frames"] += 1
+        if self.full_frame or self.redraw_all:
+            pygame.display.flip()
+            self.redraw_all = False
+            self.stats["full_frames"] += 1
+            pixels, n = self.screen_rect.width * self.screen_rect.height, 1
+        else:
+            rects = merge_rects(self.rects, self.screen_rect)
+            if rects:
+                pygame.display.update(rects)
+            pixels, n = sum(r.width * r.height for r in rects), len(rects)
+        self.stats["last_pixels"], self.stats["last_rects"] = pixels, n
+        self.stats["pixels"] += pixels
+
+
+def merge_rects(rects, bounds):
+    """Clips to bounds and merges overlapping rects so no pixel is pushed twice."""
+    out = []
+    for r in rects:
+        r = r.clip(bounds)
+        if not r.width or not r.height:
+            continue
+        i = r.collidelist(out)
+        while i != -1:
+            r = r.union(out.pop(i))
+            i = r.collidelist(out)
+        out.append(r)
+    return out
@@ -0,0 +1,52 @@
+# response_lut.py - compiles TUNING_STATE's curve + rate into the engine's response table (see cpp/response_lut.h)
+import struct
+import zlib
+from functools import lru_cache
+import numpy as np
+from tuning_math import F32, apply_deadzone, curve_magnitude, round_half_away
+
+LUT_POINTS = 2049       # node i sits at |val| = (i / 2048)^2
+LUT_SCALE = F32(LUT_POINTS - 1)
+LUT_HEADER = struct.Struct("<4sHHI")   # "LUT1", points, reserved, crc32 of the table
+LUT_NODES = ((np.arange(LUT_POINTS, dtype=np.float64) / (LUT_POINTS - 1)) ** 2).astype(F32)
+
+
+def lut_key(tuning_state):
+    t = tuning_state
+    return (float(t["global_rate"]), int(t["curve_type"]), float(t["expo"]))
+
+
+@lru_cache(maxsize=16)
+def build_lut(global_rate, curve_type, expo):
+    """
+    Returns (table, crc32, packet); table is a read-only float32 array.
+    Cached on the parameters, so stepping back to a previous value costs nothing.
+    """
+    table = (curve_magnitude(LUT_NODES, curve_type, F32(expo)) * F32(global_rate)).astype("<f4")
+    table.setflags(write=False)
+    payload = table.tobytes()
+    crc = zlib.crc32(payload)
+    return table, crc, LUT_HEADER.pack(b"LUT1", LUT_POINTS, 0, crc) + payload
+
+
+def lut_for_state(tuning_state):
+    return build_lut(*lut_key(tuning_state))
+
+
+def lut_response(table, val):
+    """Vectorized ResponseLUT::response(): same float32 operations as the engine."""
+    val = np.asarray(val, dtype=F32)
+    abs_v = np.abs(val)
+    pos = np.sqrt(abs_v) * LUT_SCALE
+    i = np.minimum(pos.astype(np.int32), LUT_POINTS - 1)
+    nxt = np.minimum(i + 1, LUT_POINTS - 1)
+    out = table[i] + (table[nxt] - table[i]) * (pos - i.astype(F32))
+    out = np.where(i >= LUT_POINTS - 1, table[LUT_POINTS - 1], out)
+    out = np.where(val > 0, out, -out)
+    return np.where(abs_v < F32(0.001), F32(0.0), out).astype(F32)
+
+
+def lut_static_response(table, raw, deadzone):
+    """Settled engine output (cinematic off, low-pass converged) while the table is active."""
+    val = np.clip(lut_response(table, apply_deadzone(raw, deadzone)), F32(-1.0), F32(1.0))
+    return round_half_away(val * F32(32767.0)).astype(np.int32)
@@ -2,48 +2,74 @@
 import pygame
 import time
 from config import *
+from ui_helpers import draw_history_graph, draw_paged_panel, draw_value_rows
+from telemetry_history import TELEMETRY_HISTORY
+from crsf_telemetry import CRSF_TELEMETRY
+from font_cache import get_font, render_text
 
 # Local State
 current_page = 0
 last_interaction_time = 0
 
+GRAPH_SECONDS = 10.0
+GRAPH_COLS = slice(0, 4)  # four columns -> zero-copy view
+GRAPH_COLORS = [(0, 255, 100), (0, 200, 255), (255, 200, 100), (255, 80, 80)]
+VALUE_COLOR = (220, 220, 220)
+
 def draw_sensors_panel(screen, rect, touch_down, touch_x, touch_y):
     global current_page, last_interaction_time
     
-    # Title Rendering
-    title_font = pygame.font.SysFont("monospace", 28, bold=True)
-    title = title_font.render(f"Sensors: Page {current_page + 1}", True, (255, 255, 255))
-    screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 30))
-
-    # Placeholder Content
-    font = pygame.font.SysFont("monospace", 20, bold=True)
-    msg = font.render(f"Sensors settings coming soon...", True, (100, 100, 100))
-    screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.centery))
-
-    # --- NAVIGATION ARROWS ---
-    arrow_w, arrow_h = 60, 45
-    prev_rect = pygame.Rect(rect.centerx - 70, rect.bottom - 70, arrow_w, arrow_h)
-    next_rect = pygame.Rect(rect.centerx + 10, rect.bottom - 70, arrow_w, arrow_h)
-
-    # Draw Back Arrow
-    p_pres = touch_down and prev_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if p_pres else (40, 40, 50), prev_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(prev_rect.centerx+10, prev_rect.centery-10), (prev_rect.centerx-10, prev_rect.centery), (prev_rect.centerx+10, prev_rect.centery+10)])
-    
-    # Draw Next Arrow
-    n_pres = touch_down and next_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if n_pres else (40, 40, 50), next_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(next_rect.centerx-10, next_rect.centery-10), (next_rect.centerx+10, next_rect.centery), (next_rect.centerx-10, next_rect.centery+10)])
-
-    # --- PAGE INDICATOR DOTS ---
-    for i in range(3):
-        dot_x = rect.centerx - 20 + (i * 20)
-        dot_y = rect.bottom - 85
-        color = (255, 255, 255) if i == current_page else (100, 100, 100)
-        pygame.draw.circle(screen, color, (dot_x, dot_y), 4)
+    # Static title/placeholder/arrows come from a cached layer; the graph and link pages are drawn live
+    message = None if current_page in (0, 1) else "Sensors settings coming soon..."
+    p_pres, n_pres = draw_paged_panel(screen, rect, "sensors", f"Sensors: Page {current_page + 1}", current_page,
+                                      touch_down, touch_x, touch_y, message=message)
+
+    if current_page == 0:
+        # Live scrolling graph straight from the telemetry ring buffer
+        graph_rect = pygame.Rect(rect.x + 30, rect.y + 90, rect.width - 60, rect.height - 200)
+        ts, vals = TELEMETRY_HISTORY.window("tuned", GRAPH_SECONDS)
+        draw_history_graph(screen, graph_rect, ts, vals[:, GRAPH_COLS], GRAPH_COLORS, GRAPH_SECONDS, -32768, 32767)
+        lbl = render_text(get_font(14, bold=True), "Stick axes (tuned ID 00-03), last 10 s", (150, 150, 150))
+        screen.blit(lbl, (graph_rect.x, graph_rect.y - 20))
+    elif current_page == 1:
+        draw_link_page(screen, rect)
 
     # Switching Logic (Debounced)
     if (p_pres or n_pres) and (time.time() - last_interaction_time) > 0.25:
         if p_pres: current_page = (current_page - 1) % 3
         if n_pres: current_page = (current_page + 1) % 3
         last_interaction_time = time.time()
+
+def draw_link_page(screen, rect):
+    """Receiver link, attitude and GPS from CRSF telemetry, in two columns; "--" for missing or stale frames."""
+    head_font = get_font(14, bold=True)
+    x0, x1, y = rect.x + 40, rect.x + rect.width // 2 + 10, rect.y + 95
+
+    link = CRSF_TELEMETRY.link()
+    screen.blit(render_text(head_font, "Link", (150, 150, 150)), (x0, y))
+    if link is None:
+        rows = [(label, "--", COLOR_WARN) for label in ("Link quality", "RSSI", "SNR", "RF mode / power")]
+    else:
+        lq_color = COLOR_GOOD if link["lq"] >= 70 else COLOR_WARN if link["lq"] >= 30 else COLOR_DANGER
+        rows = [("Link quality", f"{link['lq']} %", lq_color),
+                ("RSSI", f"{link['rssi']} dBm", VALUE_COLOR),
+                ("SNR", f"{link['snr']} dB", VALUE_COLOR),
+                ("RF mode / power", f"{link['rf_mode']} / {link['tx_power']}", VALUE_COLOR)]
+    draw_value_rows(screen, x0, y + 25, rows, label_width=160)
+
+    att = CRSF_TELEMETRY.attitude()
+    screen.blit(render_text(head_font, "Attitude", (150, 150, 150)), (x1, y))
+    rows = [(k.capitalize(), "--" if att is None else f"{att[k]:6.1f} deg", VALUE_COLOR if att else COLOR_WARN)
+            for k in ("roll", "pitch", "yaw")]
+    draw_value_rows(screen, x1, y + 25, rows, label_width=120)
+
+    gps = CRSF_TELEMETRY.gps()
+    y += 180
+    screen.blit(render_text(head_font, "GPS", (150, 150, 150)), (x0, y))
+    if gps is None:
+        rows = [(label, "--", COLOR_WARN) for label in ("Position", "Speed / altitude", "Satellites")]
+    else:
+        rows = [("Position", f"{gps['lat']:.6f}, {gps['lon']:.6f}", VALUE_COLOR),
+                ("Speed / altitude", f"{gps['speed']:.1f} km/h / {gps['alt']} m", VALUE_COLOR),
+                ("Satellites", f"{gps['sats']}", VALUE_COLOR)]
+    draw_value_rows(screen, x0, y + 25, rows, label_width=160)
@@ -0,0 +1,89 @@
+# settings_writer.py - background, crash-safe JSON persistence for the config files
+import copy
+import json
+import os
+import threading
+import time
+
+
+class SettingsWriter:
+    """
+    submit() snapshots the data and returns immediately; a worker thread writes
+    it to <path>.tmp, fsyncs and renames it over the real file, so a crash or
+    power cut leaves either the old or the new file, never half of one.
+    Several submits for the same path before the worker gets to it collapse
+    into a single write of the newest snapshot.
+    """
+
+    def __init__(self):
+        self.stats = {"submits": 0, "writes": 0, "coalesced": 0, "errors": 0, "last_ms": 0.0, "max_ms": 0.0}
+        self._pending = {}
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, path, data):
+        snapshot = copy.deepcopy(data)
+        with self._cond:
+            if path in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[path] = snapshot
+            self.stats["submits"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout=2.0):
+        """Blocks until everything submitted so far is on disk (used at shutdown)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch, self._pending = self._pending, {}
+                self._busy = True
+            for path, data in batch.items():
+                t0 = time.perf_counter()
+                try:
+                    write_json_atomic(path, data)
+                    ms = (time.perf_counter() - t0) * 1000.0
+                    self.stats["writes"] += 1
+                    self.stats["last_ms"] = ms
+                    self.stats["max_ms"] = max(self.stats["max_ms"], ms)
+                except (OSError, TypeError, ValueError) as e:
+                    self.stats["errors"] += 1
+                    print(f"Save Error: {path}: {e}")
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+def write_json_atomic(path, data):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    # Persist the rename itself
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Shared instance used by the panels' save functions
+SETTINGS_WRITER = SettingsWriter()
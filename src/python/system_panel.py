@@ -1,49 +1,69 @@
-# system_panel.py - Generated Paginated UI Panel
+# system_panel.py - touch latency breakdown + placeholder pages
 import pygame
 import time
+import numpy as np
 from config import *
+from ui_helpers import draw_paged_panel
+from latency_histogram import TOUCH_LATENCY, TOUCH_STAGES
+from font_cache import get_font, render_text
 
 # Local State
 current_page = 0
 last_interaction_time = 0
 
+STAGE_LABELS = {"input": "Kernel -> slot", "ipc": "Slot -> UI", "render": "UI -> screen", "total": "End to end"}
+STAGE_COLORS = {"input": (255, 200, 100), "ipc": (0, 200, 255), "render": (200, 120, 255), "total": (0, 255, 100)}
+HIST_MAX_MS = 50.0
+
 def draw_system_panel(screen, rect, touch_down, touch_x, touch_y):
     global current_page, last_interaction_time
     
-    # Title Rendering
-    title_font = pygame.font.SysFont("monospace", 28, bold=True)
-    title = title_font.render(f"System: Page {current_page + 1}", True, (255, 255, 255))
-    screen.blit(title, (rect.centerx - title.get_width() // 2, rect.y + 30))
-
-    # Placeholder Content
-    font = pygame.font.SysFont("monospace", 20, bold=True)
-    msg = font.render(f"System settings coming soon...", True, (100, 100, 100))
-    screen.blit(msg, (rect.centerx - msg.get_width()//2, rect.centery))
-
-    # --- NAVIGATION ARROWS ---
-    arrow_w, arrow_h = 60, 45
-    prev_rect = pygame.Rect(rect.centerx - 70, rect.bottom - 70, arrow_w, arrow_h)
-    next_rect = pygame.Rect(rect.centerx + 10, rect.bottom - 70, arrow_w, arrow_h)
-
-    # Draw Back Arrow
-    p_pres = touch_down and prev_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if p_pres else (40, 40, 50), prev_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(prev_rect.centerx+10, prev_rect.centery-10), (prev_rect.centerx-10, prev_rect.centery), (prev_rect.centerx+10, prev_rect.centery+10)])
-    
-    # Draw Next Arrow
-    n_pres = touch_down and next_rect.collidepoint(touch_x, touch_y)
-    pygame.draw.rect(screen, (70, 70, 80) if n_pres else (40, 40, 50), next_rect, border_radius=10)
-    pygame.draw.polygon(screen, (255, 255, 255), [(next_rect.centerx-10, next_rect.centery-10), (next_rect.centerx+10, next_rect.centery), (next_rect.centerx-10, next_rect.centery+10)])
-
-    # --- PAGE INDICATOR DOTS ---
-    for i in range(3):
-        dot_x = rect.centerx - 20 + (i * 20)
-        dot_y = rect.bottom - 85
-        color = (255, 255, 255) if i == current_page else (100, 100, 100)
-        pygame.draw.circle(screen, color, (dot_x, dot_y), 4)
+    # Static title/placeholder/arrows come from a cached layer; the latency page is drawn live
+    message = None if current_page == 0 else "System settings coming soon..."
+    p_pres, n_pres = draw_paged_panel(screen, rect, "system", f"System: Page {current_page + 1}", current_page,
+                                      touch_down, touch_x, touch_y, message=message)
+
+    if current_page == 0:
+        draw_latency_page(screen, rect)
 
     # Switching Logic (Debounced)
     if (p_pres or n_pres) and (time.time() - last_interaction_time) > 0.25:
         if p_pres: current_page = (current_page - 1) % 3
         if n_pres: current_page = (current_page + 1) % 3
         last_interaction_time = time.time()
+
+def draw_latency_page(screen, rect):
+    """Touch latency per stage (decaying p50/p95/p99/max) and the end-to-end distribution."""
+    font = get_font(16, bold=True)
+    small_font = get_font(13, bold=True)
+    x0, y = rect.x + 30, rect.y + 85
+    cols = [x0, x0 + 170, x0 + 255, x0 + 340, x0 + 425, x0 + 510]
+
+    for cx, head in zip(cols, ("Touch latency", "p50", "p95", "p99", "max", "samples")):
+        screen.blit(render_text(small_font, head, (150, 150, 150)), (cx, y))
+    y += 24
+    for stage in TOUCH_STAGES:
+        h = TOUCH_LATENCY.hist[stage]
+        screen.blit(render_text(font, STAGE_LABELS[stage], STAGE_COLORS[stage]), (cols[0], y))
+        for cx, ms in zip(cols[1:], h.summary()):
+            screen.blit(font.render(f"{ms:6.2f}", True, (220, 220, 220)), (cx, y))
+        screen.blit(font.render(f"{h.samples}", True, (150, 150, 150)), (cols[5], y))
+        y += 26
+
+    # End-to-end histogram, 0..HIST_MAX_MS in 1 ms columns (recent samples weigh more)
+    graph = pygame.Rect(x0, y + 20, rect.width - 60, rect.bottom - 130 - (y + 20))
+    pygame.draw.rect(screen, (25, 25, 30), graph)
+    h = TOUCH_LATENCY.hist["total"]
+    mids = np.sqrt(h.edges[:-1] * h.edges[1:])
+    bins = np.bincount(np.minimum(mids, HIST_MAX_MS - 1).astype(int), weights=h.counts[1:-1], minlength=int(HIST_MAX_MS))
+    peak = bins.max()
+    if peak > 0.0:
+        bw = graph.width / len(bins)
+        for i, count in enumerate(bins):
+            bh = int(count / peak * (graph.height - 4))
+            if bh:
+                pygame.draw.rect(screen, STAGE_COLORS["total"], (graph.x + int(i * bw), graph.bottom - bh, max(1, int(bw) - 1), bh))
+    for ms in (10, 20, 30, 40):
+        gx = graph.x + int(ms / HIST_MAX_MS * graph.width)
+        pygame.draw.line(screen, (60, 60, 70), (gx, graph.y), (gx, graph.bottom))
+        screen.blit(render_text(small_font, f"{ms}ms", (100, 100, 110)), (gx + 3, graph.y + 2))
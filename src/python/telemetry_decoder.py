@@ -0,0 +1,85 @@
+# telemetry_decoder.py - single in-place decoder for engine telemetry (status line + shm snapshots)
+import time
+import numpy as np
+
+NUM_CH = 16
+NUM_SIGNALS = 23
+
+# Exact key order written by main.cpp; anything else is treated as a torn/partial line
+STATUS_KEYS = (
+    ["latency_ms", "rate_hz", "connected"]
+    + [f"ch{i + 1}" for i in range(NUM_CH)]
+    + [f"tunedid{i}" for i in range(NUM_SIGNALS)]
+    + [f"rawid{i}" for i in range(NUM_SIGNALS)]
+)
+FIELD_COUNT = len(STATUS_KEYS)
+_CH_SLICE = slice(0, NUM_CH)
+_TUNED_SLICE = slice(NUM_CH, NUM_CH + NUM_SIGNALS)
+_RAW_SLICE = slice(NUM_CH + NUM_SIGNALS, NUM_CH + 2 * NUM_SIGNALS)
+_SCRATCH = np.zeros(NUM_CH + 2 * NUM_SIGNALS, dtype=np.int32)
+_COLON_TO_SPACE = str.maketrans(":", " ")
+
+DECODE_STATS = {"decoded": 0, "rejected": 0, "last_ns": 0, "total_ns": 0}
+
+
+class TelemetryFrame:
+    """Preallocated telemetry arrays, filled in place by every decoder/reader."""
+
+    def __init__(self):
+        self.raw = np.zeros(NUM_SIGNALS, dtype=np.int32)
+        self.tuned = np.zeros(NUM_SIGNALS, dtype=np.int32)
+        self.ch = np.zeros(NUM_CH, dtype=np.int32)
+        # latency_ms, rate_hz, connected, timestamp_us
+        self.meta = np.zeros(4, dtype=np.float64)
+
+    @property
+    def latency_ms(self):
+        return float(self.meta[0])
+
+    @property
+    def rate_hz(self):
+        return float(self.meta[1])
+
+    @property
+    def connected(self):
+        return int(self.meta[2])
+
+
+def decode_status_line(line, frame):
+    """
+    Parses one engine status line into `frame` without building dicts.
+    Rejects lines that are empty, not newline-terminated (half-written) or out of order.
+    Returns True on success; frame is left untouched on rejection.
+    """
+    t0 = time.perf_counter_ns()
+    ok = False
+    if line and line[-1] == "\n":
+        parts = line.translate(_COLON_TO_SPACE).split()
+        if len(parts) == FIELD_COUNT * 2 and parts[0::2] == STATUS_KEYS:
+            vals = parts[1::2]
+            try:
+                latency, rate, conn = float(vals[0]), float(vals[1]), int(vals[2])
+                _SCRATCH[:] = vals[3:]
+            except ValueError:
+                pass
+            else:
+                np.copyto(frame.ch, _SCRATCH[_CH_SLICE])
+                np.copyto(frame.tuned, _SCRATCH[_TUNED_SLICE])
+                np.copyto(frame.raw, _SCRATCH[_RAW_SLICE])
+                frame.meta[0], frame.meta[1], frame.meta[2] = latency, rate, conn
+                ok = True
+
+    dt = time.perf_counter_ns() - t0
+    DECODE_STATS["last_ns"] = dt
+    DECODE_STATS["total_ns"] += dt
+    DECODE_STATS["decoded" if ok else "rejected"] += 1
+    return ok
+
+
+def read_status_file(path, frame):
+    """Reads and decodes the --status-file debug output. Returns True if frame was updated."""
+    try:
+        with open(path, "r") as f:
+            return decode_status_line(f.read(), frame)
+    except OSError:
+        return False
@@ -0,0 +1,62 @@
+# telemetry_history.py - fixed-memory NumPy ring buffer of recent telemetry for live graphs
+import time
+import numpy as np
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+
+ENGINE_PUBLISH_HZ = 50  # main.cpp publishes every 20 ms
+
+
+class TelemetryHistory:
+    """
+    Keeps the last `capacity` telemetry frames. Every sample is written twice
+    (at i and i + capacity) so the most recent N samples are always one
+    contiguous slice: reads are zero-copy views and append is O(1).
+    """
+
+    def __init__(self, seconds=10.0, rate_hz=ENGINE_PUBLISH_HZ):
+        self.capacity = int(seconds * rate_hz)
+        size = self.capacity * 2
+        self.t = np.zeros(size, dtype=np.float64)
+        self.raw = np.zeros((size, NUM_SIGNALS), dtype=np.int32)
+        self.tuned = np.zeros((size, NUM_SIGNALS), dtype=np.int32)
+        self.ch = np.zeros((size, NUM_CH), dtype=np.int32)
+        self.meta = np.zeros((size, 4), dtype=np.float64)
+        self.head = 0   # next write position in [0, capacity)
+        self.count = 0
+
+    def append(self, frame, t=None):
+        """Copies one TelemetryFrame into the ring."""
+        if t is None:
+            t = time.monotonic()
+        i, j = self.head, self.head + self.capacity
+        self.t[i] = self.t[j] = t
+        self.raw[i] = self.raw[j] = frame.raw
+        self.tuned[i] = self.tuned[j] = frame.tuned
+        self.ch[i] = self.ch[j] = frame.ch
+        self.meta[i] = self.meta[j] = frame.meta
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _span(self, n):
+        n = self.count if n is None else min(n, self.count)
+        end = self.head + self.capacity
+        return slice(end - n, end)
+
+    def last(self, field, n=None):
+        """Oldest-to-newest view of the last n samples of 'raw', 'tuned', 'ch', 'meta' or 't'."""
+        return getattr(self, field)[self._span(n)]
+
+    def window(self, field, seconds):
+        """View of samples newer than `seconds` ago, plus the matching timestamps."""
+        ts = self.last("t")
+        start = np.searchsorted(ts, ts[-1] - seconds) if len(ts) else 0
+        n = len(ts) - start
+        return self.last("t", n), self.last(field, n)
+
+    def clear(self):
+        self.head = self.count = 0
+
+
+# Shared instance fed by main.py, read by graphing panels
+TELEMETRY_HISTORY = TelemetryHistory()
@@ -0,0 +1,169 @@
+# telemetry_shm.py - seqlock-protected shared-memory telemetry reader (see cpp/telemetry_shm.h)
+import mmap
+import os
+import numpy as np
+from telemetry_decoder import NUM_CH, NUM_SIGNALS
+
+SHM_PATH = "/dev/shm/flight_telemetry"
+MAGIC = 0x4C455446  # "FTEL"
+VERSION = 1
+
+# Byte offsets into the segment; must match struct TelemetryBlock in C++
+OFF_MAGIC, OFF_VERSION, OFF_SEQ, OFF_CONNECTED = 0, 4, 8, 12
+OFF_TIMESTAMP_US = 16
+OFF_LATENCY, OFF_RATE = 24, 28
+OFF_CH, OFF_TUNED, OFF_RAW = 32, 96, 188
+BLOCK_SIZE = 280
+
+
+class TelemetryShm:
+    """
+    Maps the engine's telemetry segment read-only.
+    `views` are zero-copy numpy windows onto the live segment (may tear);
+    read_into() copies a consistent snapshot into a TelemetryFrame.
+    """
+
+    def __init__(self, path=SHM_PATH):
+        self.path = path
+        self.mm = None
+        self.last_seq = 0
+        self.torn_reads = 0
+        self._scratch = (np.zeros(NUM_CH, dtype=np.int32), np.zeros(NUM_SIGNALS, dtype=np.int32),
+                         np.zeros(NUM_SIGNALS, dtype=np.int32), np.zeros(4, dtype=np.float64))
+
+    def open(self):
+        """Returns True once the segment exists and carries a valid header."""
+        if self.mm is not None:
+            return True
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return False
+        try:
+            if os.fstat(fd).st_size < BLOCK_SIZE:
+                return False
+            self.mm = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ)
+        except (OSError, ValueError):
+            return False
+        finally:
+            os.close(fd)
+
+        buf = memoryview(self.mm)
+        self._u32 = np.frombuffer(buf, dtype="<u4", count=4, offset=0)
+        self._ts = np.frombuffer(buf, dtype="<u8", count=1, offset=OFF_TIMESTAMP_US)
+        self._f32 = np.frombuffer(buf, dtype="<f4", count=2, offset=OFF_LATENCY)
+        self._ch = np.frombuffer(buf, dtype="<i4", count=NUM_CH, offset=OFF_CH)
+        self._tuned = np.frombuffer(buf, dtype="<i4", count=NUM_SIGNALS, offset=OFF_TUNED)
+        self._raw = np.frombuffer(buf, dtype="<i4", count=NUM_SIGNALS, offset=OFF_RAW)
+
+        if self._u32[0] != MAGIC or self._u32[1] != VERSION:
+            self.close()
+            return False
+        return True
+
+    def close(self):
+        if self.mm is not None:
+            # Drop the numpy views first, mmap.close() refuses while exports exist
+            self._u32 = self._ts = self._f32 = self._ch = self._tuned = self._raw = None
+            try:
+                self.mm.close()
+            except BufferError:
+                pass
+            self.mm = None
+
+    @property
+    def views(self):
+        return {"raw": self._raw, "tuned": self._tuned, "ch": self._ch}
+
+    def sequence(self):
+        return int(self._u32[2]) if self.mm is not None else 0
+
+    def read_into(self, frame, retries=4):
+        """
+        Copies the latest snapshot into a TelemetryFrame's preallocated arrays.
+        The block is copied into private scratch first and only reaches the
+        frame once the second seq read proves it untorn, so a failed read
+        leaves the frame exactly as it was.
+        Returns True if a new, untorn snapshot was copied.
+        """
+        if self.mm is None:
+            return False
+        s_ch, s_tuned, s_raw, s_meta = self._scratch
+        for _ in range(retries):
+            seq = int(self._u32[2])
+            if seq & 1:
+                # Publish in progress (a few us); the next poll picks it up instead of spinning here
+                return False
+            if seq == self.last_seq:
+                return False
+            np.copyto(s_raw, self._raw)
+            np.copyto(s_tuned, self._tuned)
+            np.copyto(s_ch, self._ch)
+            s_meta[0] = self._f32[0]
+            s_meta[1] = self._f32[1]
+            s_meta[2] = self._u32[3]
+            s_meta[3] = self._ts[0]
+            if int(self._u32[2]) == seq:
+                self.last_seq = seq
+                np.copyto(frame.raw, s_raw)
+                np.copyto(frame.tuned, s_tuned)
+                np.copyto(frame.ch, s_ch)
+                np.copyto(frame.meta, s_meta)
+                return True
+            self.torn_reads += 1
+        return False
+
+
+class TelemetryShmWriter:
+    """
+    Engine side of the segment, for stand-ins for main.cpp (engine_sim.py).
+    Same layout and seqlock protocol as TelemetryShm::publish() in C++.
+    """
+
+    def __init__(self, path=SHM_PATH):
+        self.path = path
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, BLOCK_SIZE)
+            self.mm = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        self.mm[:] = bytes(BLOCK_SIZE)
+
+        buf = memoryview(self.mm)
+        self._u32 = np.frombuffer(buf, dtype="<u4", count=4, offset=0)
+        self._ts = np.frombuffer(buf, dtype="<u8", count=1, offset=OFF_TIMESTAMP_US)
+        self._f32 = np.frombuffer(buf, dtype="<f4", count=2, offset=OFF_LATENCY)
+        self._ch = np.frombuffer(buf, dtype="<i4", count=NUM_CH, offset=OFF_CH)
+        self._tuned = np.frombuffer(buf, dtype="<i4", count=NUM_SIGNALS, offset=OFF_TUNED)
+        self._raw = np.frombuffer(buf, dtype="<i4", count=NUM_SIGNALS, offset=OFF_RAW)
+        self._u32[1] = VERSION
+        self._u32[0] = MAGIC
+        self.seq = 0
+
+    def publish(self, timestamp_us, latency_ms, rate_hz, connected, ch, tuned, raw):
+        s = self.seq
+        self._u32[2] = (s + 1) & 0xFFFFFFFF      # odd: write in progress
+        self._u32[3] = 1 if connected else 0
+        self._ts[0] = timestamp_us
+        self._f32[0] = latency_ms
+        self._f32[1] = rate_hz
+        self._ch[:] = ch
+        self._tuned[:] = tuned
+        self._raw[:] = raw
+        self.seq = (s + 2) & 0xFFFFFFFF
+        self._u32[2] = self.seq
+
+    def close(self, unlink=False):
+        if self.mm is not None:
+            self._u32 = self._ts = self._f32 = self._ch = self._tuned = self._raw = None
+            try:
+                self.mm.close()
+            except BufferError:
+                pass
+            self.mm = None
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
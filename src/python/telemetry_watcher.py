@@ -0,0 +1,75 @@
+# telemetry_watcher.py - change-driven telemetry reads (shm sequence or status-file stat signature)
+import os
+import time
+from telemetry_shm import TelemetryShm
+from telemetry_decoder import read_status_file
+
+STATUS_FILE = '/tmp/flight_status.txt'
+
+
+class TelemetryWatcher:
+    """
+    Only decodes when the engine actually published something new.
+    Shared memory is preferred: its sequence counter is checked without copying.
+    In --status-file debug mode the file's (mtime_ns, inode, size) is compared
+    with a single stat() instead of opening and parsing it every frame.
+    """
+
+    def __init__(self, status_path=STATUS_FILE, reopen_interval=1.0):
+        self.shm = TelemetryShm()
+        self.status_path = status_path
+        self.reopen_interval = reopen_interval
+        self.last_open_attempt = 0.0
+        self.last_sig = None
+        self.last_update = 0.0
+        self.stats = {"polls": 0, "decodes": 0, "skipped": 0, "failed": 0}
+
+    @property
+    def source(self):
+        return "shm" if self.shm.mm is not None else "file"
+
+    def poll(self, frame):
+        """Returns True if frame was refreshed with new telemetry."""
+        now = time.monotonic()
+        self.stats["polls"] += 1
+
+        if self.shm.mm is None and now - self.last_open_attempt > self.reopen_interval:
+            self.last_open_attempt = now
+            self.shm.open()
+
+        if self.shm.mm is not None:
+            seq = self.shm.sequence()
+            if seq == self.shm.last_seq or seq & 1:
+                self.stats["skipped"] += 1
+                return False
+            updated = self.shm.read_into(frame)
+        else:
+            try:
+                st = os.stat(self.status_path)
+            except OSError:
+                return False
+            sig = (st.st_mtime_ns, st.st_ino, st.st_size)
+            if sig == self.last_sig:
+                self.stats["skipped"] += 1
+                return False
+            updated = read_status_file(self.status_path, frame)
+            # A torn line keeps the old signature so the next poll retries it
+            if updated:
+                self.last_sig = sig
+
+        if updated:
+            self.stats["decodes"] += 1
+            self.last_update = now
+        else:
+            self.stats["failed"] += 1
+        return updated
+
+    def age(self):
+        """Seconds since the last successful decode (inf before the first one)."""
+        return time.monotonic() - self.last_update if self.last_update else float("inf")
+
+    def is_stale(self, max_age=0.25):
+        return self.age() > max_age
+
+    def close(self):
+        self.shm.close()
@@ -0,0 +1,153 @@
+# touch_discovery.py - inotify-driven /dev/input hotplug + cached touchscreen fingerprints
+import ctypes
+import ctypes.util
+import json
+import os
+import struct
+from evdev import InputDevice, ecodes, list_devices
+from settings_writer import SETTINGS_WRITER
+
+INPUT_DIR = "/dev/input"
+FINGERPRINT_FILE = "/home/pi4/rc-flight-controller/src/config/touch_devices.json"
+
+HIGH_PRIORITY_KEYWORDS = ["biqu", "btt", "hdmi7", "hdmi5", "bi-qu", "bigtreetech", "usb touchscreen", "generic touch", "usb touch", "hid-compliant", "hid compliant"]
+EXCLUDE_KEYWORDS = ["sony", "controller", "wireless", "ps", "dual", "gamepad", "xbox", "joy", "mouse", "keyboard"]
+
+# linux/inotify.h
+IN_ATTRIB, IN_CREATE, IN_DELETE = 0x004, 0x100, 0x200
+IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class InputDirWatcher:
+    """
+    inotify on /dev/input: fd can sit in the touch reader's epoll set, so the
+    process sleeps until udev creates, re-permissions or removes a node.
+    fd is None when inotify isn't available; callers fall back to timed rescans.
+    """
+
+    def __init__(self, directory=INPUT_DIR):
+        self.directory = directory
+        self.fd = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            if libc.inotify_add_watch(fd, directory.encode(), IN_CREATE | IN_ATTRIB | IN_DELETE) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+            self.fd = fd
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}) - falling back to periodic touch scans")
+
+    def read(self):
+        """Returns [(path, mask)] for eventN nodes; [] if nothing is queued."""
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return []
+        out = []
+        pos = 0
+        while pos + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, name_len = _INOTIFY_EVENT.unpack_from(data, pos)
+            pos += _INOTIFY_EVENT.size
+            name = data[pos:pos + name_len].rstrip(b"\0").decode(errors="replace")
+            pos += name_len
+            if name.startswith("event"):
+                out.append((os.path.join(self.directory, name), mask))
+        return out
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class TouchFinder:
+    """
+    Picks the touchscreen among the input devices. A device is identified by
+    its fingerprint (name, phys, bus/vendor/product/version - all read with the
+    open), and the verdict of the slow part - capabilities() and absinfo - is
+    cached per fingerprint and persisted, so a known panel (or a known
+    non-touch device) that is replugged is accepted without re-querying it.
+    """
+
+    def __init__(self, cache_path=FINGERPRINT_FILE):
+        self.cache_path = cache_path
+        self.cache = {}
+        self.stats = {"probes": 0, "cache_hits": 0, "caps_queries": 0}
+        try:
+            with open(cache_path) as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def fingerprint(dev):
+        i = dev.info
+        return f"{dev.name}|{dev.phys}|{i.bustype:04x}:{i.vendor:04x}:{i.product:04x}:{i.version:04x}"
+
+    def probe(self, path):
+        """
+        Opens one node and returns (dev, rank, max_x, max_y) if it is a touchscreen,
+        else None. rank sorts high-priority names first, then MT, then BTN_TOUCH.
+        """
+        self.stats["probes"] += 1
+        try:
+            dev = InputDevice(path)
+        except OSError:
+            return None   # not there yet / udev hasn't granted access (IN_ATTRIB follows)
+        name_lower = dev.name.lower()
+        if any(kw in name_lower for kw in EXCLUDE_KEYWORDS):
+            dev.close()
+            return None
+
+        key = self.fingerprint(dev)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.stats["cache_hits"] += 1
+        else:
+            try:
+                entry = self.query(dev)
+            except OSError:
+                dev.close()
+                return None
+            self.cache[key] = entry
+            SETTINGS_WRITER.submit(self.cache_path, self.cache)
+
+        if not (entry["mt"] or entry["btn"]):
+            dev.close()
+            return None
+        priority = any(kw in name_lower for kw in HIGH_PRIORITY_KEYWORDS)
+        return dev, (priority, entry["mt"], entry["btn"]), entry["max_x"], entry["max_y"]
+
+    def query(self, dev):
+        self.stats["caps_queries"] += 1
+        caps = dev.capabilities()
+        entry = {"mt": ecodes.ABS_MT_POSITION_X in caps.get(ecodes.EV_ABS, []),
+                 "btn": ecodes.BTN_TOUCH in caps.get(ecodes.EV_KEY, []),
+                 "max_x": 4095, "max_y": 4095}
+        if entry["mt"]:
+            info_x = dev.absinfo(ecodes.ABS_MT_POSITION_X)
+            info_y = dev.absinfo(ecodes.ABS_MT_POSITION_Y)
+            entry["max_x"] = info_x.max if info_x and info_x.max > 0 else 4095
+            entry["max_y"] = info_y.max if info_y and info_y.max > 0 else 4095
+        return entry
+
+    def scan(self, paths=None):
+        """Best touchscreen among `paths` (default: every input device) as probe() returns it, or None."""
+        best = None
+        for path in (list_devices() if paths is None else paths):
+            found = self.probe(path)
+            if found is None:
+                continue
+            if best is None or found[1] > best[1]:
+                if best is not None:
+                    best[0].close()
+                best = found
+                if found[1][0]:
+                    break   # a high-priority name wins outright, like the old scan
+            else:
+                found[0].close()
+        return best
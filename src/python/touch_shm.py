@@ -0,0 +1,124 @@
+# touch_shm.py - latest-state touch slot + press/release edge ring shared by logic_process and main.py
+import mmap
+import os
+import struct
+import time
+
+TOUCH_SHM_PATH = "/dev/shm/ui_touch"
+MAGIC = 0x48435554  # "TUCH"
+
+# Header: magic, seq (seqlock), latency_ms, down, x, y, edge_head, reserved, t_event, t_publish
+HEADER = struct.Struct("<IIfiiiIIdd")
+OFF_SEQ = 4
+OFF_STATE = 8
+STATE = struct.Struct("<fiii")
+OFF_EDGE_HEAD = 24
+OFF_TIMES = 32
+TIMES = struct.Struct("<dd")   # kernel event time, publish time (time.time() clock)
+# Edge ring: down, x, y, index (the edge number the slot was written for), t_event, t_publish
+EDGE = struct.Struct("<iiiIdd")
+EDGE_SLOTS = 32
+OFF_EDGES = HEADER.size
+BLOCK_SIZE = OFF_EDGES + EDGE_SLOTS * EDGE.size
+_U32 = struct.Struct("<I")
+
+
+class TouchSlot:
+    """
+    Single-writer / single-reader touch state in a small /dev/shm segment.
+    The touch process overwrites the latest (latency, down, x, y, times) in place under
+    a sequence counter; main.py reads it without locks or pickling. Every
+    down/up transition is also appended to a ring so a tap that starts and ends
+    between two UI frames still reaches the panels. main.py creates the
+    segment, logic_process attaches to it by path.
+    """
+
+    def __init__(self, path=TOUCH_SHM_PATH, create=False):
+        self.path = path
+        flags = os.O_RDWR | (os.O_CREAT | os.O_TRUNC if create else 0)
+        fd = os.open(path, flags, 0o600)
+        try:
+            if create:
+                os.ftruncate(fd, BLOCK_SIZE)
+            self.mm = mmap.mmap(fd, BLOCK_SIZE, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        if create:
+            HEADER.pack_into(self.mm, 0, MAGIC, 0, 0.0, 0, 0, 0, 0, 0, 0.0, 0.0)
+        elif _U32.unpack_from(self.mm, 0)[0] != MAGIC:
+            self.mm.close()
+            raise ValueError(f"{path}: not a touch segment")
+        # Writer side
+        self.seq = _U32.unpack_from(self.mm, OFF_SEQ)[0]
+        self.edge_head = _U32.unpack_from(self.mm, OFF_EDGE_HEAD)[0]
+        self.last_down = False
+        # Reader side
+        self.edge_tail = self.edge_head
+        self.stats = {"publishes": 0, "reads": 0, "torn": 0, "edges": 0, "dropped": 0}
+
+    # --- WRITER (logic_process) ---
+    def publish(self, latency_ms, down, x, y, t_event=0.0):
+        """
+        Overwrites the latest state; a change of `down` is also queued as an edge.
+        t_event is the kernel timestamp of the report (0 = synthetic, e.g. device lost).
+        """
+        down = bool(down)
+        t_publish = time.time()
+        if down != self.last_down:
+            self.last_down = down
+            EDGE.pack_into(self.mm, OFF_EDGES + (self.edge_head % EDGE_SLOTS) * EDGE.size,
+                           down, x, y, self.edge_head, t_event, t_publish)
+            self.edge_head = (self.edge_head + 1) & 0xFFFFFFFF
+            _U32.pack_into(self.mm, OFF_EDGE_HEAD, self.edge_head)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        _U32.pack_into(self.mm, OFF_SEQ, self.seq)           # odd: write in progress
+        STATE.pack_into(self.mm, OFF_STATE, latency_ms, down, x, y)
+        TIMES.pack_into(self.mm, OFF_TIMES, t_event, t_publish)
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        _U32.pack_into(self.mm, OFF_SEQ, self.seq)
+        self.stats["publishes"] += 1
+
+    # --- READER (main.py) ---
+    def read(self, retries=4):
+        """Returns (latency_ms, down, x, y, t_event, t_publish), or None if no untorn copy could be taken."""
+        mm = self.mm
+        for _ in range(retries):
+            seq = _U32.unpack_from(mm, OFF_SEQ)[0]
+            if seq & 1:
+                continue
+            lat, down, x, y = STATE.unpack_from(mm, OFF_STATE)
+            t_event, t_publish = TIMES.unpack_from(mm, OFF_TIMES)
+            if _U32.unpack_from(mm, OFF_SEQ)[0] == seq:
+                self.stats["reads"] += 1
+                return lat, bool(down), x, y, t_event, t_publish
+            self.stats["torn"] += 1
+        return None
+
+    def pop_edge(self):
+        """Oldest unread (down, x, y, t_event, t_publish) transition, or None. Edges overwritten by a lapping writer are counted as dropped."""
+        mm = self.mm
+        while True:
+            head = _U32.unpack_from(mm, OFF_EDGE_HEAD)[0]
+            if head == self.edge_tail:
+                return None
+            if (head - self.edge_tail) & 0xFFFFFFFF > EDGE_SLOTS:
+                lost = ((head - self.edge_tail) & 0xFFFFFFFF) - EDGE_SLOTS
+                self.stats["dropped"] += lost
+                self.edge_tail = (self.edge_tail + lost) & 0xFFFFFFFF
+            down, x, y, index, t_event, t_publish = EDGE.unpack_from(mm, OFF_EDGES + (self.edge_tail % EDGE_SLOTS) * EDGE.size)
+            self.edge_tail = (self.edge_tail + 1) & 0xFFFFFFFF
+            if index != (self.edge_tail - 1) & 0xFFFFFFFF:
+                self.stats["dropped"] += 1
+                continue
+            self.stats["edges"] += 1
+            return bool(down), x, y, t_event, t_publish
+
+    def close(self, unlink=False):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if unlink:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
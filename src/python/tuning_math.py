@@ -0,0 +1,183 @@
+# tuning_math.py - vectorized NumPy port of cpp/input_tuning.h (apply_curve / apply_tuning)
+#
+# Arithmetic is done in float32 exactly where the C++ uses float, and in float64
+# where C++ promotes to double (std::pow(float, int), M_PI * float, std::cos).
+# Engine int16 outputs match bit-for-bit. The float curve output does too, except
+# where glibc powf/expf is involved (STANDARD with expo < 0, EXTREME): there it
+# can be an ulp off, a few ulps right next to zero for EXTREME (see _libm_f32).
+# Keep this file in step with input_tuning.h; check_tuning_parity.py compares the two.
+import numpy as np
+
+F32 = np.float32
+F64 = np.float64
+_ZERO, _ONE, _HALF, _TEN = F32(0.0), F32(1.0), F32(0.5), F32(10.0)
+_FULL_SCALE = F32(32767.0)
+
+CURVE_LINEAR, CURVE_STANDARD, CURVE_DYNAMIC, CURVE_EXTREME = 0, 1, 2, 3
+ENGINE_DT = 0.001       # main.cpp runs apply_tuning at 1 kHz
+AUX_DEADZONE = 0.05     # main.cpp hardcodes this for axes 4 and 5 (triggers)
+
+
+def _clampf(x, lo, hi):
+    return F32(min(max(F32(x), F32(lo)), F32(hi)))
+
+
+def _libm_f32(fn, *args):
+    """
+    powf/expf equivalent: evaluate in double and round once to float32.
+    NumPy's own float32 SIMD kernels can be 1 ulp off glibc, which the
+    (exp - 1) cancellation in the EXTREME curve amplifies into visible error.
+    """
+    return fn(*(np.asarray(a, dtype=F64) for a in args)).astype(F32)
+
+
+def round_half_away(x):
+    """std::round semantics (half away from zero); np.round rounds half to even."""
+    x = np.asarray(x, dtype=F64)
+    return np.trunc(x + np.copysign(0.5, x))
+
+
+def curve_magnitude(abs_v, curve_type, expo):
+    """The curve itself on |val| (no sign, no 0.001 cutoff); response_lut samples this."""
+    abs_v = np.asarray(abs_v, dtype=F32)
+
+    if curve_type == CURVE_STANDARD:
+        k = _clampf(F32(expo) / _TEN, -1.0, 1.0)
+        if k >= 0:
+            # k * std::pow(abs_v, 3) is evaluated in double, (1 - k) * abs_v in float
+            return (F64(k) * abs_v.astype(F64) ** 3 + ((_ONE - k) * abs_v).astype(F64)).astype(F32)
+        return _libm_f32(np.power, abs_v, _ONE / (_ONE - k))
+    if curve_type == CURVE_DYNAMIC:
+        k = _clampf(F32(expo) / _TEN, 0.0, 1.0)
+        s_curve = 0.5 - 0.5 * np.cos(np.pi * abs_v.astype(F64))
+        return (((_ONE - k) * abs_v).astype(F64) + F64(k) * s_curve).astype(F32)
+    if curve_type == CURVE_EXTREME:
+        k = _clampf(F32(expo) / _TEN, -5.0, 5.0)
+        if abs(k) < F32(0.01):
+            return abs_v
+        return (_libm_f32(np.exp, k * abs_v) - _ONE) / (_libm_f32(np.exp, k) - _ONE)
+    return abs_v
+
+
+def apply_curve(val, curve_type, expo):
+    """apply_curve() over an array of normalized stick values (float32 in, float32 out)."""
+    val = np.asarray(val, dtype=F32)
+    abs_v = np.abs(val)
+    out = curve_magnitude(abs_v, curve_type, expo)
+    out = np.where(val > 0, out, -out).astype(F32)
+    out[abs_v < F32(0.001)] = _ZERO
+    return out
+
+
+def apply_deadzone(raw, deadzone):
+    """Steps 1-2 of apply_tuning: normalize -> deadzone. Returns float32."""
+    val = np.asarray(raw).astype(F32) / _FULL_SCALE
+    dz = np.asarray(deadzone, dtype=F32)
+    abs_val = np.abs(val)
+    sign = np.where(val > 0, _ONE, F32(-1.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(abs_val < dz, _ZERO, sign * (abs_val - dz) / (_ONE - dz)).astype(F32)
+
+
+def shape_input(raw, deadzone, sens, curve_type, expo):
+    """
+    Stateless part of apply_tuning: normalize -> deadzone -> curve -> rate.
+    raw may be any int array; returns float32 (not yet clamped).
+    """
+    return apply_curve(apply_deadzone(raw, deadzone), curve_type, expo) * F32(sens)
+
+
+def static_response(raw, deadzone, sens, curve_type, expo):
+    """Settled output (cinematic off, low-pass converged) as engine int16 values."""
+    val = np.clip(shape_input(raw, deadzone, sens, curve_type, expo), F32(-1.0), _ONE)
+    return round_half_away(val * _FULL_SCALE).astype(np.int32)
+
+
+class TuningState:
+    """Per-axis persistence mirrored from main.cpp: prev_vals, cine_vel, cine_pos."""
+
+    def __init__(self, axes):
+        self.prev = np.zeros(axes, dtype=np.int16)
+        self.vel = np.zeros(axes, dtype=F32)
+        self.pos = np.zeros(axes, dtype=F32)
+
+
+def apply_tuning_series(raw, deadzone, sens, lowpass_alpha, curve_type, expo,
+                        cine_on, cine_speed, cine_accel, dt=ENGINE_DT, state=None):
+    """
+    Runs apply_tuning over a time series. raw has shape (T,) or (T, axes);
+    deadzone may be a scalar or a per-axis array. The stateless stages are
+    evaluated for the whole series at once; only cinematic/low-pass step in time.
+    Returns (int32 output with raw's shape, TuningState).
+    """
+    raw = np.asarray(raw)
+    shaped = shape_input(raw.reshape(len(raw), -1), deadzone, sens, curve_type, expo)
+    out, state = finish_tuning_series(shaped, lowpass_alpha, cine_on, cine_speed, cine_accel, dt, state)
+    return out.reshape(raw.shape), state
+
+
+def finish_tuning_series(shaped, lowpass_alpha, cine_on, cine_speed, cine_accel, dt=ENGINE_DT, state=None):
+    """
+    finish_tuning() over shaped values of shape (T, axes), from shape_input()
+    or response_lut.lut_response(). Returns (int32 (T, axes), TuningState).
+    """
+    if state is None:
+        state = TuningState(shaped.shape[1])
+    out = np.empty(shaped.shape, dtype=np.int32)
+
+    alpha = F32(lowpass_alpha)
+    dt = F32(dt)
+    accel_rate = F32(cine_accel) * _HALF
+    dampening = _ONE + (_TEN - F32(cine_speed)) * _HALF
+    step = accel_rate * dt
+    lo, hi = F32(-1.0), _ONE
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for t in range(len(shaped)):
+            val = shaped[t]
+            if cine_on:
+                dist_vec = val - state.pos
+                dist = np.abs(dist_vec)
+                max_safe_speed = np.sqrt(F32(2.0) * accel_rate * dist)
+                target_speed = np.minimum(_ONE, max_safe_speed) / dampening
+                desired_v = np.where(dist > F32(0.0001), (dist_vec / dist) * target_speed, _ZERO)
+                diff_v = desired_v - state.vel
+                diff_mag = np.abs(diff_v)
+                moved = state.vel + (diff_v / diff_mag) * np.minimum(step, diff_mag)
+                state.vel = np.where(diff_mag > F32(0.0001), moved, state.vel).astype(F32)
+                state.pos = (state.pos + state.vel * dt).astype(F32)
+                snap = (dist < F32(0.001)) & (np.abs(state.vel) < F32(0.01))
+                state.pos = np.where(snap, val, state.pos).astype(F32)
+                state.vel = np.where(snap, _ZERO, state.vel).astype(F32)
+                val = state.pos
+            else:
+                state.pos = val.copy()
+                state.vel[:] = _ZERO
+
+            val = np.clip(val, lo, hi)
+            prev = state.prev.astype(F32) / _FULL_SCALE
+            filtered = val * (_ONE - alpha) + prev * alpha
+            out[t] = round_half_away(filtered * _FULL_SCALE)
+            state.prev = out[t].astype(np.int16)
+
+    return out, state
+
+
+def engine_params(tuning_state):
+    """
+    Converts the UI's TUNING_STATE into the values main.cpp actually uses
+    (see load_system_config): deadzones are stored x10 in the UI.
+    Returns a dict of apply_tuning keyword arguments plus per-axis deadzones.
+    """
+    l_dz = F32(tuning_state["left_deadzone"]) / _TEN
+    r_dz = F32(tuning_state["right_deadzone"]) / _TEN
+    return {
+        "deadzone": np.array([l_dz, l_dz, r_dz, r_dz, AUX_DEADZONE, AUX_DEADZONE], dtype=F32),
+        "sens": tuning_state["global_rate"],
+        "lowpass_alpha": tuning_state["smoothing"],
+        "curve_type": int(tuning_state["curve_type"]),
+        "expo": tuning_state["expo"],
+        "cine_on": bool(tuning_state["cine_on"]),
+        "cine_speed": tuning_state["cine_speed"],
+        "cine_accel": tuning_state["cine_accel"],
+    }
@@ -4,6 +4,8 @@ import numpy as np
 import time
 from config import *
 import input_tuning_panel, mapper_panel, wifi_panel, pid_panel, logs_panel, system_panel, profiles_panel, camera_panel, battery_panel, motors_panel, sensors_panel
+from font_cache import get_font, render_text
+from layer_cache import LAYER_CACHE
 
 # --- RECONFIGURED LAYOUTS ---
 LAYOUT_LOWER = [
@@ -62,12 +64,12 @@ class VirtualKeyboard:
         overlay.fill((10, 10, 15))
         screen.blit(overlay, (rect.x, rect.y))
 
-        font = pygame.font.SysFont("monospace", 18, bold=True)
+        font = get_font(18, bold=True)
         now = time.time()
         input_allowed = (now - self.open_time) > 0.5
         debounce_rate = 0.25 # Slightly increased for Pi touchscreens
 
-        title_txt = font.render(self.title, True, (0, 200, 255))
+        title_txt = render_text(font, self.title, (0, 200, 255))
         screen.blit(title_txt, (rect.x + (rect.width // 2) - (title_txt.get_width() // 2), rect.y + 15))
         
         edge_buffer = 10
@@ -89,7 +91,7 @@ class VirtualKeyboard:
 
         c_color = (180, 50, 50) if is_close_pressed else (120, 35, 35)
         pygame.draw.rect(screen, c_color, close_rect, border_radius=10)
-        screen.blit(font.render("CLOSE", True, (255,255,255)), (close_rect.centerx - 28, close_rect.centery - 10))
+        screen.blit(render_text(font, "CLOSE", (255,255,255)), (close_rect.centerx - 28, close_rect.centery - 10))
 
         current_layout = LAYOUT_UPPER if self.mode == "upper" else (LAYOUT_SPECIAL if self.mode == "special" else LAYOUT_LOWER)
         key_w = (kb_width // 10) - 4
@@ -140,7 +142,7 @@ class VirtualKeyboard:
                 pygame.draw.rect(screen, (85, 85, 95), k_rect, width=1, border_radius=6)
                 
                 label_str = "SPACE" if key == "space" else key
-                txt_surf = font.render(label_str, True, (255, 255, 255))
+                txt_surf = render_text(font, label_str, (255, 255, 255))
                 screen.blit(txt_surf, (k_rect.centerx - txt_surf.get_width()//2, k_rect.centery - txt_surf.get_height()//2))
                 x_offset += k_w_scaled + 4
 
@@ -173,9 +175,9 @@ class VirtualKeypad:
         kp_w, kp_h = 240, 400
         kp_x = rect.x + (rect.width // 2) - (kp_w // 2)
         kp_y = rect.y + (rect.height // 2) - (kp_h // 2) - 20
-        font = pygame.font.SysFont("monospace", 22, bold=True)
+        font = get_font(22, bold=True)
 
-        title_txt = font.render(self.title, True, (0, 200, 255))
+        title_txt = render_text(font, self.title, (0, 200, 255))
         screen.blit(title_txt, (rect.x + (rect.width // 2) - (title_txt.get_width() // 2), kp_y - 35))
         
         disp_rect = pygame.Rect(kp_x, kp_y, kp_w, 50)
@@ -192,7 +194,7 @@ class VirtualKeypad:
             return
 
         pygame.draw.rect(screen, (110, 35, 35), close_rect, border_radius=10)
-        screen.blit(font.render("CANCEL", True, (255,255,255)), (close_rect.centerx - 35, close_rect.centery - 10))
+        screen.blit(render_text(font, "CANCEL", (255,255,255)), (close_rect.centerx - 35, close_rect.centery - 10))
 
         btn_w, btn_h = 65, 55
         gap, start_y = 10, kp_y + 65
@@ -218,7 +220,7 @@ class VirtualKeypad:
 
                 bcolor = (35, 135, 65) if key == "Enter" else ((140, 45, 45) if key == "<-" else (55, 57, 70))
                 pygame.draw.rect(screen, bcolor, brect, border_radius=12)
-                label = font.render(key, True, (255, 255, 255))
+                label = render_text(font, key, (255, 255, 255))
                 screen.blit(label, (brect.centerx - label.get_width()//2, brect.centery - label.get_height()//2))
 
 # --- PANEL & ICON UTILS ---
@@ -252,27 +254,39 @@ def draw_gear_button(screen, rect, pressed):
     pygame.draw.circle(screen, (255,255,255), center, 16, 4)
 
 def draw_settings_panel(screen, rect, touch_down, touch_x, touch_y, active_index, raw_signals, tuned_signals=None):
-    pygame.draw.rect(screen, (30, 30, 35), rect)
-    pygame.draw.rect(screen, (80, 80, 90), rect, width=3)
     button_size, spacing = 80, 10
-    start_x, start_y = rect.left + 10, rect.y + 60
     clicked_index, change_detected = -1, False
-    
-    for i, (name, func) in enumerate(PANEL_MAP):
+
+    def button_rect(i, origin):
         row, col = i // 2, i % 2
-        bx, by = start_x + col * (button_size + spacing), start_y + row * (button_size + spacing)
-        brect = pygame.Rect(bx, by, button_size, button_size)
-        is_pressed = touch_down and brect.collidepoint(touch_x, touch_y) and not (shared_keyboard.active or shared_keypad.active)
-        if is_pressed: clicked_index = i
-        bcolor = (40, 100, 200) if i == active_index else ((100, 100, 110) if is_pressed else (50, 52, 60))
-        pygame.draw.rect(screen, bcolor, brect, border_radius=15)
-        lbl = pygame.font.SysFont("monospace", 14, bold=True).render(name, True, (255,255,255))
-        screen.blit(lbl, (brect.centerx - lbl.get_width()//2, brect.centery - lbl.get_height()//2))
+        return pygame.Rect(origin[0] + 10 + col * (button_size + spacing), origin[1] + 60 + row * (button_size + spacing), button_size, button_size)
+
+    def draw_button(surf, i, brect, bcolor):
+        pygame.draw.rect(surf, bcolor, brect, border_radius=15)
+        lbl = render_text(get_font(14, bold=True), PANEL_MAP[i][0], (255,255,255))
+        surf.blit(lbl, (brect.centerx - lbl.get_width()//2, brect.centery - lbl.get_height()//2))
+
+    def build(surf):
+        local = surf.get_rect()
+        surf.fill(COLOR_SIDEBAR_BG)
+        pygame.draw.rect(surf, (80, 80, 90), local, width=3)
+        for i in range(len(PANEL_MAP)):
+            draw_button(surf, i, button_rect(i, (0, 0)), (40, 100, 200) if i == active_index else (50, 52, 60))
+
+    # Idle sidebar is a cached layer, rebuilt when the active panel changes; only a pressed button is drawn live
+    screen.blit(LAYER_CACHE.get("sidebar", active_index, rect.size, build), rect.topleft)
+    overlay_open = shared_keyboard.active or shared_keypad.active
+    for i in range(len(PANEL_MAP)):
+        brect = button_rect(i, rect.topleft)
+        if touch_down and brect.collidepoint(touch_x, touch_y) and not overlay_open:
+            clicked_index = i
+            if i != active_index:
+                draw_button(screen, i, brect, (100, 100, 110))
 
     if active_index != -1 and active_index < len(PANEL_MAP):
         if PANEL_MAP[active_index][1] is not None:
             second_rect = pygame.Rect(0, 0, SCREEN_WIDTH - rect.width, SCREEN_HEIGHT)
-            pygame.draw.rect(screen, (35, 35, 40), second_rect)
+            pygame.draw.rect(screen, COLOR_PANEL_BG, second_rect)
             
             # Draw the panel content
             p_touch = touch_down and not (shared_keyboard.active or shared_keypad.active)
@@ -1,5 +1,9 @@
-# ui_helpers.py - shared UI helpers (numeric stepper only)
+# ui_helpers.py - shared UI helpers (numeric stepper, history graphs, paged panel chrome, value tables)
 import pygame
+import numpy as np
+from config import COLOR_PANEL_BG
+from font_cache import get_font, render_text
+from layer_cache import LAYER_CACHE
 
 def draw_numeric_stepper(screen, x, y, value, label, touch_down, touch_x, touch_y):
     """
@@ -7,11 +11,11 @@ def draw_numeric_stepper(screen, x, y, value, label, touch_down, touch_x, touch_
     Returns the rects and pressed states for the main loop to handle logic.
     """
     # Fonts
-    font_main = pygame.font.SysFont("monospace", 20, bold=True)
-    font_label = pygame.font.SysFont("monospace", 16)
+    font_main = get_font(20, bold=True)
+    font_label = get_font(16)
 
     # Render Label above the stepper
-    label_surf = font_label.render(label.upper(), True, (150, 150, 150))
+    label_surf = render_text(font_label, label.upper(), (150, 150, 150))
     screen.blit(label_surf, (x - 40, y - 25))
 
     # 1. Box for number (The Display)
@@ -27,7 +31,7 @@ def draw_numeric_stepper(screen, x, y, value, label, touch_down, touch_x, touch_
     else:
         display_val = str(value)
 
-    num_surf = font_main.render(display_val, True, (0, 255, 120))
+    num_surf = render_text(font_main, display_val, (0, 255, 120))
     screen.blit(num_surf, (box_rect.centerx - num_surf.get_width() // 2, box_rect.centery - num_surf.get_height() // 2))
 
     # 2. Left arrow (Decrease)
@@ -54,4 +58,119 @@ def draw_numeric_stepper(screen, x, y, value, label, touch_down, touch_x, touch_
         (right_rect.centerx - 8, right_rect.centery + 10)
     ])
 
-    return left_rect, left_pressed, right_rect, right_pressed
\ No newline at end of file
+    return left_rect, left_pressed, right_rect, right_pressed
+
+def draw_history_graph(screen, rect, ts, series, colors, seconds, v_min=-32768, v_max=32767):
+    """
+    Draws scrolling traces from TelemetryHistory views.
+    ts: (n,) timestamps, series: (n, k) values, one color per column.
+    Points are mapped to pixels in one vectorized pass and decimated to ~1 per pixel column.
+    """
+    pygame.draw.rect(screen, (20, 22, 28), rect, border_radius=8)
+    pygame.draw.line(screen, (50, 52, 60), (rect.left, rect.centery), (rect.right, rect.centery))
+    if len(ts) < 2:
+        return
+
+    # Decimate from the newest sample back, so it is always drawn and the x origin doesn't jitter
+    step = max(1, len(ts) // rect.width)
+    first = (len(ts) - 1) % step
+    ts, series = ts[first::step], series[first::step]
+    xs = rect.right - (ts[-1] - ts) * (rect.width / seconds)
+    ys = rect.bottom - (series - v_min) * (rect.height / float(v_max - v_min))
+    np.clip(ys, rect.top, rect.bottom, out=ys)
+
+    visible = xs >= rect.left
+    pts = np.empty((int(visible.sum()), 2), dtype=np.int32)
+    if len(pts) < 2:
+        return
+    pts[:, 0] = xs[visible]
+    for col, color in enumerate(colors):
+        pts[:, 1] = ys[visible, col]
+        pygame.draw.lines(screen, color, False, pts, 2)
+
+
+# --- PAGED PANEL CHROME ---
+def page_arrow_rects(rect):
+    arrow_w, arrow_h = 60, 45
+    prev_rect = pygame.Rect(rect.centerx - 70, rect.bottom - 70, arrow_w, arrow_h)
+    next_rect = pygame.Rect(rect.centerx + 10, rect.bottom - 70, arrow_w, arrow_h)
+    return prev_rect, next_rect
+
+def draw_page_arrow(screen, arrow_rect, direction, pressed):
+    """direction: -1 = back, 1 = next."""
+    pygame.draw.rect(screen, (70, 70, 80) if pressed else (40, 40, 50), arrow_rect, border_radius=10)
+    cx, cy = arrow_rect.center
+    pygame.draw.polygon(screen, (255, 255, 255), [(cx - 10 * direction, cy - 10), (cx + 10 * direction, cy), (cx - 10 * direction, cy + 10)])
+
+def draw_paged_panel(screen, rect, name, title, current_page, touch_down, touch_x, touch_y, message=None, pages=3):
+    """
+    Background, title, placeholder message, page dots and idle arrows of the
+    paginated panels, served from a cached layer that is rebuilt only when the
+    page (or text) changes. Per frame only a pressed arrow is drawn on top.
+    Returns (prev_pressed, next_pressed).
+    """
+    def build(surf):
+        r = surf.get_rect()
+        surf.fill(COLOR_PANEL_BG)
+        t = render_text(get_font(28, bold=True), title, (255, 255, 255))
+        surf.blit(t, (r.centerx - t.get_width() // 2, r.y + 30))
+        if message:
+            m = render_text(get_font(20, bold=True), message, (100, 100, 100))
+            surf.blit(m, (r.centerx - m.get_width() // 2, r.centery))
+        local_prev, local_next = page_arrow_rects(r)
+        draw_page_arrow(surf, local_prev, -1, False)
+        draw_page_arrow(surf, local_next, 1, False)
+        for i in range(pages):
+            color = (255, 255, 255) if i == current_page else (100, 100, 100)
+            pygame.draw.circle(surf, color, (r.centerx - 20 + (i * 20), r.bottom - 85), 4)
+
+    screen.blit(LAYER_CACHE.get(name, (title, message, current_page, pages), rect.size, build), rect.topleft)
+
+    prev_rect, next_rect = page_arrow_rects(rect)
+    p_pres = touch_down and prev_rect.collidepoint(touch_x, touch_y)
+    n_pres = touch_down and next_rect.collidepoint(touch_x, touch_y)
+    if p_pres: draw_page_arrow(screen, prev_rect, -1, True)
+    if n_pres: draw_page_arrow(screen, next_rect, 1, True)
+    return p_pres, n_pres
+
+
+def draw_value_rows(screen, x, y, rows, label_width=200, line_height=30):
+    """
+    Label/value table for live readouts. rows: (label, value_text, color);
+    labels come from the text cache, values are rendered fresh.
+    Missing values should be passed as "--". Returns the y below the last row.
+    """
+    label_font = get_font(16, bold=True)
+    value_font = get_font(18, bold=True)
+    for label, value, color in rows:
+        screen.blit(render_text(label_font, label, (150, 150, 150)), (x, y + 2))
+        screen.blit(value_font.render(value, True, color), (x + label_width, y))
+        y += line_height
+    return y
+
+
+# --- PROFILER OVERLAY ---
+def draw_profiler_overlay(screen, pos, profiler, anchor="topleft"):
+    """
+    Stage table (p50/p95/p99 ms over the profiler window) with a dark backing box;
+    pos places the box's `anchor` point (any pygame.Rect attribute). Returns the Rect covered.
+    """
+    font = get_font(13, bold=True)
+    summary = profiler.summary()
+    us, pct = profiler.overhead()
+    lines = [(f"{'stage':<10}{'p50':>8}{'p95':>8}{'p99':>8}", (150, 150, 150))]
+    for name in profiler.stages + ("frame",):
+        if name in summary:
+            p50, p95, p99 = summary[name]
+            color = (255, 255, 255) if name == "frame" else (200, 200, 200)
+            lines.append((f"{name:<10}{p50:8.2f}{p95:8.2f}{p99:8.2f}", color))
+    lines.append((f"{profiler.count} frames  overhead {us:.1f}us ({pct:.2f}%)  D: dump", (120, 120, 130)))
+
+    surfs = [font.render(text, True, color) for text, color in lines]
+    line_h = font.get_linesize()
+    box = pygame.Rect(0, 0, max(s.get_width() for s in surfs) + 16, line_h * len(surfs) + 10)
+    setattr(box, anchor, pos)
+    pygame.draw.rect(screen, (10, 10, 14), box, border_radius=6)
+    for i, surf in enumerate(surfs):
+        screen.blit(surf, (box.x + 8, box.y + 5 + i * line_h))
+    return box
@@ -6,6 +6,8 @@ import threading
 import math
 import re
 from config import *
+from font_cache import get_font, render_text
+from frame_scheduler import FRAME_SCHEDULER
 
 # --- Global State ---
 current_page = 0
@@ -29,11 +31,11 @@ start_scroll_y = 0
 
 # --- Font Initialization ---
 pygame.font.init()
-FONT_TITLE = pygame.font.SysFont("monospace", 26, bold=True)
-FONT_MED = pygame.font.SysFont("monospace", 18, bold=True)
-FONT_SMALL = pygame.font.SysFont("monospace", 14, bold=True)
-FONT_TINY = pygame.font.SysFont("monospace", 11, bold=True)
-FONT_ARROW = pygame.font.SysFont("monospace", 20, bold=True)
+FONT_TITLE = get_font(26, bold=True)
+FONT_MED = get_font(18, bold=True)
+FONT_SMALL = get_font(14, bold=True)
+FONT_TINY = get_font(11, bold=True)
+FONT_ARROW = get_font(20, bold=True)
 
 def debug_print(section, message):
     timestamp = time.strftime("%H:%M:%S")
@@ -194,7 +196,7 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
         elif current_page == 1: threading.Thread(target=scan_bt, daemon=True).start()
         last_page = current_page
 
-    title_t = FONT_TITLE.render("CONNECTIVITY", True, (0, 200, 255))
+    title_t = render_text(FONT_TITLE, "CONNECTIVITY", (0, 200, 255))
     screen.blit(title_t, (rect.centerx - title_t.get_width()//2, rect.y + 15))
 
     if current_page < 2:
@@ -202,7 +204,7 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
         pygame.draw.rect(screen, (35, 38, 50), re_btn, border_radius=10)
         pygame.draw.rect(screen, (0, 200, 255), re_btn, width=2, border_radius=10)
         lbl_txt = "REFRESH" if not loading else "SCANNING..."
-        lbl = FONT_SMALL.render(lbl_txt, True, (255, 255, 255))
+        lbl = render_text(FONT_SMALL, lbl_txt, (255, 255, 255))
         screen.blit(lbl, (re_btn.centerx - lbl.get_width()//2, re_btn.centery - lbl.get_height()//2))
         if touch_down and re_btn.collidepoint(touch_x, touch_y) and (now - last_interaction_time) > 1.2:
             last_interaction_time, loading = now, True
@@ -234,11 +236,11 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
             ssid_btn = pygame.Rect(row.x + 5, row.y + 10, 120, 40)
             btn_col = (30, 80, 50) if is_conn else (60, 100, 200) if name in remembered_ssids else (45, 50, 65)
             pygame.draw.rect(screen, btn_col, ssid_btn, border_radius=8)
-            screen.blit(FONT_SMALL.render(name[:10], True, (255,255,255)), (ssid_btn.x + 8, ssid_btn.y + 12))
+            screen.blit(render_text(FONT_SMALL, name[:10], (255,255,255)), (ssid_btn.x + 8, ssid_btn.y + 12))
             
             if status and not is_conn:
                 col = (255, 180, 0) if "ing" in status else (255, 50, 50)
-                screen.blit(FONT_TINY.render(status.upper(), True, col), (row.x + 135, row.y + 22))
+                screen.blit(render_text(FONT_TINY, status.upper(), col), (row.x + 135, row.y + 22))
 
             if is_conn:
                 is_auto = autoconnect_dict.get(name, False)
@@ -260,7 +262,7 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
                     selected_ssid = name
                     shared_keyboard.open(f"Pass: {name}", "", connect_to_wifi)
             
-            screen.blit(FONT_SMALL.render(item['bars'], True, (0, 255, 255)), (row.right - 85, row.y + 22))
+            screen.blit(render_text(FONT_SMALL, item['bars'], (0, 255, 255)), (row.right - 85, row.y + 22))
 
         elif current_page == 1:
             b_name, b_mac = item.split('|')
@@ -269,10 +271,10 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
             b_btn = pygame.Rect(row.x + 8, row.y + 10, 180, 40)
             btn_col = (30, 80, 50) if is_b_conn else (60, 100, 200) if status == "pairing..." else (45, 50, 65)
             pygame.draw.rect(screen, btn_col, b_btn, border_radius=8)
-            screen.blit(FONT_SMALL.render(b_name[:18], True, (255,255,255)), (b_btn.x + 10, b_btn.y + 12))
+            screen.blit(render_text(FONT_SMALL, b_name[:18], (255,255,255)), (b_btn.x + 10, b_btn.y + 12))
             if status:
                 col = (0, 255, 100) if is_b_conn else (255, 180, 0) if "pair" in status else (255, 50, 50)
-                screen.blit(FONT_TINY.render(status.upper(), True, col), (row.right - 140, row.y + 22))
+                screen.blit(render_text(FONT_TINY, status.upper(), col), (row.right - 140, row.y + 22))
             if touch_down and b_btn.collidepoint(touch_x, touch_y) and not is_b_conn and (now - last_interaction_time) > 0.8:
                 last_interaction_time = now
                 connect_bt(b_mac, b_name)
@@ -280,7 +282,7 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
         if (current_page == 0 and is_conn) or (current_page == 1 and is_b_conn):
             x_btn = pygame.Rect(row.right - 45, row.y + 10, 40, 40)
             pygame.draw.rect(screen, (200, 40, 40), x_btn, border_radius=8)
-            screen.blit(FONT_SMALL.render("X", True, (255,255,255)), (x_btn.x + 15, x_btn.y + 12))
+            screen.blit(render_text(FONT_SMALL, "X", (255,255,255)), (x_btn.x + 15, x_btn.y + 12))
             if touch_down and x_btn.collidepoint(touch_x, touch_y) and (now - last_interaction_time) > 0.6:
                 last_interaction_time = now
                 if current_page == 0: disconnect_wifi(name, False)
@@ -290,6 +292,7 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
 
     # REVERTED TO ORIGINAL CIRCLE ANIMATION
     if loading:
+        FRAME_SCHEDULER.request("anim")  # keep the rings moving while the scan runs
         cx, cy = rect.centerx, rect.centery
         for i in range(4):
             rad = (((now - loading_start) * 70 + i * 35) % 140) + 10
@@ -302,5 +305,5 @@ def draw_wifi_panel(screen, rect, touch_down, touch_x, touch_y):
         if touch_down and r.collidepoint(touch_x, touch_y) and (now - last_interaction_time) > 0.4:
             current_page, last_interaction_time = (current_page + dr) % 3, now
         pygame.draw.rect(screen, (45, 45, 55), r, border_radius=12)
-        txt = FONT_ARROW.render(lbl, True, (255,255,255))
+        txt = render_text(FONT_ARROW, lbl, (255,255,255))
         screen.blit(txt, (r.centerx-txt.get_width()//2, r.centery-txt.get_height()//2))
\ No newline at end of file